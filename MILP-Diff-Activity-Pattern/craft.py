@@ -18,8 +18,10 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 11 Khordad, 1398
 '''
 
+import os
 import time
 from gurobipy import *
+from dynamic_programming import DynamicProgramming
 
 """
 x_roundNumber_nibbleNumber_bitNumber
@@ -47,13 +49,25 @@ z_i_12	z_i_13	z_i_14	z_i_15
 
 
 class Craft:
-    def __init__(self, rounds, related_tweak=0, starting_round=0):
+    def __init__(self, rounds, related_tweak=0, starting_round=0, mixing_encoding="truncxor", window_rounds=0):
         self.rounds = rounds
         self.related_tweak = related_tweak
+        # "truncxor": MixColumn by chains of truncated XORs with dummy variables
+        # "column": the convex hull of the truncated relation of each column
+        # (see constraints_by_mixing_layer)
+        self.mixing_encoding = mixing_encoding
+        # Windows of up to window_rounds consecutive rounds get a cut by the
+        # minimum number of active S-boxes of as many rounds (see constraints_by_windows)
+        self.window_rounds = window_rounds
+        self.window_bounds = None
         self.block_size = 64
         self.xor_counter = 0
         self.dummy_var_counter = 0
         self.starting_round = starting_round
+        # CRAFT has 32 rounds, numbered from 0 to 31
+        assert(self.starting_round + self.rounds <= 32)
+        # The model is solved by a single process, which gets all the cores
+        self.threads = os.cpu_count()
         self.p_permute_nibbles = [
             0xf, 0xc, 0xd, 0xe, 0xa, 0x9, 0x8, 0xb, 0x6, 0x5, 0x4, 0x7, 0x1, 0x2, 0x3, 0x0]
         self.q_permute_teakey_nibbles = [
@@ -69,6 +83,28 @@ class Craft:
                 "_rtk_" + str(self.rounds) + ".txt"
         fileobj = open(self.filename_model, "w")
         fileobj.close()
+        # Constraints of the model as (terms, sense, rhs), where terms is a
+        # list of (coefficient, variable name). The model is either written
+        # into an LP file (make_model) or built in memory (build_model) from
+        # this list. The constraints which exclude the all-zero trail are not
+        # in this list (see initial_state_constraints).
+        self.constraints = []
+
+    def last_state(self):
+        """
+        Return the round of the last state x of the model. The last round of
+        CRAFT (round 31) is MixColumn and AddTweakey only, without PermuteNibbles
+        and S-boxes, hence a model which ends with it has no state x_32.
+        """
+        return min(self.starting_round + self.rounds, 31)
+
+    def objective_variables(self):
+        """
+        Return the variables of the objective function, i.e., the inputs of the
+        S-box layers of all rounds
+        """
+        return ["x_%d_%d" % (r, i) for r in range(
+            1 + self.starting_round, self.last_state() + 1) for i in range(16)]
 
     def create_objective_function(self):
         """
@@ -76,9 +112,7 @@ class Craft:
         """
         fileobj = open(self.filename_model, "a")
         fileobj.write("Minimize\n")
-        A = ["x_%d_%d" % (r, i) for r in range(
-            1 + self.starting_round, self.rounds + 1 + self.starting_round) for i in range(16)]
-        temp = " + ".join(A)
+        temp = " + ".join(self.objective_variables())
         fileobj.write(temp)
         fileobj.write("\n")
         fileobj.close()
@@ -112,15 +146,35 @@ class Craft:
             array[i] = "%s_%d_%d" % (s2, r, i)
         return array
 
+    def add_constraint(self, terms, sense, rhs):
+        """
+        Add the constraint sum(coefficient * variable) sense rhs to the model,
+        where sense is one of ">=", "=", "<="
+        """
+        self.constraints.append((terms, sense, rhs))
+
+    @staticmethod
+    def constraint_to_lp(constraint):
+        """
+        Convert a constraint into a line of an LP file.
+        """
+        terms, sense, rhs = constraint
+        lhs = ""
+        for coefficient, variable in terms:
+            if coefficient < 0:
+                lhs += " - " if lhs != "" else "- "
+            elif lhs != "":
+                lhs += " + "
+            if abs(coefficient) != 1:
+                lhs += "%d " % abs(coefficient)
+            lhs += variable
+        return "%s %s %d\n" % (lhs, sense, rhs)
+
     def constraints_by_equality(self, s1, s2):
-        fileobj = open(self.filename_model, "a")
         for i in range(16):
-            constraint = "%s - %s = 0\n" % (s1[i], s2[i])
-            fileobj.write(constraint)
-        fileobj.close()
+            self.add_constraint([(1, s1[i]), (-1, s2[i])], "=", 0)
 
     def constraints_by_truncxor(self, a, b, c):
-        fileobj = open(self.filename_model, "a")
         """
         a + b + c >= 2 d
         d >= a
@@ -128,21 +182,35 @@ class Craft:
         d >= c
         """
         d = "d_%d" % self.xor_counter
-        ineq1 = "%s + %s + %s -  2 %s >= 0\n" % (a, b, c, d)
-        ineq2 = "%s - %s >= 0\n" % (d, a)
-        ineq3 = "%s - %s >= 0\n" % (d, b)
-        ineq4 = "%s - %s >= 0\n" % (d, c)
-        fileobj.write(ineq1)
-        fileobj.write(ineq2)
-        fileobj.write(ineq3)
-        fileobj.write(ineq4)
-        fileobj.close()
+        self.add_constraint([(1, a), (1, b), (1, c), (-2, d)], ">=", 0)
+        self.add_constraint([(1, d), (-1, a)], ">=", 0)
+        self.add_constraint([(1, d), (-1, b)], ">=", 0)
+        self.add_constraint([(1, d), (-1, c)], ">=", 0)
         self.xor_counter += 1
 
+    def constraints_by_truncated_sum(self, variables):
+        """
+        Not exactly one of variables is active, i.e., v <= sum of the other
+        variables for every v. These inequalities give the convex hull of the
+        truncated XOR of any number of nibbles, without dummy variables.
+        """
+        for variable in variables:
+            self.add_constraint([(1, other) for other in variables if other != variable] +
+                                [(-1, variable)], ">=", 0)
+
     def constraints_by_mixing_layer(self, x, y):
         """
         Generate constraints related to mixing layer (MC)
         """
+        if (self.mixing_encoding == "column"):
+            # y_j = x_j + x_{8+j} + x_{12+j} and y_{4+j} = x_{4+j} + x_{12+j}: 7 inequalities
+            # per column, which are the convex hull of its truncated relation
+            for nibble_number in range(4):
+                self.constraints_by_truncated_sum([x[nibble_number], x[nibble_number + 8],
+                                                   x[nibble_number + 12], y[nibble_number]])
+                self.constraints_by_truncated_sum([x[nibble_number + 4], x[nibble_number + 12],
+                                                   y[nibble_number + 4]])
+            return
         for nibble_number in range(4):
             dummy_var = "dv_%d" % self.dummy_var_counter
             self.constraints_by_truncxor(
@@ -167,101 +235,126 @@ class Craft:
             temp[self.p_permute_nibbles[i]] = state[i]
         return temp
 
-    def initial_state_constraint(self, x):
-        fileobj = open(self.filename_model, "a")
-        temp = " + ".join(x) + " >= 1\n"        
-        fileobj.write(temp)
-        x_in = self.create_variables(0 + self.starting_round, "x")
-        temp1 = " + ".join(x_in) + " = 0\n"
-        #fileobj.write(temp1)
-        fileobj.close()
-
-    def constraint(self):
+    def initial_state_constraints(self):
         """
-        Generate the constraints of MILP model
+        Return the constraints which exclude the all-zero trail. In the
+        single-tweak model, they depend on the last round (see extend_model).
         """
-        assert(1 <= self.rounds <= 32)
-        fileobj = open(self.filename_model, "a")
-        fileobj.write("Subject To\n")
-        fileobj.close()
         x_in = self.create_variables(0 + self.starting_round, "x")
-
-        last_round_state = self.create_variables(self.rounds + self.starting_round, "x")
+        last_round_state = self.create_variables(self.last_state(), "x")
         if (self.related_tweak == 1):
-            self.initial_state_constraint(self.tweak)
-            #self.initial_state_constraint(last_round_state)
-            #self.initial_state_constraint(x_in + self.tweak)
+            active_variables = self.tweak
+            #active_variables = last_round_state
+            #active_variables = x_in + self.tweak
         else:
-            self.initial_state_constraint(x_in + last_round_state)
-        y = self.create_variables_after_mc(0 + self.starting_round, "y", "x")
-        z = self.create_variables(0 + self.starting_round, "z")
-        x_out = self.create_variables(1 + self.starting_round, "x")
-        if self.rounds == 1:
-            self.constraints_by_mixing_layer(x_in, y)
-            if (self.related_tweak == 1):
-                self.constraints_by_atk(self.TK[0 + (self.starting_round % 4)], y, z)
-                self.constraints_by_equality(self.permute_nibbles(z), x_out)
-            else:
-                self.constraints_by_equality(self.permute_nibbles(y), x_out)
+            active_variables = x_in + last_round_state
+        return [([(1, variable) for variable in active_variables], ">=", 1)]
+
+    def constraints_by_round(self, r):
+        """
+        Generate the constraints of the round r, where r counts from 0 for the
+        first round of CRAFT, hence the round r uses the tweakey TK[r % 4]. The
+        last round (r = 31) has no PermuteNibbles and no S-boxes.
+        """
+        x_in = self.create_variables(r, "x")
+        y = self.create_variables_after_mc(r, "y", "x")
+        z = self.create_variables(r, "z")
+        x_out = self.create_variables(r + 1, "x")
+        self.constraints_by_mixing_layer(x_in, y)
+        if (self.related_tweak == 1):
+            self.constraints_by_atk(self.TK[r % 4], y, z)
+        if (r == 31):
+            return
+        if (self.related_tweak == 1):
+            self.constraints_by_equality(self.permute_nibbles(z), x_out)
         else:
-            self.constraints_by_mixing_layer(x_in, y)
-            if (self.related_tweak == 1):
-                self.constraints_by_atk(self.TK[0 + (self.starting_round %4)], y, z)
-                self.constraints_by_equality(self.permute_nibbles(z), x_out)
-            else:
-                self.constraints_by_equality(self.permute_nibbles(y), x_out)
-            for r in range(1 + self.starting_round, self.rounds + self.starting_round):
-                x_in = x_out
-                y = self.create_variables_after_mc(r, "y", "x")
-                z = self.create_variables(r, "z")
-                x_out = self.create_variables(r + 1, "x")
-                if (self.related_tweak == 1):
-                    self.constraints_by_mixing_layer(x_in, y)
-                    self.constraints_by_atk(self.TK[(self.starting_round + r) % 4], y, z)
-                else:
-                    self.constraints_by_mixing_layer(x_in, y)
-                if r != 31:
-                    if (self.related_tweak == 1):
-                        self.constraints_by_equality(
-                            self.permute_nibbles(z), x_out)
-                    else:
-                        self.constraints_by_equality(
-                            self.permute_nibbles(y), x_out)
+            self.constraints_by_equality(self.permute_nibbles(y), x_out)
+        if (self.window_rounds > 0):
+            self.constraints_by_windows(r)
+
+    def get_window_bounds(self):
+        """
+        Return the minimum numbers of active S-boxes of 1, ..., window_rounds
+        rounds for the starting rounds 0, ..., 3 (only 0 in the single-tweak
+        model), computed once by dynamic_programming.py
+        """
+        if self.window_bounds is None:
+            starting_rounds = range(4) if (self.related_tweak == 1) else [0]
+            self.window_bounds = [DynamicProgramming(self.related_tweak, s).minimum_active_sboxes(self.window_rounds)[0]
+                                  for s in starting_rounds]
+        return self.window_bounds
+
+    def constraints_by_windows(self, r):
+        """
+        Generate the cuts of the windows of k <= window_rounds rounds which end
+        with the round r: the S-boxes of the rounds r - k + 1, ..., r, i.e., the
+        states x_{r - k + 2}, ..., x_{r + 1}, are at least the minimum number of
+        active S-boxes of k rounds starting at the round r - k + 1. These cuts
+        are valid, since each part of a trail is a trail with the same tweak.
+        """
+        bounds = self.get_window_bounds()
+        for k in range(1, min(self.window_rounds, r + 1 - self.starting_round) + 1):
+            first_round = r - k + 1
+            bound = bounds[first_round % 4 if (self.related_tweak == 1) else 0][k - 1]
+            if bound > 0:
+                self.add_constraint([(1, "x_%d_%d" % (round_number, nibble_number))
+                                     for round_number in range(first_round + 1, r + 2)
+                                     for nibble_number in range(16)], ">=", bound)
+
+    def constraint(self):
+        """
+        Generate the constraints of MILP model, except the ones of
+        initial_state_constraints
+        """
+        assert(1 <= self.rounds and self.starting_round + self.rounds <= 32)
+        self.constraints = []
+        self.xor_counter = 0
+        self.dummy_var_counter = 0
+        for r in range(self.starting_round, self.rounds + self.starting_round):
+            self.constraints_by_round(r)
 
     # Variables declaration
-    def variable_binary(self):
+    def binary_variables(self):
         """
-        Specifying variables type.
+        Return the names of all (binary) variables of the model.
         """
-        fileobj = open(self.filename_model, "a")
-        fileobj.write("Binary\n")
+        variables = []
         # x
-        for round_number in range(self.starting_round, self.rounds + 1 + self.starting_round):
+        for round_number in range(self.starting_round, self.last_state() + 1):
             for nibble_number in range(16):
-                fileobj.write("x_%s_%s\n" % (round_number, nibble_number))
+                variables.append("x_%s_%s" % (round_number, nibble_number))
         # y
         for round_number in range(self.starting_round, self.rounds + self.starting_round):
             for nibble_number in range(8):
-                fileobj.write("y_%s_%s\n" % (round_number, nibble_number))
+                variables.append("y_%s_%s" % (round_number, nibble_number))
         # z
         if (self.related_tweak == 1):
             for round_number in range(self.starting_round, self.rounds + self.starting_round):
                 for nibble_number in range(16):
-                    fileobj.write("z_%s_%s\n" % (round_number, nibble_number))
+                    variables.append("z_%s_%s" % (round_number, nibble_number))
 
         # tk
         if (self.related_tweak == 1):
             for nibble_number in range(16):
-                fileobj.write("tk_%s\n" % nibble_number)
+                variables.append("tk_%s" % nibble_number)
 
         # dummy variables used in xor operations
         for i in range(self.xor_counter):
-            fileobj.write("d_%d\n" % i)
+            variables.append("d_%d" % i)
 
         # dummy variables used in mixing layers
         for i in range(self.dummy_var_counter):
-            fileobj.write("dv_%d\n" % i)
+            variables.append("dv_%d" % i)
+        return variables
 
+    def variable_binary(self):
+        """
+        Specifying variables type.
+        """
+        fileobj = open(self.filename_model, "a")
+        fileobj.write("Binary\n")
+        for variable in self.binary_variables():
+            fileobj.write(variable + "\n")
         fileobj.write("END")
         fileobj.close()
 
@@ -275,54 +368,211 @@ class Craft:
             self.initialize_tweakey_differences()
         self.create_objective_function()
         self.constraint()
+        fileobj = open(self.filename_model, "a")
+        fileobj.write("Subject To\n")
+        for constraint in self.initial_state_constraints() + self.constraints:
+            fileobj.write(Craft.constraint_to_lp(constraint))
+        fileobj.close()
         self.variable_binary()
-    
+
+    def build_model(self):
+        """
+        Build the MILP model of CRAFT in memory, without writing/reading an LP file
+        """
+        if (self.related_tweak == 1):
+            self.initialize_tweakey_differences()
+        self.constraint()
+        m = Model()
+        m.setParam(GRB.Param.OutputFlag, 0)
+        m.setParam(GRB.Param.Threads, self.threads)
+        m._variables = {}
+        for name in self.binary_variables():
+            m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        self.add_constraints(m, self.constraints)
+        m._init_constraints = self.add_constraints(m, self.initial_state_constraints())
+        m._bound_constraints = []
+        self.set_objective(m)
+        m.update()
+        return m
+
+    @staticmethod
+    def add_constraints(m, constraints):
+        """
+        Add the constraints (terms, sense, rhs) to a model built by build_model,
+        and return them
+        """
+        senses = {">=": GRB.GREATER_EQUAL, "=": GRB.EQUAL, "<=": GRB.LESS_EQUAL}
+        return [m.addLConstr(LinExpr([coefficient for coefficient, _ in terms],
+                                     [m._variables[name] for _, name in terms]), senses[sense], rhs)
+                for terms, sense, rhs in constraints]
+
+    def set_objective(self, m):
+        """
+        Set the objective of a model built by build_model to the number of
+        active S-boxes of self.rounds rounds
+        """
+        objective_variables = self.objective_variables()
+        m.setObjective(LinExpr([1]*len(objective_variables), [m._variables[name] for name in objective_variables]),
+                       GRB.MINIMIZE)
+
+    def set_lower_bound(self, m, lower_bound):
+        """
+        Add the cut objective >= lower_bound to a model built by build_model, in
+        place of the previous one. The minimum number of active S-boxes of r
+        rounds is a valid lower bound for r + 1 rounds, since the first r rounds
+        of a trail are a trail.
+        """
+        m.remove(m._bound_constraints)
+        m._bound_constraints = self.add_constraints(
+            m, [([(1, name) for name in self.objective_variables()], ">=", lower_bound)])
+        m.update()
+
+    def fix_state(self, m, r, pattern):
+        """
+        Fix the activity of the state x of the round r of a model built by
+        build_model to pattern, a string from the nibble 15 to the nibble 0
+        (see get_activity_pattern), and return the constraints
+        """
+        return self.add_constraints(m, [([(1, "x_%d_%d" % (r, i))], "=", int(pattern[15 - i]))
+                                        for i in range(16)])
+
+    def pattern_variables(self):
+        """
+        Return the variables which define an activity pattern: the states x of
+        all rounds, and the tweak in the related-tweak model
+        """
+        variables = ["x_%d_%d" % (r, i) for r in range(self.starting_round, self.last_state() + 1)
+                     for i in range(16)]
+        if (self.related_tweak == 1):
+            variables += self.tweak
+        return variables
+
+    def enumerate_patterns(self, m, max_active_sboxes, pool_size=100):
+        """
+        Return the list of (number of active S-boxes, activity pattern, tweak) of
+        all the activity patterns of a model built by build_model with at most
+        max_active_sboxes active S-boxes, by increasing number of active S-boxes,
+        and whether this list is complete. Each solve collects up to pool_size
+        solutions from the solution pool of Gurobi, every new pattern is excluded
+        by a cut, and the same model is solved again until it is infeasible. If a
+        solve ends otherwise (e.g., on TimeLimit or an interrupt), the patterns
+        found so far are returned as incomplete. Several solutions of the pool can
+        share a pattern, since the outputs of MixColumn are free when two of
+        their inputs are active, hence the cuts are on the pattern variables.
+        """
+        names = self.pattern_variables()
+        variables = [m._variables[name] for name in names]
+        objective_variables = [m._variables[name] for name in self.objective_variables()]
+        temporary_constraints = self.add_constraints(
+            m, [([(1, name) for name in self.objective_variables()], "<=", max_active_sboxes)])
+        # Only the pool parameters are changed, the other parameters of the caller are kept
+        pool_parameters = {name: m.getParamInfo(name)[2]
+                           for name in ["PoolSearchMode", "PoolSolutions", "SolutionNumber"]}
+        m.setParam(GRB.Param.PoolSearchMode, 2)
+        m.setParam(GRB.Param.PoolSolutions, pool_size)
+        found = {}
+        while True:
+            m.optimize()
+            if m.Status != 2:
+                complete = (m.Status == 3)
+                break
+            for k in range(m.SolCount):
+                m.setParam(GRB.Param.SolutionNumber, k)
+                values = tuple(int(round(x)) for x in m.getAttr("Xn", variables))
+                if values in found:
+                    continue
+                found[values] = int(round(sum(m.getAttr("Xn", objective_variables))))
+                # sum of (1 - v) over the active variables + sum of v over the passive ones >= 1
+                temporary_constraints.append(m.addLConstr(
+                    LinExpr([-1 if value else 1 for value in values], variables),
+                    GRB.GREATER_EQUAL, 1 - sum(values)))
+        m.remove(temporary_constraints)
+        for name, value in pool_parameters.items():
+            m.setParam(name, value)
+        m.update()
+        patterns = []
+        number_of_states = self.last_state() + 1 - self.starting_round
+        for values, active_sboxes in found.items():
+            pattern = ["".join(str(values[16*r + i]) for i in reversed(range(16)))
+                       for r in range(number_of_states)]
+            tweak = "".join(str(value) for value in reversed(values[16*number_of_states:])) \
+                if (self.related_tweak == 1) else None
+            patterns.append((active_sboxes, pattern, tweak))
+        patterns.sort()
+        return patterns, complete
+
+    def extend_model(self, m):
+        """
+        Extend a model of self.rounds rounds built by build_model to self.rounds + 1
+        rounds, and increment self.rounds. Only the constraints of the new round
+        are added, and the objective is extended to the new round.
+        """
+        assert(self.starting_round + self.rounds < 32)
+        self.constraints = []
+        self.constraints_by_round(self.starting_round + self.rounds)
+        round_constraints = self.constraints
+        self.rounds += 1
+        # The constraints of constraint() are generated again for the new number of rounds
+        self.constraints = []
+        for name in self.binary_variables():
+            if name not in m._variables:
+                m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        self.add_constraints(m, round_constraints)
+        if (self.related_tweak == 0):
+            # The all-zero trail is excluded on the input and the new output state
+            m.remove(m._init_constraints)
+            m._init_constraints = self.add_constraints(m, self.initial_state_constraints())
+        m.remove(m._bound_constraints)
+        m._bound_constraints = []
+        self.set_objective(m)
+        m.update()
+        return m
+
+    @staticmethod
+    def get_values(names, m):
+        """
+        Return the values of the variables names of a solved model as a string,
+        where the last variable is the first character
+        """
+        return "".join([str(int(round(m.getVarByName(name).X))) for name in reversed(names)])
+
     def get_state_values_at_round(self, s, r, m):
         v_names = ["%s_%d_%d" % (s, r, nibble_number)
                            for nibble_number in range(16)]
-        v_names.reverse()
-        temp = map(m.getVarByName, v_names)                
-        v_values = "0x" + "".join([str(int(e.X)) for e in temp])
-        return v_values
-    
+        return "0x" + self.get_values(v_names, m)
+
     def get_state_values_output_of_mixing(self, r, m):
-        v_names1 = self.create_variables_after_mc(r, "y", "x")
-        v_names1.reverse()
-        temp1 = map(m.getVarByName, v_names1)                    
-        v_values1 = "0x" + "".join([str(int(e.X)) for e in temp1])
-        return v_values1
-    
+        return "0x" + self.get_values(self.create_variables_after_mc(r, "y", "x"), m)
+
     def get_tweak_values(self, m):
-        v_names = self.tweak
-        v_names.reverse()
-        temp = map(m.getVarByName, v_names)
-        v_values = "0x" + "".join([str(int(e.X)) for e in temp])
-        return v_values
+        return "0x" + self.get_values(self.tweak, m)
+
+    def get_activity_pattern(self, m):
+        """
+        Return the activity pattern of a solved model, i.e., the active nibbles
+        of x at the rounds starting_round, ..., starting_round + rounds (up to
+        the round 31, see last_state)
+        """
+        return [self.get_state_values_at_round("x", r, m)[2:]
+                for r in range(self.starting_round, self.last_state() + 1)]
 
-    def solve_model(self):
+    def solve_model(self, m=None):
         """
-        Solve the MILP model to search impossible linear trails
+        Solve the MILP model to find an optimum activity pattern. The model is
+        read from filename_model, unless a model built by build_model is given.
         """
         time_start = time.time()
-        m = read(self.filename_model)
-        #m.setParam(GRB.Param.OutputFlag, 0)
-        m.setParam(GRB.Param.Threads, 32)
-        #m.setParam(GRB.Param.Presolve, 0)
+        if m is None:
+            m = read(self.filename_model)
+            #m.setParam(GRB.Param.OutputFlag, 0)
+            m.setParam(GRB.Param.Threads, self.threads)
+            #m.setParam(GRB.Param.Presolve, 0)
         m.optimize()
         # Gurobi syntax: m.Status == 2 represents the model is feasible.
         if m.Status == 2:
             status = 2
-            obj = m.getObjective()
-            for r in range(self.starting_round, self.rounds + 1 + self.starting_round):
-                state1 = self.get_state_values_at_round("x", r, m)
-                if (r < self.rounds + self.starting_round):
-                    state2 = self.get_state_values_output_of_mixing(r, m)
-                    #print("x%d: %s\t\t\ty%d: %s" %
-                    #      (r, state1, r, state2))
-                    print(state1[2:])
-                else:
-                    #print("x%d: %s" % (r, state1))
-                    print(state1[2:])
+            for state in self.get_activity_pattern(m):
+                print(state)
             if (self.related_tweak == 1):
                 tweak_values = self.get_tweak_values(m)
                 print("t: %s" % tweak_values)
@@ -331,6 +581,7 @@ class Craft:
             status = 3
             print("The model is infeasible!")
         else:
+            status = m.Status
             print("Unknown error!")
         time_end = time.time()
         print(("Time used = " + str(time_end - time_start)))
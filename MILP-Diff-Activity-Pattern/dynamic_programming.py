@@ -0,0 +1,334 @@
+'''
+Applying the MILP-based method to find an optimum differential activity pattern for CRAFT
+Copyright (C) June 1, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+11 Khordad, 1398
+'''
+
+import time
+import numpy as np
+
+"""
+Minimum number of active S-boxes by dynamic programming, without a MILP solver:
+
+A truncated state (the activity of the 16 nibbles, see craft.py) is a 16-bit
+integer, where bit i is the nibble i. The costs of all the 2^16 states of a
+batch of runs are a NumPy array of shape (2,)*16 + (batch,), where the axis
+15 - i is the nibble i, and cost[x] is the minimum number of active S-boxes
+of the trails which end in x. A round is applied as in the MILP model:
+- MixColumn is a sequence of truncated XORs a ^= b on two nibbles, where the
+  output of a XOR is any value if both of its inputs are active (see
+  Craft.constraints_by_truncxor and Craft.constraints_by_mixing_layer)
+- AddTweakey (related-tweak model) is the same truncated XOR with the nibbles
+  of the tweak of the round, TK[r % 4] (see Craft.initialize_tweakey_differences)
+- PermuteNibbles, and the weight of the new state is added to its cost
+The last round of CRAFT (round 31) has no PermuteNibbles and no S-boxes, so
+it does not change the bound, and the patterns end with the state x_31 (see
+Craft.last_state).
+In the single-tweak model, the input state is nonzero, hence the bounds do not
+depend on the starting round, and a single run gives all of them. In the
+related-tweak model, the input state is free and the tweak is nonzero, and
+every tweak is a run. The tweaks of weight 1 and 2 give the first bounds, and
+a branch and bound over the nibbles of the tweak finds the other ones: the
+undecided nibbles of the tweak are relaxed (active or passive in every round),
+which gives a lower bound for all of their values, and a branch is cut when
+its lower bounds cannot improve the bound of any number of rounds. The tweaks
+whose last active nibble has just been decided are complete, and they are run
+as soon as their branch is kept, which improves the bounds before the deeper
+levels are cut. Still, many branches survive the relaxation, and the 32-round
+table of a starting round takes 270 to 330 seconds on one core (about 45
+seconds for 10 rounds).
+"""
+
+INFINITY = 1 << 12
+
+
+def truncxor(a, b):
+    """
+    Return the possible activities of a XOR b (see Craft.constraints_by_truncxor)
+    """
+    return [0, 1] if (a == 1 and b == 1) else [a ^ b]
+
+
+def mixing_relation():
+    """
+    Return the 16 x 16 boolean table of the truncated MixColumn on a column,
+    where the input a and the output b are (nibble j, 4 + j, 8 + j, 12 + j)
+    from the most to the least significant bit (see Craft.constraints_by_mixing_layer)
+    """
+    relation = np.zeros((16, 16), dtype=bool)
+    for a in range(16):
+        x0, x4, x8, x12 = (a >> 3) & 1, (a >> 2) & 1, (a >> 1) & 1, a & 1
+        for dummy in truncxor(x0, x8):
+            for y0 in truncxor(dummy, x12):
+                for y4 in truncxor(x4, x12):
+                    relation[a, (y0 << 3) | (y4 << 2) | (x8 << 1) | x12] = True
+    return relation
+
+
+def weight(x):
+    return bin(x).count("1")
+
+
+class DynamicProgramming:
+    def __init__(self, related_tweak=0, starting_round=0, batch_size=256):
+        self.related_tweak = related_tweak
+        self.starting_round = starting_round
+        self.batch_size = batch_size
+        self.p_permute_nibbles = [
+            0xf, 0xc, 0xd, 0xe, 0xa, 0x9, 0x8, 0xb, 0x6, 0x5, 0x4, 0x7, 0x1, 0x2, 0x3, 0x0]
+        self.q_permute_teakey_nibbles = [
+            0xc, 0xa, 0xf, 0x5, 0xe, 0x8, 0x9, 0x2, 0xb, 0x3, 0x7, 0x4, 0x6, 0x0, 0x1, 0xd]
+        # preimages[b] lists the inputs a of a column which can give the output b
+        relation = mixing_relation()
+        self.preimages = [np.nonzero(relation[:, b])[0] for b in range(16)]
+        # Truncated XORs a ^= b of MixColumn: y_j = x_j + x_(8 + j) + x_(12 + j)
+        # and y_(4 + j) = x_(4 + j) + x_(12 + j)
+        self.mixing_xors = [xor for j in range(4) for xor in ((j, 8 + j), (j, 12 + j), (4 + j, 12 + j))]
+        # State x goes to x' with x'[P[i]] = x[i] (see Craft.permute_nibbles)
+        self.axes = list(range(17))
+        for i in range(16):
+            self.axes[15 - self.p_permute_nibbles[i]] = 15 - i
+        self.weights = np.array([weight(x) for x in range(1 << 16)], dtype=np.int16)
+
+    def round_tweak(self, tweak, r):
+        """
+        Return the tweak of the round r, TK[r % 4], of the tweak difference tweak
+        """
+        if (r % 4 < 2):
+            return tweak
+        return sum(((tweak >> self.q_permute_teakey_nibbles[i]) & 1) << i for i in range(16))
+
+    @staticmethod
+    def half(cost, nibble, value, other_nibble=None, other_value=None):
+        """
+        Return the view of the costs where the nibble has the activity value
+        (and other_nibble has other_value)
+        """
+        index = [slice(None)]*17
+        index[15 - nibble] = value
+        if other_nibble is not None:
+            index[15 - other_nibble] = other_value
+        return cost[tuple(index)]
+
+    def mixing_layer(self, cost):
+        """
+        Return the cost of every output of MixColumn. Only the states where b is
+        active are changed by a ^= b: a passive output a comes from an active a,
+        and an active output a from both.
+        """
+        cost = cost.copy()
+        for a, b in self.mixing_xors:
+            passive = self.half(cost, a, 0, b, 1)
+            active = self.half(cost, a, 1, b, 1)
+            passive_input = passive.copy()
+            passive[...] = active
+            np.minimum(active, passive_input, out=active)
+        return cost
+
+    def add_tweakey(self, cost, round_tweaks, round_free_nibbles):
+        """
+        Return the cost of every output of AddTweakey, where round_tweaks holds
+        the tweak of the round of every run of the batch, and the nibbles of
+        round_free_nibbles may be either active or passive in every round. The
+        runs are told apart by adding INFINITY to the costs which they exclude.
+        """
+        cost = cost.copy()
+        for i in range(16):
+            active = ((round_tweaks >> i) & 1) == 1
+            free = ((round_free_nibbles >> i) & 1) == 1
+            if not (active | free).any():
+                continue
+            # A passive output comes from a passive input (passive tweak), an active
+            # input (active tweak) or both (free tweak), and an active output comes
+            # from an active input, or from both unless the tweak is passive
+            exclude_passive_input = np.where(active, INFINITY, 0).astype(np.int16)
+            exclude_active_input = np.where(active | free, 0, INFINITY).astype(np.int16)
+            passive_input = self.half(cost, i, 0)
+            active_input = self.half(cost, i, 1)
+            active_output = np.minimum(active_input, passive_input + exclude_active_input)
+            np.minimum(passive_input + exclude_passive_input, active_input + exclude_active_input,
+                       out=passive_input)
+            active_input[...] = active_output
+        return cost
+
+    def permute_nibbles(self, cost):
+        return np.ascontiguousarray(np.transpose(cost, self.axes))
+
+    def initial_cost(self, batch):
+        """
+        Return the cost of the input states: 0, except the zero state in the
+        single-tweak model
+        """
+        cost = np.zeros((1 << 16, batch), dtype=np.int16)
+        if (self.related_tweak == 0):
+            cost[0] = INFINITY
+        return cost.reshape((2,)*16 + (batch,))
+
+    def propagate(self, rounds, tweaks=None, free_nibbles=None, keep_history=False):
+        """
+        Return the minimum number of active S-boxes after 1, ..., rounds rounds as
+        an array of shape (rounds, batch), for every tweak of tweaks (one run if
+        None), and the costs of the first run before and after MixColumn of each
+        round if keep_history is True. The nibbles of free_nibbles (none if None)
+        of each tweak are relaxed, i.e., they may be active or passive in every
+        round, which gives a lower bound for all the tweaks which only differ on
+        these nibbles.
+        """
+        assert(self.starting_round + rounds <= 32)
+        tweaks = np.array([0] if tweaks is None else tweaks, dtype=np.int64)
+        free_nibbles = np.zeros_like(tweaks) if free_nibbles is None else np.array(free_nibbles, dtype=np.int64)
+        batch = len(tweaks)
+        cost = self.initial_cost(batch)
+        bounds = np.empty((rounds, batch), dtype=np.int32)
+        history = []
+        for r in range(self.starting_round, self.starting_round + rounds):
+            if (r == 31):
+                bounds[r - self.starting_round] = cost.reshape(1 << 16, batch).min(axis=0)
+                break
+            mixed = self.mixing_layer(cost)
+            if keep_history:
+                history.append((cost.reshape(1 << 16, batch)[:, 0].copy(), mixed.reshape(1 << 16, batch)[:, 0].copy()))
+            if (self.related_tweak == 1):
+                round_tweaks = np.array([self.round_tweak(int(tweak), r) for tweak in tweaks])
+                round_free_nibbles = np.array([self.round_tweak(int(free), r) for free in free_nibbles])
+                mixed = self.add_tweakey(mixed, round_tweaks, round_free_nibbles)
+            cost = self.permute_nibbles(mixed).reshape(1 << 16, batch)
+            cost = np.minimum(cost + self.weights[:, None], INFINITY)
+            bounds[r - self.starting_round] = cost.min(axis=0)
+            cost = cost.reshape((2,)*16 + (batch,))
+        if keep_history:
+            history.append((cost.reshape(1 << 16, batch)[:, 0].copy(), None))
+        return bounds, history
+
+    def propagate_in_batches(self, rounds, tweaks, free_nibbles=None):
+        """
+        Return the bounds of propagate for any number of tweaks, in batches of batch_size
+        """
+        if free_nibbles is None:
+            free_nibbles = [0]*len(tweaks)
+        bounds = [self.propagate(rounds, tweaks[k:k + self.batch_size], free_nibbles[k:k + self.batch_size])[0]
+                  for k in range(0, len(tweaks), self.batch_size)]
+        return np.concatenate(bounds, axis=1) if bounds else np.zeros((rounds, 0), dtype=np.int32)
+
+    def minimum_active_sboxes(self, rounds=None):
+        """
+        Return the minimum number of active S-boxes after 1, ..., rounds rounds
+        (up to the round 31 if None),
+        and the tweak of an optimal trail for each number of rounds (None in the
+        single-tweak model). In the related-tweak model, the branch and bound
+        takes minutes for 32 rounds (see the note above).
+        """
+        if rounds is None:
+            rounds = 32 - self.starting_round
+        if (self.related_tweak == 0):
+            bounds, _ = self.propagate(rounds)
+            return [int(bound) for bound in bounds[:, 0]], [None]*rounds
+        bounds = [INFINITY]*rounds
+        best_tweaks = [None]*rounds
+
+        def update(tweaks):
+            tweak_bounds = self.propagate_in_batches(rounds, tweaks)
+            for r in range(rounds):
+                if len(tweaks) and (tweak_bounds[r].min() < bounds[r]):
+                    index = int(tweak_bounds[r].argmin())
+                    bounds[r] = int(tweak_bounds[r, index])
+                    best_tweaks[r] = tweaks[index]
+
+        def improves(lower_bounds, index):
+            return any(lower_bounds[r, index] < bounds[r] for r in range(rounds))
+
+        update([t for t in range(1, 1 << 16) if weight(t) <= 2])
+        # The nibbles 0, ..., k of the tweaks of the level k are decided. The
+        # tweaks whose nibble k is the last active one are complete, and they are
+        # run as soon as their branch is kept, so that the bounds improve early.
+        tweaks = [0]
+        for k in range(16):
+            tweaks = [t for tweak in tweaks for t in (tweak, tweak | (1 << k))]
+            if (k == 15):
+                update([t for t in tweaks if ((t >> k) & 1) and weight(t) > 2])
+                break
+            free_nibbles = [(0xffff >> (k + 1)) << (k + 1)]*len(tweaks)
+            lower_bounds = self.propagate_in_batches(rounds, tweaks, free_nibbles)
+            kept = [index for index in range(len(tweaks)) if improves(lower_bounds, index)]
+            update([tweaks[index] for index in kept if ((tweaks[index] >> k) & 1) and weight(tweaks[index]) > 2])
+            tweaks = [tweaks[index] for index in kept if improves(lower_bounds, index)]
+        return bounds, best_tweaks
+
+    def optimal_pattern(self, rounds, tweak=None):
+        """
+        Return (number of active S-boxes, activity pattern) of an optimal trail
+        of rounds rounds (with the tweak difference tweak in the related-tweak
+        model), where the pattern lists the states x of the rounds starting_round,
+        ..., starting_round + rounds (up to the round 31) as strings from the
+        nibble 15 to the nibble 0, like Craft.get_activity_pattern
+        """
+        bounds, history = self.propagate(rounds, None if tweak is None else [tweak], keep_history=True)
+        x = int(history[-1][0].argmin())
+        states = [x]
+        last_state = min(self.starting_round + rounds, 31)
+        for r in range(last_state - 1, self.starting_round - 1, -1):
+            cost, mixed = history[r - self.starting_round]
+            target = history[r + 1 - self.starting_round][0][x] - weight(x)
+            # Output of AddTweakey, and the outputs of MixColumn which can give it
+            z = sum(((x >> self.p_permute_nibbles[i]) & 1) << i for i in range(16))
+            outputs = [z]
+            if (self.related_tweak == 1):
+                round_tweak = self.round_tweak(tweak, r)
+                for i in range(16):
+                    if ((round_tweak >> i) & 1):
+                        if ((z >> i) & 1):
+                            outputs = [y & ~(1 << i) for y in outputs] + [y | (1 << i) for y in outputs]
+                        else:
+                            outputs = [y | (1 << i) for y in outputs]
+            y = [y for y in outputs if mixed[y] == target][0]
+            # Inputs of MixColumn which can give y
+            inputs = [0]
+            for j in range(4):
+                b = (((y >> j) & 1) << 3) | (((y >> (4 + j)) & 1) << 2) | \
+                    (((y >> (8 + j)) & 1) << 1) | ((y >> (12 + j)) & 1)
+                inputs = [x_in | (((a >> 3) & 1) << j) | (((a >> 2) & 1) << (4 + j)) |
+                          (((a >> 1) & 1) << (8 + j)) | ((a & 1) << (12 + j))
+                          for x_in in inputs for a in self.preimages[b]]
+            x = [x_in for x_in in inputs if cost[x_in] == target][0]
+            states.append(x)
+        states.reverse()
+        return int(bounds[-1, 0]), [format(state, "016b") for state in states]
+
+    def records(self, first_rounds=1, last_rounds=None):
+        """
+        Return the records (related_tweak, starting_round, rounds, status,
+        active_sboxes, pattern, tweak, time) of first_rounds, ..., last_rounds
+        rounds, in the format of scheduler.sweep, where time is the time of the
+        pattern plus an equal share of the time of the bounds. last_rounds is at
+        most the number of rounds up to the round 31 (all of them if None).
+        """
+        if last_rounds is None:
+            last_rounds = 32 - self.starting_round
+        last_rounds = min(last_rounds, 32 - self.starting_round)
+        time_start = time.time()
+        bounds, best_tweaks = self.minimum_active_sboxes(last_rounds)
+        time_share = (time.time() - time_start) / (last_rounds - first_rounds + 1)
+        records = []
+        for rounds in range(first_rounds, last_rounds + 1):
+            time_start = time.time()
+            tweak = best_tweaks[rounds - 1]
+            active_sboxes, pattern = self.optimal_pattern(rounds, tweak)
+            records.append({"related_tweak": self.related_tweak, "starting_round": self.starting_round,
+                            "rounds": rounds, "status": 2, "active_sboxes": active_sboxes,
+                            "pattern": pattern, "tweak": None if tweak is None else format(tweak, "016b"),
+                            "time": round(time.time() - time_start + time_share, 3)})
+        return records
@@ -19,13 +19,45 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 '''
 
 from craft import Craft                  
+from scheduler import sweep, enumerate_optimal_patterns
 
 if __name__ == "__main__":
 
     rounds = 18
     related_tweak = 0
     starting_round = 0
-    craft = Craft(rounds, related_tweak, starting_round)
-    craft.make_model()
-    craft.solve_model()
+    # Sweep the number of rounds from 1 to last_rounds for the starting rounds 0, ..., 3
+    # of both tweak models in one job (see scheduler.py), instead of solving a single model.
+    # The workers and their solver threads share core_budget cores (all if None).
+    sweep_flag = False
+    last_rounds = 32
+    core_budget = None
+    # Compute the bounds of the sweep by dynamic programming over the 2^16 truncated
+    # states instead of solving MILP models (see dynamic_programming.py)
+    use_dynamic_programming = False
+    # Encoding of MixColumn: "truncxor" (chains of truncated XORs with dummy variables)
+    # or "column" (the convex hull of each column, without dummy variables), and the
+    # number of rounds of the windows whose number of active S-boxes is bounded by cuts
+    # (0 for no cuts, see Craft.constraints_by_windows)
+    mixing_encoding = "truncxor"
+    window_rounds = 0
+    # List all the optimal activity patterns of rounds rounds for each input pattern of
+    # input_patterns (nibble 15 first, free if None) and the output pattern output_pattern
+    # (free if None), or all the patterns with up to extra_active_sboxes more active S-boxes.
+    # The input patterns are split between the workers (see scheduler.py).
+    enumerate_flag = False
+    input_patterns = None
+    output_pattern = None
+    extra_active_sboxes = 0
+    if sweep_flag:
+        sweep(1, last_rounds, core_budget=core_budget, use_dynamic_programming=use_dynamic_programming,
+              mixing_encoding=mixing_encoding, window_rounds=window_rounds)
+    elif enumerate_flag:
+        craft = Craft(rounds, related_tweak, starting_round, mixing_encoding, window_rounds)
+        enumerate_optimal_patterns(craft, input_patterns, output_pattern, extra_active_sboxes,
+                                   core_budget=core_budget)
+    else:
+        craft = Craft(rounds, related_tweak, starting_round, mixing_encoding, window_rounds)
+        craft.make_model()
+        craft.solve_model()
        
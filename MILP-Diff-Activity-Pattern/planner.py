@@ -0,0 +1,48 @@
+'''
+Applying the MILP-based method to find an optimum differential activity pattern for CRAFT
+Copyright (C) June 1, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+11 Khordad, 1398
+'''
+
+from multiprocessing import cpu_count
+
+"""
+Sharing a budget of cores between the worker processes and the solver threads:
+
+Each one of the number_of_workers processes runs its own solver with threads
+threads, hence number_of_workers * threads should not exceed the number of
+cores, otherwise the threads compete for the cores. plan() splits the budget
+(the benchmark of several splits is in Zero-Correlation/zerocorrelation/planner.py).
+"""
+
+
+def plan(core_budget=None, number_of_workers=None, threads=None):
+    """
+    Return (number_of_workers, threads) such that number_of_workers * threads
+    fits into core_budget (all cores if None). If neither number_of_workers nor
+    threads is given, every core runs a worker with a single solver thread.
+    """
+    if (core_budget == None):
+        core_budget = cpu_count()
+    if (number_of_workers == None):
+        number_of_workers = core_budget // threads if (threads != None) else core_budget
+    number_of_workers = max(1, min(number_of_workers, core_budget))
+    if (threads == None):
+        threads = core_budget // number_of_workers
+    threads = max(1, min(threads, core_budget // number_of_workers))
+    return number_of_workers, threads
+
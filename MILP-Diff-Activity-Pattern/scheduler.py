@@ -0,0 +1,265 @@
+'''
+Applying the MILP-based method to find an optimum differential activity pattern for CRAFT
+Copyright (C) June 1, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+11 Khordad, 1398
+'''
+
+from multiprocessing import Pool
+import json
+import time
+from gurobipy import GRB, GurobiError
+from craft import Craft
+from dynamic_programming import DynamicProgramming
+from planner import plan
+
+"""
+Sweep over the number of rounds, the starting rounds and the tweak models:
+
+Every configuration (related_tweak, starting_round) is a task of a pool of
+workers. A worker builds the model of first_rounds rounds in memory once, and
+after each solve it extends the model by one round (see Craft.extend_model)
+up to last_rounds rounds, so no LP file is written or read. The minimum number
+of active S-boxes of r rounds is added as a lower bound of r + 1 rounds (see
+Craft.set_lower_bound). The results of all configurations are written into
+one JSON file, a list of records (related_tweak, starting_round, rounds,
+status, active_sboxes, pattern, tweak, time), and printed as a table. With
+use_dynamic_programming, each configuration is solved by dynamic_programming.py
+instead of Gurobi.
+
+enumerate_optimal_patterns() splits a list of input patterns between the
+workers in the same way. For each input pattern (and a fixed or free output
+pattern), a worker builds the model once, finds its optimum, and lists all the
+patterns with at most extra_active_sboxes more active S-boxes in the same
+solver session (see Craft.enumerate_patterns).
+
+benchmark_encodings() compares the encodings of MixColumn and the window cuts
+(see Craft.constraints_by_mixing_layer and Craft.constraints_by_windows) by
+the time to solve a configuration for several numbers of rounds.
+"""
+
+
+def probe_configuration(task):
+    """
+    Find the minimum number of active S-boxes of a configuration for
+    first_rounds, ..., last_rounds rounds, where task is (related_tweak,
+    starting_round, first_rounds, last_rounds, threads, use_dynamic_programming,
+    mixing_encoding, window_rounds), and return the list of records
+    """
+    related_tweak, starting_round, first_rounds, last_rounds, threads, use_dynamic_programming, \
+        mixing_encoding, window_rounds = task
+    if use_dynamic_programming:
+        return DynamicProgramming(related_tweak, starting_round).records(first_rounds, last_rounds)
+    craft = Craft(first_rounds, related_tweak, starting_round, mixing_encoding, window_rounds)
+    craft.threads = threads
+    model = craft.build_model()
+    records = []
+    while True:
+        time_start = time.time()
+        model.optimize()
+        record = {"related_tweak": related_tweak, "starting_round": starting_round,
+                  "rounds": craft.rounds, "status": model.Status, "active_sboxes": None,
+                  "pattern": None, "tweak": None}
+        if model.Status == 2:
+            record["active_sboxes"] = int(round(model.ObjVal))
+            record["pattern"] = craft.get_activity_pattern(model)
+            if (related_tweak == 1):
+                record["tweak"] = craft.get_tweak_values(model)[2:]
+        record["time"] = round(time.time() - time_start, 3)
+        records.append(record)
+        if craft.rounds == last_rounds:
+            break
+        craft.extend_model(model)
+        if record["active_sboxes"] is not None:
+            craft.set_lower_bound(model, record["active_sboxes"])
+    return records
+
+
+def format_table(records, configurations):
+    """
+    Return the lines of the table of the minimum number of active S-boxes,
+    with one row per number of rounds and one column per configuration
+    """
+    bounds = dict(((record["related_tweak"], record["starting_round"], record["rounds"]),
+                   record["active_sboxes"]) for record in records)
+    rounds = sorted(set(record["rounds"] for record in records))
+    header = "Rounds"
+    for related_tweak, starting_round in configurations:
+        header += "\t%s%d" % ("RTK" if (related_tweak == 1) else "ST", starting_round)
+    lines = [header]
+    for r in rounds:
+        line = "%d" % r
+        for related_tweak, starting_round in configurations:
+            bound = bounds.get((related_tweak, starting_round, r))
+            line += "\t%s" % ("-" if bound is None else bound)
+        lines.append(line)
+    return lines
+
+
+def sweep(first_rounds=1, last_rounds=32, related_tweaks=(0, 1), starting_rounds=(0, 1, 2, 3),
+          core_budget=None, number_of_workers=None, threads=None, filename=None,
+          use_dynamic_programming=False, mixing_encoding="truncxor", window_rounds=0):
+    """
+    Find the minimum number of active S-boxes for first_rounds, ..., last_rounds
+    rounds of every configuration (related_tweak, starting_round) with a pool
+    of workers, where last_rounds is capped by the round 31 of CRAFT, i.e., at
+    32 - starting_round rounds, and number_of_workers and threads are planned from
+    core_budget (see planner.py). The records are written into filename
+    (bounds_<first_rounds>_<last_rounds>.json if None) and returned. If
+    use_dynamic_programming is True, the configurations are solved without
+    Gurobi (see dynamic_programming.py). mixing_encoding and window_rounds
+    are passed to Craft.
+    """
+    time_start = time.time()
+    if filename is None:
+        filename = "bounds_%d_%d.json" % (first_rounds, last_rounds)
+    configurations = [(related_tweak, starting_round) for related_tweak in related_tweaks
+                      for starting_round in starting_rounds]
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    number_of_workers = min(number_of_workers, len(configurations))
+    tasks = [(related_tweak, starting_round, first_rounds, min(last_rounds, 32 - starting_round), threads,
+              use_dynamic_programming, mixing_encoding, window_rounds)
+             for related_tweak, starting_round in configurations if first_rounds <= 32 - starting_round]
+    records = []
+    with Pool(number_of_workers) as pool:
+        for configuration_records in pool.imap_unordered(probe_configuration, tasks):
+            records += configuration_records
+            last_record = configuration_records[-1]
+            print("%s%d done \t %.2f s" % ("RTK" if (last_record["related_tweak"] == 1) else "ST",
+                                           last_record["starting_round"],
+                                           sum(record["time"] for record in configuration_records)))
+    records.sort(key=lambda record: (record["related_tweak"], record["starting_round"], record["rounds"]))
+    fileobj = open(filename, "w")
+    json.dump(records, fileobj, indent=1)
+    fileobj.close()
+    for line in format_table(records, configurations):
+        print(line)
+    print("Time used = %.2f" % (time.time() - time_start))
+    return records
+
+
+def probe_input_pattern(task):
+    """
+    Enumerate the activity patterns of a task (craft, input_pattern,
+    output_pattern, threads, extra_active_sboxes), where the input and the
+    output patterns, i.e., the first and the last states x (see
+    Craft.last_state), are fixed (free if None), with at most extra_active_sboxes
+    active S-boxes more than the optimum, and return a record (input_pattern,
+    related_tweak, starting_round, input_pattern, output_pattern, status, optimum,
+    patterns, incomplete, time), where incomplete is True if the enumeration
+    stopped before the model became infeasible
+    """
+    craft, input_pattern, output_pattern, threads, extra_active_sboxes = task
+    time_start = time.time()
+    craft.threads = threads
+    model = craft.build_model()
+    if input_pattern is not None:
+        craft.fix_state(model, craft.starting_round, input_pattern)
+    if output_pattern is not None:
+        craft.fix_state(model, craft.last_state(), output_pattern)
+    model.update()
+    model.optimize()
+    record = {"related_tweak": craft.related_tweak, "starting_round": craft.starting_round,
+              "input_pattern": input_pattern, "output_pattern": output_pattern,
+              "status": model.Status, "optimum": None, "patterns": [], "incomplete": (model.Status != 3)}
+    if model.Status == 2:
+        record["optimum"] = int(round(model.ObjVal))
+        patterns, complete = craft.enumerate_patterns(model, record["optimum"] + extra_active_sboxes)
+        record["patterns"] = [{"active_sboxes": active_sboxes, "pattern": pattern, "tweak": tweak}
+                              for active_sboxes, pattern, tweak in patterns]
+        record["incomplete"] = not complete
+    record["time"] = round(time.time() - time_start, 3)
+    return record
+
+
+def enumerate_optimal_patterns(craft, input_patterns=None, output_pattern=None, extra_active_sboxes=0,
+                               core_budget=None, number_of_workers=None, threads=None, filename=None):
+    """
+    Enumerate all the optimal activity patterns of craft.rounds rounds for each
+    input pattern of input_patterns (a free input if None) and output_pattern
+    (free if None), or all the patterns with at most extra_active_sboxes more
+    active S-boxes than the optimum of their input, where the input patterns
+    are split between a pool of workers. The records are written into filename
+    (patterns_<rounds>.json if None) and returned.
+    """
+    time_start = time.time()
+    if filename is None:
+        filename = "patterns_%d.json" % craft.rounds
+    if input_patterns is None:
+        input_patterns = [None]
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    number_of_workers = min(number_of_workers, len(input_patterns))
+    tasks = [(craft, input_pattern, output_pattern, threads, extra_active_sboxes)
+             for input_pattern in input_patterns]
+    records = []
+    with Pool(number_of_workers) as pool:
+        for record in pool.imap_unordered(probe_input_pattern, tasks):
+            records.append(record)
+            if record["optimum"] is None:
+                print("%s : %s \t %.2f s" % (record["input_pattern"], "incomplete (status %d)" % record["status"]
+                                             if record["incomplete"] else "infeasible", record["time"]))
+                continue
+            number_of_optimal_patterns = len([pattern for pattern in record["patterns"]
+                                              if pattern["active_sboxes"] == record["optimum"]])
+            print("%s : %d active S-boxes, %d optimal pattern(s), %d pattern(s)%s \t %.2f s" %
+                  (record["input_pattern"], record["optimum"], number_of_optimal_patterns,
+                   len(record["patterns"]), " (incomplete)" if record["incomplete"] else "", record["time"]))
+    records.sort(key=lambda record: (record["optimum"] is None, record["optimum"], str(record["input_pattern"])))
+    fileobj = open(filename, "w")
+    json.dump(records, fileobj, indent=1)
+    fileobj.close()
+    print("Time used = %.2f" % (time.time() - time_start))
+    return records
+
+
+def benchmark_encodings(rounds_list, related_tweak=0, starting_round=0,
+                        variants=(("truncxor", 0), ("column", 0), ("column", 6), ("truncxor", 6)),
+                        time_limit=300, threads=1):
+    """
+    Solve the configuration (related_tweak, starting_round) for every number
+    of rounds of rounds_list and every variant (mixing_encoding,
+    window_rounds), with a time limit per solve, print one line per solve,
+    and return the list of records. The time to compute the window bounds is
+    not included in the solve time.
+    """
+    records = []
+    for rounds in rounds_list:
+        for mixing_encoding, window_rounds in variants:
+            craft = Craft(rounds, related_tweak, starting_round, mixing_encoding, window_rounds)
+            craft.threads = threads
+            model = craft.build_model()
+            model.setParam(GRB.Param.TimeLimit, time_limit)
+            record = {"rounds": rounds, "mixing_encoding": mixing_encoding, "window_rounds": window_rounds,
+                      "variables": model.NumVars, "constraints": model.NumConstrs, "status": None,
+                      "active_sboxes": None, "bound": None, "nodes": None, "time": None}
+            time_start = time.time()
+            try:
+                model.optimize()
+            except GurobiError as error:
+                print("%d rounds, %s, windows of %d rounds : %s" % (rounds, mixing_encoding, window_rounds, error))
+                records.append(record)
+                continue
+            record["time"] = round(time.time() - time_start, 2)
+            record["status"] = model.Status
+            if model.SolCount > 0:
+                record["active_sboxes"] = int(round(model.ObjVal))
+            record["bound"] = model.ObjBound
+            record["nodes"] = int(model.NodeCount)
+            print("%d rounds, %s, windows of %d rounds : %d vars, %d constrs, %s active S-boxes, bound %.1f, %.2f s" %
+                  (rounds, mixing_encoding, window_rounds, record["variables"], record["constraints"],
+                   record["active_sboxes"], record["bound"], record["time"]))
+            records.append(record)
+    return records
@@ -18,6 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 16 Esfand, 1397
 '''
 
+import os
 import time
 from gurobipy import *
 """
@@ -60,6 +61,8 @@ class Craft:
         # self.dummy_var_index = 0
         self.related_tweak = related_tweak
         self.block_size = 64
+        # The model is solved by a single process, which gets all the cores
+        self.threads = os.cpu_count()
         self.p_permute_nibbles = [
             0xf, 0xc, 0xd, 0xe, 0xa, 0x9, 0x8, 0xb, 0x6, 0x5, 0x4, 0x7, 0x1, 0x2, 0x3, 0x0]
         self.q_permute_teakey_nibbles = [
@@ -474,7 +477,7 @@ class Craft:
         """
         time_start = time.time()
         m = read(self.filename_model)
-        m.setParam(GRB.Param.Threads, 16)
+        m.setParam(GRB.Param.Threads, self.threads)
         m.optimize()
         # Gurobi syntax: m.Status == 2 represents the model is feasible.
         if m.Status == 2:
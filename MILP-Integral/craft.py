@@ -48,6 +48,12 @@ class Craft:
         fileobj.close()
         fileobj = open(self.result_file_name, "w")
         fileobj.close()
+        # Constraints of the model as (terms, sense, rhs), where terms is a
+        # list of (coefficient, variable name). The model is either written
+        # into an LP file (make_model) or built in memory (build_model) from
+        # this list. The constraints of the initial division property are not
+        # in this list (see init_constraints).
+        self.constraints = []
 
     def set_constant_bits(self, constant_bits):
         self.constant_bits = constant_bits
@@ -91,80 +97,71 @@ class Craft:
     def flatten(self, state):
         return [state[i][j] for i in range(16) for j in range(4)]
 
+    def add_constraint(self, terms, sense, rhs):
+        """
+        Add the constraint sum(coefficient * variable) sense rhs to the model,
+        where sense is one of ">=", "=", "<="
+        """
+        self.constraints.append((terms, sense, rhs))
+
+    @staticmethod
+    def constraint_to_lp(constraint):
+        """
+        Convert a constraint into a line of an LP file.
+        """
+        terms, sense, rhs = constraint
+        lhs = ""
+        for coefficient, variable in terms:
+            if coefficient < 0:
+                lhs += " - " if lhs != "" else "- "
+            elif lhs != "":
+                lhs += " + "
+            if abs(coefficient) != 1:
+                lhs += "%d " % abs(coefficient)
+            lhs += variable
+        return "%s %s %d\n" % (lhs, sense, rhs)
+
     def constraints_by_sbox(self, variable1, variable2):
         """
         Generate the constraints by Sbox layer.
         """
-        fileobj = open(self.model_file_name, "a")
         for k in range(0, 16):
             for coff in Craft.sb:
-                temp = []
-                for u in range(0, 4):
-                    temp.append(str(coff[u]) + " " + variable1[k][u])
-                for v in range(0, 4):
-                    temp.append(str(coff[4 + v]) + " " + variable2[k][v])
-                temp1 = " + ".join(temp)
-                temp1 = temp1.replace("+ -", "- ")
-                s = str(-coff[Craft.NUMBER - 1])
-                s = s.replace("--", "")
-                temp1 += " >= " + s
-                fileobj.write(temp1)
-                fileobj.write("\n")
-        fileobj.close()
+                terms = [(coff[u], variable1[k][u]) for u in range(4) if coff[u] != 0]
+                terms += [(coff[4 + v], variable2[k][v]) for v in range(4) if coff[4 + v] != 0]
+                self.add_constraint(terms, ">=", -coff[Craft.NUMBER - 1])
 
     def constraints_by_4bit_copy(self, x, x1, x2):
         """
         Generate the constraints by 4-bit copy operation.
         x -> (x1, x2)
         """
-        fileobj = open(self.model_file_name, "a")
         for j in range(0, 4):
-            temp = []
-            temp.append(x[j])
-            temp.append(x1[j])
-            temp.append(x2[j])
-            s = " - ".join(temp) + " = 0\n"
-            fileobj.write(s)
-        fileobj.close()
+            self.add_constraint([(1, x[j]), (-1, x1[j]), (-1, x2[j])], "=", 0)
 
     def constraints_by_4bit_xor(self, x, y, z):
         """
         Generate the constraints by 4-bit Xor operation.
         x + y = z
         """
-        fileobj = open(self.model_file_name, "a")
         for j in range(0, 4):
-            temp = []
-            temp.append(z[j])
-            temp.append(y[j])
-            temp.append(x[j])
-            s = " - ".join(temp) + " = 0\n"
-            fileobj.write(s)
-        fileobj.close()
+            self.add_constraint([(1, z[j]), (-1, y[j]), (-1, x[j])], "=", 0)
 
     def constraints_by_4bit_threeway_fork(self, x, x1, x2, x3):
         """
         Generate the constraints by 4-bit threeway fork
         x ---> (x1, x2, x3)
         """
-        fileobj = open(self.model_file_name, "a")
         for i in range(0, 4):
-            temp = [x[i], x1[i], x2[i], x3[i]]
-            s = " - ".join(temp) + " = 0\n"
-            fileobj.write(s)
-        fileobj.close()
+            self.add_constraint([(1, x[i]), (-1, x1[i]), (-1, x2[i]), (-1, x3[i])], "=", 0)
 
     def constraints_by_4bit_threeway_xor(self, x1, x2, x3, x):
         """
         Generate the constraints by 4-bit threeway xor
         x1 + x2 + x3 = x
         """
-        fileobj = open(self.model_file_name, "a")
         for i in range(0, 4):
-            temp = [x[i], x1[i], x2[i], x3[i]]
-            s = " - ".join(temp) + " = 0\n"
-            fileobj.write(s)
-        fileobj.close()
+            self.add_constraint([(1, x[i]), (-1, x1[i]), (-1, x2[i]), (-1, x3[i])], "=", 0)
 
     def PermuteNibbles(self, inputs):
         return [inputs[i] for i in self.p_permute_nibbles]
@@ -193,12 +190,11 @@ class Craft:
 
     def constraint(self):
         """
-        Generate the constraints used in the MILP model.
+        Generate the constraints used in the MILP model, except the ones of
+        the initial division property.
         """
         assert(self.rounds >= 1)
-        fileobj = open(self.model_file_name, "a")
-        fileobj.write("Subject To\n")
-        fileobj.close()
+        self.constraints = []
         x_in = Craft.create_variables(0, "x")
         y = Craft.create_variables(0, "y")
         x_out = Craft.create_variables(1, "x")
@@ -219,42 +215,53 @@ class Craft:
                 self.constraints_by_sbox(y_temp, x_out)
 
     # Variables declaration
-    def variable_binary(self):
+    def binary_variables(self):
         """
-        Specify the variables type.
+        Return the names of all (binary) variables of the model.
         """
-        fileobj = open(self.model_file_name, "a")
-        fileobj.write("Binary\n")
+        variables = []
         for i in range(self.rounds + 1):
             for j in range(16):
                 for k in range(4):
-                    fileobj.write("x_%d_%d_%d\n" % (i, j, k))
+                    variables.append("x_%d_%d_%d" % (i, j, k))
         for i in range(self.rounds):
             for j in range(16):
                 for k in range(4):
-                    fileobj.write("y_%d_%d_%d\n" % (i, j, k))
+                    variables.append("y_%d_%d_%d" % (i, j, k))
         for i in range(self.rounds):
             for j in range(4):
                 for k in range(4):
                     for ind in range(3):
-                        fileobj.write("t%d_%d_%d_%d\n" % (ind, i, j, k))
+                        variables.append("t%d_%d_%d_%d" % (ind, i, j, k))
+        return variables
+
+    def variable_binary(self):
+        """
+        Specify the variables type.
+        """
+        fileobj = open(self.model_file_name, "a")
+        fileobj.write("Binary\n")
+        for variable in self.binary_variables():
+            fileobj.write(variable + "\n")
         fileobj.write("END")
         fileobj.close()
 
-    def init(self):
+    def init_constraints(self):
         """
-        Generate the initial constraints introduced by the initial division property.
+        Return the initial constraints introduced by the initial division property,
+        i.e., the only constraints which depend on the constant bits.
         """
         input_state = Craft.create_variables(0, "x")
         input_state = self.flatten(input_state)
-        fileobj = open(self.model_file_name, "a")
-        eqn = []
-        for i in range(64):
-            if i in self.constant_bits:
-                fileobj.write("%s = 0\n" % input_state[i])
-            else:
-                fileobj.write("%s = 1\n" % input_state[i])
+        return [([(1, input_state[i])], "=", 0 if i in self.constant_bits else 1) for i in range(64)]
 
+    def init(self):
+        """
+        Generate the initial constraints introduced by the initial division property.
+        """
+        fileobj = open(self.model_file_name, "a")
+        for constraint in self.init_constraints():
+            fileobj.write(Craft.constraint_to_lp(constraint))
         fileobj.close()
 
     def make_model(self):
@@ -264,10 +271,88 @@ class Craft:
         fileobj = open(self.model_file_name, "w")
         fileobj.close()
         self.create_objective_function()
-        self.constraint()
+        if self.constraints == []:
+            self.constraint()
+        fileobj = open(self.model_file_name, "a")
+        fileobj.write("Subject To\n")
+        for constraint in self.constraints:
+            fileobj.write(Craft.constraint_to_lp(constraint))
+        fileobj.close()
         self.init()
         self.variable_binary()
 
+    def build_model(self):
+        """
+        Build the MILP model of CRAFT in memory, without writing/reading an LP file.
+        The model has no initial constraints until set_init_constraints is called.
+        """
+        if self.constraints == []:
+            self.constraint()
+        m = Model()
+        m.setParam("OutputFlag", 0)
+        m._variables = {}
+        for name in self.binary_variables():
+            m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        self.add_constraints(m, self.constraints)
+        self.set_output_objective(m)
+        m._init_constraints = []
+        m.update()
+        return m
+
+    @staticmethod
+    def add_constraints(m, constraints):
+        """
+        Add the constraints (terms, sense, rhs) to a model built by build_model
+        """
+        senses = {">=": GRB.GREATER_EQUAL, "=": GRB.EQUAL, "<=": GRB.LESS_EQUAL}
+        for terms, sense, rhs in constraints:
+            m.addLConstr(LinExpr([coefficient for coefficient, _ in terms],
+                                 [m._variables[name] for _, name in terms]), senses[sense], rhs)
+
+    def set_output_objective(self, m):
+        """
+        Set the objective of a model built by build_model to the sum of the
+        output state after self.rounds rounds, whose variables are the ones
+        probed by find_balanced_bits
+        """
+        output_state = self.flatten(Craft.create_variables(self.rounds, "x"))
+        m.setObjective(LinExpr([1]*64, [m._variables[name] for name in output_state]), GRB.MINIMIZE)
+
+    def extend_model(self, m):
+        """
+        Extend a model of self.rounds rounds built by build_model to self.rounds + 1
+        rounds, and increment self.rounds. Only the constraints of the new round
+        are added, the initial constraints are kept, and the objective is moved
+        to the output state of the new round.
+        """
+        r = self.rounds
+        self.constraints = []
+        y = self.create_variables(r, "y")
+        self.constraints_by_mixing_layer(self.create_variables(r, "x"), y, r)
+        self.constraints_by_sbox(self.PermuteNibbles(y), self.create_variables(r + 1, "x"))
+        round_constraints = self.constraints
+        self.rounds += 1
+        # The constraints of constraint() are generated again for the new number of rounds
+        self.constraints = []
+        for name in self.binary_variables():
+            if name not in m._variables:
+                m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        self.add_constraints(m, round_constraints)
+        self.set_output_objective(m)
+        m.update()
+        return m
+
+    def set_init_constraints(self, m):
+        """
+        Replace the initial constraints of a model built by build_model by the
+        ones of the current constant bits (see set_constant_bits). The rest of
+        the model is shared by all the sets of constant bits.
+        """
+        m.remove(m._init_constraints)
+        m._init_constraints = [m.addLConstr(m._variables[terms[0][1]], GRB.EQUAL, rhs)
+                               for terms, _, rhs in self.init_constraints()]
+        m.update()
+
     def write_objective(self, obj):
         """
         Write the objective value into filename_result.
@@ -288,28 +373,77 @@ class Craft:
             fileobj.write("\n")
         fileobj.close()
 
-    def solve_model(self):
+    def balanced_bits_one_by_one(self, m, obj, candidates=None):
         """
-        Solve the MILP model to search the integral distinguisher of CRAFT.
+        Probe the output unit vectors of the candidate bits (all bits if None)
+        with one solve each, and return (balanced bits, number of solves).
         """
-        time_start = time.time()
+        if candidates is None:
+            candidates = range(self.block_size)
         balanced_bits = ["?" for i in range(64)]
-        balanced_flag = False
-        m = read(self.model_file_name)
-        if (self.brute_force_flag == '1'):
-            m.setParam("OutputFlag", 0)
-        obj = m.getObjective()
-        for i in range(0, self.block_size):            
+        for i in candidates:
             mask = [0 for j in range(64)]
             mask[i] = 1
             temporary_constraints = m.addConstrs(
                 (obj.getVar(j) == mask[j] for j in range(64)), name='temp_constraints')            
             m.optimize()
             if m.Status == 3:
-                balanced_flag = True
                 balanced_bits[i] = "b"
             m.remove(temporary_constraints)
             m.update()
+        return balanced_bits, len(candidates)
+
+    def balanced_bits_iteratively(self, m, obj, candidates=None):
+        """
+        Find the balanced bits with (number of unknown bits + 1) solves instead
+        of 64, and return (balanced bits, number of solves). Each solve asks
+        whether any of the remaining output unit vectors is reachable. The bit
+        of a reachable unit vector is unknown, and it is excluded from the next
+        solves. Once the model is infeasible, the remaining bits are balanced.
+        Only the candidate bits (all bits if None) can be balanced, the other
+        ones are excluded from the start.
+        """
+        if candidates is None:
+            candidates = range(self.block_size)
+        balanced_bits = ["b" if i in candidates else "?" for i in range(64)]
+        output = [obj.getVar(j) for j in range(64)]
+        temporary_constraints = [m.addConstr(quicksum(output) == 1, name='temp_unit_vector')]
+        temporary_constraints += [m.addConstr(output[i] == 0, name='temp_unknown_bit')
+                                  for i in range(64) if i not in candidates]
+        number_of_solves = 0
+        while True:
+            m.optimize()
+            number_of_solves += 1
+            if m.Status == 3:
+                break
+            if m.SolCount == 0:
+                # Neither a solution nor a proof: the remaining bits are unknown
+                balanced_bits = ["?" for i in range(64)]
+                break
+            i = [j for j in range(64) if output[j].getAttr("x") > 0.5][0]
+            balanced_bits[i] = "?"
+            temporary_constraints.append(m.addConstr(output[i] == 0, name='temp_unknown_bit'))
+        m.remove(temporary_constraints)
+        m.update()
+        return balanced_bits, number_of_solves
+
+    def find_balanced_bits(self, m, iterative=True, candidates=None):
+        """
+        Return (balanced bits, number of solves) of a model with initial
+        constraints, by balanced_bits_iteratively if iterative is True,
+        otherwise by balanced_bits_one_by_one. Only the candidate bits (all
+        bits if None) are probed, the other ones are unknown.
+        """
+        obj = m.getObjective()
+        if iterative:
+            return self.balanced_bits_iteratively(m, obj, candidates)
+        return self.balanced_bits_one_by_one(m, obj, candidates)
+
+    def write_result(self, balanced_bits, number_of_solves, elapsed_time):
+        """
+        Write the balanced bits of the current constant bits into result_file_name.
+        """
+        balanced_flag = ("b" in balanced_bits)
         fileobj = open(self.result_file_name, "a")
         if balanced_flag:
             fileobj.write("Indices of constant bits : %s\n" %
@@ -329,8 +463,27 @@ class Craft:
                         for i in range(16)]
         fileobj.write("output state : %s" % " ".join(output_state))
         print(" ".join(output_state))
-        time_end = time.time()
-        elapsed_time = time_end - time_start
+        fileobj.write("\nNumber of solves = %d" % number_of_solves)
+        print("Number of solves = %d" % number_of_solves)
         fileobj.write("\nTime used = %.2f\n\n" % elapsed_time)
         print("Time used = %.2f\n" % elapsed_time)
         fileobj.close()
+
+    def solve_model(self, iterative=True, m=None):
+        """
+        Solve the MILP model to search the integral distinguisher of CRAFT.
+        The model is read from model_file_name, unless a model built by
+        build_model is given, whose initial constraints are then replaced by
+        the ones of the current constant bits.
+        """
+        time_start = time.time()
+        if m is None:
+            m = read(self.model_file_name)
+            if (self.brute_force_flag == '1'):
+                m.setParam("OutputFlag", 0)
+        else:
+            self.set_init_constraints(m)
+        balanced_bits, number_of_solves = self.find_balanced_bits(m, iterative)
+        time_end = time.time()
+        elapsed_time = time_end - time_start
+        self.write_result(balanced_bits, number_of_solves, elapsed_time)
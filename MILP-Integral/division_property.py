@@ -0,0 +1,241 @@
+'''
+Applying the MILP-based method to find integral distinguishers based on division property for CRAFT
+Copyright (C) May 30, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+import numpy as np
+from craft import Craft
+
+"""
+Propagation of the bit-based division property of CRAFT without a MILP solver:
+
+A division vector is stored as a 64-bit integer, where the variable x_i_j_k
+of the MILP model (see craft.py) is the bit 63 - (4*j + k), and a division set
+is a sorted NumPy array of such integers. The round function is applied in the
+same order as in the MILP model: the mixing layer, PermuteNibbles and the
+S-box layer. The mixing layer and the S-box layer act on 16 groups of 4 bits
+each (the bit k of the 4 nibbles of a column, or the 4 bits of a nibble), and
+the division trails of a group are given by a table over the 16 values of its
+4 bits, derived from the same rules as the MILP model: the copy/xor rules of
+Craft.constraints_by_mixing_layer and the inequalities Craft.sb. The groups
+are expanded one at a time, and the redundant vectors (the vectors larger
+than another vector of the set) are removed after each group.
+
+After the last round, an output bit is balanced iff its unit vector is not in
+the division set. The size of the division sets grows quickly with the number
+of rounds and of active bits, hence max_size bounds it. With the default of
+2^18 vectors, the sets stay below max_size only for 1 round, 2 rounds with at
+most 4 constant bits, and 3 rounds with at most 1 constant bit (at most about
+a second), and every other case exceeds it after 2 to 8 seconds, e.g., 4
+rounds with one constant bit, or 3 rounds with 2 constant bits. These limits
+are kept in MAX_CONSTANT_BITS, and is_tractable tells the caller to use the
+MILP model directly for the other cases, instead of overflowing first.
+"""
+
+# Largest number of constant bits whose division sets stay below 2^18 vectors,
+# for each number of rounds (see is_tractable)
+MAX_CONSTANT_BITS = {1: 64, 2: 4, 3: 1}
+
+
+def bits_of(a):
+    return [(a >> (3 - u)) & 1 for u in range(4)]
+
+
+def minimal_vectors(vectors):
+    """
+    Return the vectors (4-bit integers) which are not larger than another one
+    """
+    return sorted(b for b in vectors if not any(c != b and (c & ~b) == 0 for c in vectors))
+
+
+def sbox_division_table():
+    """
+    Return the division trails of the S-box as a dict a -> minimal b, i.e.,
+    the pairs of 4-bit vectors which satisfy all the inequalities of Craft.sb
+    """
+    table = {}
+    for a in range(16):
+        table[a] = minimal_vectors([b for b in range(16) if all(
+            sum(coff[u] * bits_of(a)[u] for u in range(4)) +
+            sum(coff[4 + v] * bits_of(b)[v] for v in range(4)) >= -coff[Craft.NUMBER - 1]
+            for coff in Craft.sb)])
+    return table
+
+
+def mixing_division_table():
+    """
+    Return the division trails of the mixing layer on one bit of the 4 nibbles
+    of a column as a dict a -> minimal b, where the rows 0, 1, 2, 3 are the
+    bits 3, 2, 1, 0 of a and b (see Craft.constraints_by_mixing_layer):
+    row 2 is copied to (t0, row 2), row 3 to (t1, t2, row 3), and the output
+    rows 0 and 1 are row 0 + t0 + t2 and row 1 + t1
+    """
+    table = {}
+    for a in range(16):
+        a0, a1, a2, a3 = bits_of(a)
+        outputs = set()
+        for t0 in range(a2 + 1):
+            for t1 in range(a3 + 1):
+                for t2 in range(a3 - t1 + 1):
+                    b = [a0 + t0 + t2, a1 + t1, a2 - t0, a3 - t1 - t2]
+                    if max(b) <= 1:
+                        outputs.add((b[0] << 3) | (b[1] << 2) | (b[2] << 1) | b[3])
+        table[a] = minimal_vectors(list(outputs))
+    return table
+
+
+class DivisionProperty:
+    def __init__(self, rounds, max_size=1 << 18):
+        self.rounds = rounds
+        self.max_size = max_size
+        self.p_permute_nibbles = [
+            0xf, 0xc, 0xd, 0xe, 0xa, 0x9, 0x8, 0xb, 0x6, 0x5, 0x4, 0x7, 0x1, 0x2, 0x3, 0x0]
+        # Groups of the mixing layer (bit k of the nibbles j, j + 4, j + 8, j + 12)
+        # and of the S-box layer (the 4 bits of nibble j), as lists of 4 positions 4*nibble + bit
+        self.mixing_groups = [self.group([4 * (j + 4 * row) + k for row in range(4)])
+                              for j in range(4) for k in range(4)]
+        self.sbox_groups = [self.group([4 * j + k for k in range(4)]) for j in range(16)]
+        self.mixing_table = self.table(mixing_division_table())
+        self.sbox_table = self.table(sbox_division_table())
+
+    def is_tractable(self, constant_bits):
+        """
+        Return True if the division sets of constant_bits are expected to stay
+        below max_size (see MAX_CONSTANT_BITS), i.e., if they are worth propagating
+        """
+        return len(constant_bits) <= MAX_CONSTANT_BITS.get(self.rounds, -1)
+
+    @staticmethod
+    def bit(position):
+        return np.uint64(1 << (63 - position))
+
+    def group(self, positions):
+        """
+        Return (shifts, deposit, mask) of a group of 4 positions, where deposit[b]
+        places the 4-bit value b at these positions
+        """
+        shifts = [np.uint64(63 - position) for position in positions]
+        deposit = np.array([sum(int(self.bit(positions[u])) for u in range(4) if bits_of(b)[u])
+                            for b in range(16)], dtype=np.uint64)
+        mask = np.uint64(sum(int(self.bit(position)) for position in positions))
+        return shifts, deposit, mask
+
+    @staticmethod
+    def table(division_table):
+        """
+        Convert a dict a -> list of b into (outputs, counts), where outputs[a, o]
+        is the o-th output of a and counts[a] is the number of outputs of a
+        """
+        width = max(len(outputs) for outputs in division_table.values())
+        outputs = np.zeros((16, width), dtype=np.int64)
+        counts = np.zeros(16, dtype=np.int64)
+        for a, b in division_table.items():
+            outputs[a, :len(b)] = b
+            counts[a] = len(b)
+        return outputs, counts
+
+    def has_proper_subset(self, candidates, vectors, position=0, budget=1 << 18):
+        """
+        Return a boolean array over the candidates, True if some vector is a
+        proper subset of the candidate. The candidates and the vectors are split
+        on one bit at a time: a candidate without this bit can only contain the
+        vectors without it. Once |candidates| x |vectors| is below budget, they
+        are compared pairwise.
+        """
+        result = np.zeros(len(candidates), dtype=bool)
+        if (len(candidates) == 0 or len(vectors) == 0):
+            return result
+        if (len(candidates) * len(vectors) <= budget or position == 64):
+            step = max(1, budget // len(vectors))
+            for k in range(0, len(candidates), step):
+                chunk = candidates[k:k + step, None]
+                result[k:k + step] = (((vectors[None, :] & ~chunk) == 0) & (vectors[None, :] != chunk)).any(axis=1)
+            return result
+        bit = self.bit(position)
+        with_bit = (candidates & bit) != 0
+        result[~with_bit] = self.has_proper_subset(candidates[~with_bit], vectors[(vectors & bit) == 0],
+                                                   position + 1, budget)
+        result[with_bit] = self.has_proper_subset(candidates[with_bit], vectors, position + 1, budget)
+        return result
+
+    def reduce(self, vectors):
+        """
+        Remove the duplicated and the redundant vectors of a division set
+        """
+        vectors = np.unique(vectors)
+        return vectors[~self.has_proper_subset(vectors, vectors)]
+
+    def layer(self, vectors, groups, table):
+        """
+        Apply the division trails of table to every group of a division set
+        """
+        outputs, counts = table
+        for shifts, deposit, mask in groups:
+            a = np.zeros(len(vectors), dtype=np.int64)
+            for u in range(4):
+                a |= ((vectors >> shifts[u]) & np.uint64(1)).astype(np.int64) << (3 - u)
+            cleared = vectors & ~mask
+            parts = []
+            for o in range(outputs.shape[1]):
+                rows = counts[a] > o
+                parts.append(cleared[rows] | deposit[outputs[a[rows], o]])
+            vectors = self.reduce(np.concatenate(parts))
+            if (len(vectors) > self.max_size):
+                raise ValueError("the division set exceeds %d vectors" % self.max_size)
+        return vectors
+
+    def permute_nibbles(self, vectors):
+        """
+        Nibble i of the output is nibble p_permute_nibbles[i] of the input (see Craft.PermuteNibbles)
+        """
+        permuted = np.zeros_like(vectors)
+        for i in range(16):
+            permuted |= ((vectors >> np.uint64(60 - 4 * self.p_permute_nibbles[i])) & np.uint64(0xf)) \
+                << np.uint64(60 - 4 * i)
+        return permuted
+
+    def initial_division_set(self, constant_bits):
+        """
+        The initial division property: the vector of the active (non-constant) bits
+        """
+        return np.array([sum(int(self.bit(i)) for i in range(64) if i not in constant_bits)],
+                        dtype=np.uint64)
+
+    def propagate(self, constant_bits, rounds=None):
+        """
+        Return the division sets after 1, ..., rounds (self.rounds if None) rounds
+        """
+        if rounds is None:
+            rounds = self.rounds
+        vectors = self.initial_division_set(constant_bits)
+        division_sets = []
+        for r in range(rounds):
+            vectors = self.layer(vectors, self.mixing_groups, self.mixing_table)
+            vectors = self.layer(self.permute_nibbles(vectors), self.sbox_groups, self.sbox_table)
+            division_sets.append(vectors)
+        return division_sets
+
+    def balanced_bits_of(self, vectors):
+        """
+        Return the balanced bits ("b" or "?", as in Craft.find_balanced_bits) of a division set
+        """
+        return ["?" if np.isin(self.bit(i), vectors) else "b" for i in range(64)]
+
+    def find_balanced_bits(self, constant_bits):
+        """
+        Return the balanced bits after self.rounds rounds
+        """
+        return self.balanced_bits_of(self.propagate(constant_bits)[-1])
@@ -18,18 +18,59 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 9 Khordad, 1398
 '''
 
+import time
 from craft import Craft
+from division_property import DivisionProperty
+from scheduler import sweep_constant_bits, lattice_search, sweep_rounds
+
+
+def probe_with_division_property(craft, division_property, constant_bits, iterative=True):
+    """
+    Write the balanced bits of constant_bits found by division_property, or by
+    the MILP model if the division sets are too large (see
+    DivisionProperty.is_tractable) or grow beyond division_property.max_size
+    """
+    craft.set_constant_bits(constant_bits)
+    if not division_property.is_tractable(constant_bits):
+        craft.make_model()
+        craft.solve_model(iterative)
+        return
+    time_start = time.time()
+    try:
+        balanced_bits = division_property.find_balanced_bits(constant_bits)
+    except ValueError as error:
+        print("Division property of %s: %s, falling back to the MILP model" %
+              (",".join(map(str, constant_bits)), error))
+        craft.make_model()
+        craft.solve_model(iterative)
+        return
+    craft.write_result(balanced_bits, 0, time.time() - time_start)
+
 
 if __name__ == "__main__":
+    # Find the balanced bits with (number of unknown bits + 1) solves instead of
+    # one solve per output bit (see Craft.balanced_bits_iteratively)
+    iterative = True
+    # Number of worker processes of the brute-force sweep (None: one per core), and Gurobi
+    # threads per worker. Each worker builds the model once (see scheduler.py).
+    number_of_workers = None
+    threads = 1
+    # Propagate the division property with NumPy instead of Gurobi (see division_property.py).
+    # The division sets grow quickly, so this is only tractable up to 3 rounds, and the MILP
+    # model is used for the other cases.
+    use_division_property = False
+    # In the round sweep, only probe the bits balanced after the previous number of rounds.
+    # This is faster, but can miss balanced bits (see the note in scheduler.py)
+    prune = False
     rounds = int(input("Input the number of rounds: "))
     while not (rounds > 0):
         print("Input a round number greater than 0.")
         rounds = int(input("Input round number again: "))    
     craft = Craft(rounds)
-    brute_force_flag = input("Brute force : 1    Probing an especial case : 0 ?\n")
-    while (brute_force_flag not in ['0', '1']):
-        print("Enter 0 or 1!")
-        brute_force_flag = input("Brute force : 1    Probing an especial case : 0 ?\n")
+    brute_force_flag = input("Round sweep : 3    Lattice search : 2    Brute force : 1    Probing an especial case : 0 ?\n")
+    while (brute_force_flag not in ['0', '1', '2', '3']):
+        print("Enter 0, 1, 2 or 3!")
+        brute_force_flag = input("Round sweep : 3    Lattice search : 2    Brute force : 1    Probing an especial case : 0 ?\n")
     craft.set_brute_force_flag(brute_force_flag)
     if brute_force_flag == '0':
         temp = input("Enter the list of constant bits separated by spaces:\n")
@@ -38,13 +79,33 @@ if __name__ == "__main__":
         for element in temp:
             constant_bits.append(int(element))
         craft.set_constant_bits(constant_bits)
-        craft.make_model()
-        craft.solve_model()
-    else:
-        number_of_total_states = 64
-        for i in range(0, 64):
-            print("%d / %d" % (i, number_of_total_states))
-            constant_bits = [i]
-            craft.set_constant_bits(constant_bits)
+        if use_division_property:
+            probe_with_division_property(craft, DivisionProperty(rounds), constant_bits, iterative)
+        else:
             craft.make_model()
-            craft.solve_model()
+            craft.solve_model(iterative)
+    elif brute_force_flag == '2':
+        # Sets of constant bits made of single bits (unit size 1) or nibbles (unit size 4)
+        unit_size = int(input("Input the unit size of the constant bits (1 or 4): "))
+        while (unit_size not in [1, 4]):
+            unit_size = int(input("Enter 1 or 4!\n"))
+        max_size = int(input("Input the maximum number of units in a set: "))
+        units = [list(range(i, i + unit_size)) for i in range(0, 64, unit_size)]
+        lattice_search(craft, units, max_size, number_of_workers, threads, iterative)
+    elif brute_force_flag == '3':
+        last_rounds = int(input("Input the last number of rounds: "))
+        while not (last_rounds >= rounds):
+            last_rounds = int(input("Input a number of rounds not less than %d: " % rounds))
+        temp = input("Enter the list of constant bits separated by spaces (empty: every single bit):\n")
+        if temp.split():
+            sets_of_constant_bits = [[int(element) for element in temp.split()]]
+        else:
+            sets_of_constant_bits = [[i] for i in range(64)]
+        sweep_rounds(craft, last_rounds, sets_of_constant_bits, number_of_workers, threads, iterative, prune)
+    elif use_division_property:
+        division_property = DivisionProperty(rounds)
+        for i in range(0, 64):
+            print("%d / %d" % (i, 64))
+            probe_with_division_property(craft, division_property, [i], iterative)
+    else:
+        sweep_constant_bits(craft, [[i] for i in range(64)], number_of_workers, threads, iterative)
@@ -0,0 +1,259 @@
+'''
+Applying the MILP-based method to find integral distinguishers based on division property for CRAFT
+Copyright (C) May 30, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from multiprocessing import Pool, current_process
+from itertools import combinations
+import copy
+import time
+from gurobipy import *
+
+"""
+Parallel sweeps over sets of constant bits:
+
+The sets of constant bits are put into the task queue of a pool of workers.
+Each worker builds the model in memory once, when it is started (see
+Craft.build_model), and for every set of constant bits it only replaces the
+64 constraints of the initial division property (see Craft.set_init_constraints).
+Hence no LP file is written or read during a sweep, and its time is the solve time.
+
+Lattice search over sets of constant bits (see lattice_search):
+
+Balancedness is monotone in the set of constant bits: if an output bit is
+balanced with the constant bits C, it is balanced for every subset of C, since
+the initial division property of a subset of C is larger. The sets made of
+k units (single bits, nibbles, ...) are probed level by level. A set is only
+probed if all of its subsets of k - 1 units have a balanced bit, and only the
+bits balanced for all of these subsets are candidates, hence most sets are
+pruned or solved with a few candidates.
+
+Sweep over the number of rounds (see sweep_rounds):
+
+For each set of constant bits, the model is built once for the first number
+of rounds and extended by one round at a time (see Craft.extend_model), and
+all the bits are probed for every number of rounds. With prune (off by
+default), only the bits balanced after r rounds are candidates after r + 1
+rounds. This is a heuristic: a bit which is unbalanced after r rounds is not
+always unbalanced after r + 1 rounds, e.g., with the single active bit 16, the
+bits 40-43 are unknown after 1 round and balanced after 2 rounds. Hence with
+pruning the bits which are reported after r rounds are the ones balanced after
+every number of rounds from the first one to r, which is the exact result only
+when the balanced sets are nested (e.g., for a single constant bit from 9 to 11
+rounds).
+"""
+
+
+def init_worker(craft_instance, threads, iterative_flag):
+    """
+    Build the model of craft_instance once in each worker process
+    """
+    global craft, model, iterative
+    craft = craft_instance
+    iterative = iterative_flag
+    model = craft.build_model()
+    model.setParam(GRB.Param.Threads, threads)
+
+
+def probe_constant_bits(constant_bits):
+    """
+    Find the balanced bits of a set of constant bits in this worker, and return
+    (constant bits, balanced bits, number of solves, elapsed time, worker name)
+    """
+    time_start = time.time()
+    craft.set_constant_bits(constant_bits)
+    craft.set_init_constraints(model)
+    balanced_bits, number_of_solves = craft.find_balanced_bits(model, iterative)
+    return constant_bits, balanced_bits, number_of_solves, time.time() - time_start, current_process().name
+
+
+def probe_candidates(task):
+    """
+    Probe the candidate bits of a task (constant bits, candidates) in this
+    worker, and return (task, balanced bits, number of solves, elapsed time)
+    """
+    time_start = time.time()
+    constant_bits, candidates = task
+    craft.set_constant_bits(constant_bits)
+    craft.set_init_constraints(model)
+    balanced_bits, number_of_solves = craft.find_balanced_bits(model, iterative, candidates)
+    return task, balanced_bits, number_of_solves, time.time() - time_start
+
+
+def sweep_constant_bits(craft, sets_of_constant_bits, number_of_workers=None, threads=1, iterative=True):
+    """
+    Find the balanced bits of every set of constant bits with a pool of
+    number_of_workers processes (one per core if None), each one running
+    threads Gurobi threads. The results are written into craft.result_file_name
+    in the order of sets_of_constant_bits, and returned as a list of
+    (constant bits, balanced bits).
+    """
+    time_start = time.time()
+    if craft.constraints == []:
+        craft.constraint()
+    results = []
+    with Pool(number_of_workers, initializer=init_worker, initargs=(craft, threads, iterative)) as pool:
+        for constant_bits, balanced_bits, number_of_solves, elapsed_time, worker in \
+                pool.imap(probe_constant_bits, sets_of_constant_bits):
+            print("%d / %d \t %s" % (len(results) + 1, len(sets_of_constant_bits), worker))
+            craft.set_constant_bits(constant_bits)
+            craft.write_result(balanced_bits, number_of_solves, elapsed_time)
+            results.append((constant_bits, balanced_bits))
+    print("Time used = %.2f" % (time.time() - time_start))
+    return results
+
+
+def lattice_search(craft, units, max_size=None, number_of_workers=None, threads=1, iterative=True):
+    """
+    Search the sets of constant bits made of at most max_size (all if None)
+    units, where units is a list of lists of bits, e.g., [[i] for i in range(64)]
+    for single bits or [[4*i, 4*i + 1, 4*i + 2, 4*i + 3] for i in range(16)]
+    for nibbles. The probed sets are written into craft.result_file_name, and
+    the maximal sets which still give a balanced bit are returned as a list of
+    (constant bits, balanced bits), where the sets of max_size units are
+    maximal among the sets of at most max_size units.
+    """
+    time_start = time.time()
+    if craft.constraints == []:
+        craft.constraint()
+
+    def constant_bits_of(key):
+        return sorted(set(bit for unit in key for bit in units[unit]))
+
+    # Balanced bits (as a set of indices) of the sets of the previous level, keyed
+    # by the sorted tuple of their units
+    balanced = {(): set(range(64))}
+    maximal = []
+    level = [(unit,) for unit in range(len(units))]
+    size = 1
+    total_solves = 0
+    with Pool(number_of_workers, initializer=init_worker, initargs=(craft, threads, iterative)) as pool:
+        while level and (max_size is None or size <= max_size):
+            tasks = []
+            keys = []
+            for key in level:
+                candidates = set.intersection(*[balanced[subset] for subset in combinations(key, size - 1)])
+                if candidates:
+                    tasks.append((constant_bits_of(key), sorted(candidates)))
+                    keys.append(key)
+            level_balanced = {}
+            number_of_solves = 0
+            for key, (task, balanced_bits, solves, elapsed_time) in zip(keys, pool.imap(probe_candidates, tasks)):
+                number_of_solves += solves
+                bits = set(i for i in range(64) if balanced_bits[i] == "b")
+                if bits:
+                    level_balanced[key] = bits
+                    craft.set_constant_bits(task[0])
+                    craft.write_result(balanced_bits, solves, elapsed_time)
+            total_solves += number_of_solves
+            # A set of the previous level is maximal if none of its supersets is balanced
+            parents = set(subset for key in level_balanced for subset in combinations(key, size - 1))
+            maximal += [(constant_bits_of(key), sorted(bits)) for key, bits in balanced.items()
+                        if key != () and key not in parents]
+            print("Units : %d \t sets : %d \t probed : %d \t balanced : %d \t solves : %d" %
+                  (size, len(level), len(tasks), len(level_balanced), number_of_solves))
+            balanced = level_balanced
+            # Sets of size + 1 units whose subsets of size units are all balanced
+            level = []
+            for key in sorted(balanced):
+                for unit in range(key[-1] + 1, len(units)):
+                    superset = key + (unit,)
+                    if all(subset in balanced for subset in combinations(superset, size)):
+                        level.append(superset)
+            size += 1
+    maximal += [(constant_bits_of(key), sorted(bits)) for key, bits in balanced.items() if key != ()]
+    fileobj = open(craft.result_file_name, "a")
+    fileobj.write("Maximal sets of constant bits with a balanced bit :\n")
+    for constant_bits, bits in maximal:
+        fileobj.write("%s : %s\n" % (",".join(map(str, constant_bits)), ",".join(map(str, bits))))
+    fileobj.close()
+    print("Maximal sets of constant bits with a balanced bit : %d" % len(maximal))
+    print("Number of solves = %d" % total_solves)
+    print("Time used = %.2f" % (time.time() - time_start))
+    return maximal
+
+
+def probe_rounds(task):
+    """
+    Find the balanced bits of a set of constant bits for craft.rounds, ...,
+    last_rounds rounds, where task is (craft, constant bits, last_rounds,
+    threads, iterative, prune), and return the list of (rounds, balanced bits,
+    number of solves, elapsed time). The sweep stops as soon as no bit is
+    balanced, if prune is True.
+    """
+    craft, constant_bits, last_rounds, threads, iterative, prune = task
+    craft = copy.copy(craft)
+    craft.constraints = []
+    craft.set_constant_bits(constant_bits)
+    model = craft.build_model()
+    model.setParam(GRB.Param.Threads, threads)
+    craft.set_init_constraints(model)
+    results = []
+    candidates = None
+    while True:
+        time_start = time.time()
+        balanced_bits, number_of_solves = craft.find_balanced_bits(model, iterative, candidates)
+        results.append((craft.rounds, balanced_bits, number_of_solves, time.time() - time_start))
+        if prune:
+            candidates = [i for i in range(64) if balanced_bits[i] == "b"]
+            if candidates == []:
+                break
+        if craft.rounds == last_rounds:
+            break
+        craft.extend_model(model)
+    return results
+
+
+def sweep_rounds(craft, last_rounds, sets_of_constant_bits, number_of_workers=None, threads=1,
+                 iterative=True, prune=False):
+    """
+    Find the balanced bits of every set of constant bits for craft.rounds, ...,
+    last_rounds rounds with a pool of number_of_workers processes (one per core
+    if None), one set of constant bits per task. If prune is True, only the bits
+    balanced after r rounds are probed after r + 1 rounds (see the note above).
+    The results are written into craft.result_file_name, and the largest number
+    of rounds with a balanced bit of every set is returned as a list of
+    (constant bits, rounds), where rounds is craft.rounds - 1 if no bit is balanced.
+    """
+    time_start = time.time()
+    first_rounds = craft.rounds
+    tasks = [(craft, constant_bits, last_rounds, threads, iterative, prune)
+             for constant_bits in sets_of_constant_bits]
+    results = []
+    total_solves = 0
+    with Pool(number_of_workers) as pool:
+        for constant_bits, rounds_results in zip(sets_of_constant_bits, pool.imap(probe_rounds, tasks)):
+            print("%d / %d" % (len(results) + 1, len(sets_of_constant_bits)))
+            craft.set_constant_bits(constant_bits)
+            integral_rounds = first_rounds - 1
+            for rounds, balanced_bits, number_of_solves, elapsed_time in rounds_results:
+                fileobj = open(craft.result_file_name, "a")
+                fileobj.write("Rounds : %d\n" % rounds)
+                fileobj.close()
+                print("Rounds : %d" % rounds)
+                craft.write_result(balanced_bits, number_of_solves, elapsed_time)
+                total_solves += number_of_solves
+                if "b" in balanced_bits:
+                    integral_rounds = rounds
+            results.append((constant_bits, integral_rounds))
+    fileobj = open(craft.result_file_name, "a")
+    fileobj.write("Largest number of rounds with a balanced bit :\n")
+    for constant_bits, integral_rounds in results:
+        fileobj.write("%s : %d\n" % (",".join(map(str, constant_bits)), integral_rounds))
+    fileobj.close()
+    print("Number of solves = %d" % total_solves)
+    print("Time used = %.2f" % (time.time() - time_start))
+    return results
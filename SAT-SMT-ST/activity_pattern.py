@@ -0,0 +1,231 @@
+'''
+Applying the SAT-SMT-based method to find differential distinguishers of CRAFT
+Copyright (C) June 15, 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+from cryptosmt import startsearch, checkenviroment
+
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+import json
+import os
+
+"""
+From an activity pattern to a bitwise differential trail:
+
+The activity patterns found by MILP-Diff-Activity-Pattern (bounds_*.json of
+the sweep, or patterns_*.json of the enumeration) are turned into the
+parameters of CryptoSMT, where every passive nibble of the states x0, ...,
+x<rounds> (and of the tweak difference t0 in the related-tweak model) is fixed
+to zero, exactly like the fixedVariables of examples/craft/craft17rounds.yaml.
+The pattern of the starting round s is searched with the cipher craft in the
+single-tweak model, and craftrtk (s = 0), craftrtk1, craftrtk2 or craftrtk3 in
+the related-tweak model. The round r of the MILP model is the state x<r - s>
+of CryptoSMT, and the nibble i (the character 15 - i of a pattern) is the
+slice [4i + 3:4i].
+
+The last round of CRAFT (round 31) is only MixColumn and AddTweakey, so a
+pattern which reaches it ends with the state x_31 (see Craft.last_state of
+MILP-Diff-Activity-Pattern). Every round of the CryptoSMT models ends with an
+S-box layer, hence such a pattern is searched without the round 31, over the
+rounds which have S-boxes, which does not change the weight of the trail. A
+pattern which ends after x_31 (written before the round 31 was modelled
+without S-boxes) has an S-box layer which CRAFT does not have, and it is
+rejected.
+
+Every active S-box has a weight of at least 2, so the search for a trail with
+minimal weight starts at twice the number of active S-boxes (sweight) instead
+of 0. The patterns are searched one after another, since CryptoSMT writes the
+STP file of a cipher into the same file of tmp/.
+"""
+
+
+def cipher_name(related_tweak, starting_round):
+    """
+    Return the name of the CryptoSMT model of CRAFT for a tweak model and a
+    starting round
+    """
+    if (related_tweak == 0):
+        return "craft"
+    if (starting_round == 0):
+        return "craftrtk"
+    return "craftrtk%d" % starting_round
+
+
+def passive_nibbles(name, state):
+    """
+    Return the list of (slice of the variable name, "0x0") of the passive
+    nibbles of state, a string of 16 activities from the nibble 15 to the
+    nibble 0
+    """
+    return [("%s[%d:%d]" % (name, 4*i + 3, 4*i), "0x0") for i in range(16) if state[15 - i] == "0"]
+
+
+def pattern_to_parameters(pattern, related_tweak=0, starting_round=0, tweak=None, active_sboxes=None):
+    """
+    Return the CryptoSMT parameters (see cryptosmt.loadparameters) to find a
+    differential trail of minimal weight which follows the activity pattern,
+    a list of the activities of the states x0, ..., x<rounds>, and the tweak
+    activity tweak in the related-tweak model. The round 31 of a pattern which
+    ends with x_31 is not searched, since it has no S-boxes (see the note above).
+    """
+    rounds = len(pattern) - 1
+    if (starting_round + rounds > 31):
+        raise ValueError("the pattern ends with x_%d, after the last round of CRAFT" % (starting_round + rounds))
+    if active_sboxes is None:
+        active_sboxes = sum(state.count("1") for state in pattern[1:])
+    fixed_variables = []
+    if (related_tweak == 1):
+        fixed_variables += [("k0", "0x0000000000000000"), ("k1", "0x0000000000000000")]
+        fixed_variables += passive_nibbles("t0", tweak)
+    for r in range(rounds + 1):
+        fixed_variables += passive_nibbles("x%d" % r, pattern[r])
+    return {"cipher": cipher_name(related_tweak, starting_round),
+            "rounds": rounds,
+            "mode": 0,
+            "wordsize": 64,
+            "blocksize": 64,
+            "sweight": 2*active_sboxes,
+            "endweight": 1000,
+            "iterative": False,
+            "boolector": False,
+            "dot": None,
+            "latex": None,
+            "nummessages": 1,
+            "timelimit": -1,
+            "fixedVariables": dict(fixed_variables),
+            "blockedCharacteristics": []}
+
+
+def milp_rounds(pattern, starting_round):
+    """
+    Return the number of rounds of the MILP model of a pattern of the starting
+    round starting_round, including the round 31, which has no S-boxes
+    """
+    rounds = len(pattern) - 1
+    if (starting_round + rounds == 31):
+        rounds += 1
+    return rounds
+
+
+def write_yaml(parameters, filename):
+    """
+    Write the parameters of a pattern into a yaml input file of cryptosmt.py
+    """
+    fileobj = open(filename, "w")
+    fileobj.write("# input file for CRAFT to find a differential trail satisfying an obtained activity pattern\n")
+    fileobj.write("# covering %d rounds\n" % parameters["rounds"])
+    fileobj.write("---\n")
+    for key in ["cipher", "sweight", "rounds", "wordsize", "mode"]:
+        fileobj.write("%s: %s\n" % (key, parameters[key]))
+    fileobj.write("fixedVariables:\n")
+    for variable, value in parameters["fixedVariables"].items():
+        fileobj.write("- %s : \"%s\"\n" % (variable, value))
+    fileobj.close()
+
+
+def load_patterns(filename):
+    """
+    Return the list of (related_tweak, starting_round, active_sboxes, pattern,
+    tweak) of a JSON file of MILP-Diff-Activity-Pattern, either the records of
+    the sweep or the records of the enumeration
+    """
+    fileobj = open(filename, "r")
+    records = json.load(fileobj)
+    fileobj.close()
+    patterns = []
+    for record in records:
+        if "patterns" in record:
+            patterns += [(record["related_tweak"], record["starting_round"], pattern["active_sboxes"],
+                          pattern["pattern"], pattern["tweak"]) for pattern in record["patterns"]]
+        elif record["pattern"] is not None:
+            patterns.append((record["related_tweak"], record["starting_round"], record["active_sboxes"],
+                             record["pattern"], record["tweak"]))
+    return patterns
+
+
+def main():
+    """
+    Parse the arguments, and search a differential trail for every selected
+    activity pattern of the input file
+    """
+    parser = ArgumentParser(description="This tool finds the best differential "
+                                        "trail of CRAFT which follows the activity "
+                                        "patterns found by MILP-Diff-Activity-Pattern.",
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument('--inputfile', nargs=1, required=True,
+                        help="bounds_*.json or patterns_*.json of MILP-Diff-Activity-Pattern")
+    parser.add_argument('--rounds', nargs='+', type=int,
+                        help="Only search the patterns of these numbers of rounds")
+    parser.add_argument('--relatedtweak', nargs=1, type=int, choices=[0, 1],
+                        help="Only search the patterns of this tweak model")
+    parser.add_argument('--startinground', nargs='+', type=int, choices=[0, 1, 2, 3],
+                        help="Only search the patterns of these starting rounds")
+    parser.add_argument('--timelimit', nargs=1, type=int,
+                        help="Set a timelimit for the search of each pattern in seconds.")
+    parser.add_argument('--boolector', action="store_true",
+                        help="Use boolector to find solutions")
+    parser.add_argument('--yamldir', nargs=1,
+                        help="Write the yaml input file of every pattern into this directory")
+    parser.add_argument('--nosearch', action="store_true",
+                        help="Only write the yaml input files")
+    parser.add_argument('--outputfile', nargs=1, default=["trail_weights.json"],
+                        help="The weights of the trails are written into this file.")
+    args = parser.parse_args()
+
+    patterns = load_patterns(args.inputfile[0])
+    if args.rounds:
+        patterns = [p for p in patterns if milp_rounds(p[3], p[1]) in args.rounds]
+    if args.relatedtweak:
+        patterns = [p for p in patterns if p[0] == args.relatedtweak[0]]
+    if args.startinground:
+        patterns = [p for p in patterns if p[1] in args.startinground]
+    if not args.nosearch:
+        checkenviroment()
+    results = []
+    for index, (related_tweak, starting_round, active_sboxes, pattern, tweak) in enumerate(patterns):
+        try:
+            parameters = pattern_to_parameters(pattern, related_tweak, starting_round, tweak, active_sboxes)
+        except ValueError as error:
+            print("Pattern %d / %d : skipped, %s" % (index + 1, len(patterns), error))
+            continue
+        if args.timelimit:
+            parameters["timelimit"] = args.timelimit[0]
+        parameters["boolector"] = args.boolector
+        if args.yamldir:
+            if not os.path.exists(args.yamldir[0]):
+                os.makedirs(args.yamldir[0])
+            write_yaml(parameters, os.path.join(args.yamldir[0], "%s_%d_rounds_%d.yaml" %
+                                                (parameters["cipher"], parameters["rounds"], index)))
+        if args.nosearch:
+            continue
+        print("Pattern %d / %d : %s, %d rounds, %d active S-boxes" %
+              (index + 1, len(patterns), parameters["cipher"], parameters["rounds"], active_sboxes))
+        weight = startsearch(parameters)
+        # If the search stopped before a trail was found, weight is None and every
+        # weight below lower_bound has been excluded
+        results.append({"related_tweak": related_tweak, "starting_round": starting_round,
+                        "rounds": milp_rounds(pattern, starting_round),
+                        "sbox_rounds": parameters["rounds"], "active_sboxes": active_sboxes,
+                        "pattern": pattern, "tweak": tweak, "weight": weight,
+                        "found": weight is not None, "lower_bound": parameters["sweight"]})
+        fileobj = open(args.outputfile[0], "w")
+        json.dump(results, fileobj, indent=1)
+        fileobj.close()
+
+
+if __name__ == '__main__':
+    main()
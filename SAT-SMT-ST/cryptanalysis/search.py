@@ -131,6 +131,9 @@ def findMinWeightCharacteristic(cipher, parameters):
     """
     Find a characteristic of minimal weight for the cipher
     parameters = [rounds, wordsize, sweight, isIterative, fixedVariables]
+    Returns the weight of the characteristic, or None if the time limit or
+    MAX_WEIGHT is reached before one is found. In both cases parameters["sweight"]
+    is the last weight which has not been excluded.
     """
 
     print(("Starting search for characteristic with minimal weight\n"
@@ -189,9 +192,9 @@ def findMinWeightCharacteristic(cipher, parameters):
                 with open(parameters["latex"], "w") as tex_file:
                     tex_file.write(characteristic.getTexString())
                 print("Wrote .tex to {}".format(parameters["latex"]))                
-            break
+            return parameters["sweight"]
         parameters["sweight"] += 1
-    return parameters["sweight"]
+    return None
 
 
 def findAllCharacteristics(cipher, parameters):
@@ -268,7 +271,7 @@ def searchCharacteristics(cipher, parameters):
     """
     while True:
         print("Number of rounds: {}".format(parameters["rounds"]))
-        parameters["sweight"] = findMinWeightCharacteristic(cipher, parameters)
+        findMinWeightCharacteristic(cipher, parameters)
         print("Rounds:")
         parameters["rounds"] = parameters["rounds"] + 1
     return
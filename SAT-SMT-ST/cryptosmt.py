@@ -17,7 +17,9 @@ import os
 
 def startsearch(tool_parameters):
     """
-    Starts the search tool for the given parameters
+    Starts the search tool for the given parameters, and returns the weight of
+    the trail (mode 0, None if no trail was found before the time limit) or the
+    probability of the differential (mode 4)
     """
 
     cipher_suite = {"craft" : craft.CraftCipher(),
@@ -43,8 +45,9 @@ def startsearch(tool_parameters):
         return
 
     # Handle program flow
+    result = None
     if tool_parameters["mode"] == 0:
-        search.findMinWeightCharacteristic(cipher, tool_parameters)
+        result = search.findMinWeightCharacteristic(cipher, tool_parameters)
     elif tool_parameters["mode"] == 1:
         search.searchCharacteristics(cipher, tool_parameters)
     elif tool_parameters["mode"] == 2:
@@ -52,9 +55,9 @@ def startsearch(tool_parameters):
     elif tool_parameters["mode"] == 3:
         search.findBestConstants(cipher, tool_parameters)
     elif tool_parameters["mode"] == 4:
-        search.computeProbabilityOfDifferentials(cipher, tool_parameters)
+        result = search.computeProbabilityOfDifferentials(cipher, tool_parameters)
 
-    return
+    return result
 
 def checkenviroment():
     """
@@ -16,34 +16,12 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from multiprocessing import Pool, current_process, Process
-import time
-from craft import Craft
-
-def go_search_for_zc(rounds, related_tweak,  slice_number):    
-    pid = current_process().name
-    print(f"\nProcess {pid} started, part {slice_number} out of {16}")
-    craft = Craft(rounds, related_tweak, slice_number)
-    if (related_tweak == 1):
-        craft.search_masks_with_hamming_weight_of_one_rtk()
-    else:
-        craft.search_masks_with_hamming_weight_of_one_stk()
-    print(f"Process {pid} finished, part {slice_number} out of {16}\n")
+import os
+import sys
+# The engine is shared by the four folders (see ../zerocorrelation), and this
+# folder only picks the offset 1 of the tweak schedule (RTK1)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from zerocorrelation.main import main
 
 if __name__ == "__main__":
-    rounds = 14
-    related_tweak = 1
-    start_time = time.time()
-    with Pool() as pool:
-        arguments = [(rounds, related_tweak, slice_number) for slice_number in range(16)]
-        results = pool.starmap(go_search_for_zc, arguments)
-    # processes = [Process(target = go_search_for_zc, args = (rounds, related_tweak, slice_number))\
-    #     for slice_number in range(16)]
-    # # Start processes
-    # for pr in processes:
-    #     pr.start()
-    # # Exit the completed processes
-    # for pr in processes:
-    #     pr.join()
-    elapsed_time = time.time() - start_time
-    print(f"\nProcesses completed after {elapsed_time} seconds")
+    main(tweak_offsets=[1])
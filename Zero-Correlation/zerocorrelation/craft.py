@@ -0,0 +1,1389 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+from itertools import groupby
+from gurobipy import *
+from zerocorrelation.journal import Journal, GUROBI, PREFILTER, IIS, REACHABILITY
+from zerocorrelation.telemetry import Telemetry
+from zerocorrelation.prefilter import Prefilter
+from zerocorrelation.planner import plan
+
+"""
+x_roundNumber_nibbleNumber_bitNumber
+x_roundNumber_nibbleNumber_0: msb
+x_roundNumber_nibbleNumber_3: lsb
+
+Input mask of (i + 1)-th round:
+x_i_0	x_i_1	x_i_2	x_i_3
+x_i_4	x_i_5	x_i_6	x_i_7
+x_i_8	x_i_9	x_i_10	x_i_11
+x_i_12	x_i_13	x_i_14	x_i_15
+
+Output mask of MC in (i + 1)-th round:
+x_i_0	x_i_1	x_i_2	x_i_3
+x_i_4	x_i_5	x_i_6	x_i_7
+y_i_0	y_i_1	y_i_2	y_i_3
+y_i_4	y_i_5	y_i_6	y_i_7
+
+Input mask of tewak : t_nibbleNumber_bitNumber
+
+t_0     t_1     t_2     t_3       
+t_4     t_5     t_6     t_7
+t_8     t_9     t_10    t_11
+t_12    t_13    t_14    t_15
+
+tweaks used in each round:
+
+tkt_i_0	tkt_i_1	tkt_i_2	tkt_i_3
+tkt_i_4	tkt_i_5	tkt_i_6	tkt_i_7
+tkt_i_0	tkt_i_1	tkt_i_2	tkt_i_3
+tkt_i_4	tkt_i_5	tkt_i_6	tkt_i_7
+
+tkn_i_0	tkn_i_1	tkn_i_2	tkn_i_3
+tkn_i_4	tkn_i_5	tkn_i_6	tkn_i_7
+tkn_i_0	tkn_i_1	tkn_i_2	tkn_i_3
+tkn_i_4	tkn_i_5	tkn_i_6	tkn_i_7
+
+for example for 2 rounds of CRAFT we have the following branch points:
+
+t ====|-> tkn_0 ====|-> tkn_1 ====|-> tk_n2====|->...
+      |             |             |            |
+      |-> tkt_0     |-> tkt_1     |-> tkt_2    |->...
+
+
+Effective operation in (i + 1)'th round:
+x_i ---> split points in MixColumn ---> (x_i/2 || y_i/2) --- constraints of equality of round teakey mask and state's mask
+---> PermuteNibbles ---> SubNibbles ---> x_(i + 1)
+|x_i| = 64, |y_i| = 32
+
+Two linear hulls with zero correlation covering 14 rounds of CRAFT:
+t:	0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 1000 0000 0000 0000 0000
+y0:	0000 0000 0000 0000 0010 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000
+xo:	0000 0000 0000 0000 0001 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000
+
+t:	0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 1000 0000 0000 0000 0000
+y0:	0000 0000 0000 0000 0010 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000
+xo:	0000 0000 0000 0000 0100 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000 0000
+"""
+
+
+class Craft:
+    def __init__(self, rounds, related_tweak=0, slice_number=0, tweak_offsets=None):
+        self.rounds = rounds
+        self.related_tweak = related_tweak
+        # Offsets of the tweak schedule (see tweak_is_permuted) probed in one
+        # search ([0] if None). The offset of a case is given by its highest bits (see case_offset).
+        if tweak_offsets is None:
+            tweak_offsets = [0]
+        self.tweak_offsets = list(tweak_offsets) if (related_tweak == 1) else list(tweak_offsets[:1])
+        self.block_size = 64
+        self.slice_number = slice_number
+        # Number of Gurobi threads of the methods which solve one model at a time
+        self.threads = plan(number_of_workers=1)[1]
+        self.p_permute_nibbles = [
+            0xf, 0xc, 0xd, 0xe, 0xa, 0x9, 0x8, 0xb, 0x6, 0x5, 0x4, 0x7, 0x1, 0x2, 0x3, 0x0]
+        self.q_permute_teakey_nibbles = [
+            0xc, 0xa, 0xf, 0x5, 0xe, 0x8, 0x9, 0x2, 0xb, 0x3, 0x7, 0x4, 0x6, 0x0, 0x1, 0xd]
+        # slice_number = None is used when the whole search space is probed
+        # by one scheduler (see scheduler.py)
+        if (self.slice_number == None):
+            suffix = "%d" % self.rounds
+        else:
+            suffix = "%d_%d" % (self.rounds, self.slice_number)
+        # The offsets are always part of the file names in the related-tweak model, so
+        # that the journals of different tweak schedules are never mixed up on resuming
+        if (self.related_tweak == 1):
+            suffix += "_tk" + "".join("%d" % offset for offset in self.tweak_offsets)
+        if (self.related_tweak == 0):
+            self.filename_model = "craft_stk_%s.lp" % suffix
+            self.filename_result = "result_stk_%s.txt" % suffix
+            self.filename_journal = "journal_stk_%s.bin" % suffix
+            self.filename_nibbles = "nibbles_stk_%s.npy" % suffix
+            self.filename_telemetry = "telemetry_stk_%s.jsonl" % suffix
+            self.filename_sweep = "sweep_stk_%s.npy" % suffix
+        else:
+            self.filename_model = "craft_rtk_%s.lp" % suffix
+            self.filename_result = "result_rtk_%s.txt" % suffix
+            self.filename_journal = "journal_rtk_%s.bin" % suffix
+            self.filename_nibbles = "nibbles_rtk_%s.npy" % suffix
+            self.filename_telemetry = "telemetry_rtk_%s.jsonl" % suffix
+            self.filename_sweep = "sweep_rtk_%s.npy" % suffix
+
+        fileobj = open(self.filename_result, "w")
+        fileobj.close()
+        # Constraints of the model as (terms, sense, rhs), where terms is a
+        # list of (coefficient, variable name). The model is built in memory
+        # from this list and it is also used to write the LP file. The
+        # constraints which depend on the offset of the tweak schedule are not
+        # in this list (see atk_constraints).
+        self.constraints = []
+        """
+        # a0, b0, p0 : lsb
+        # a3, b3, p1 : msb        
+        """
+        self.s_pos_ineqs = ["a3 + a2 + a1 + a0 - b0 >= 0",
+                            "a3 + a2 + a1 + a0 - b2 >= 0",
+                            "- a0 + b3 + b2 + b1 + b0 >= 0",
+                            "- a2 + b3 + b2 + b1 + b0 >= 0",
+                            "a3 + b3 - b2 + b1 - b0 >= -1",
+                            "a3 - a2 + a1 - a0 + b3 >= -1",
+                            "a3 + a2 + a1 + a0 - b3 >= 0",
+                            "a3 + a2 + a0 - b1 >= 0",
+                            "- a1 + b3 + b2 + b0 >= 0",
+                            "- a3 + b3 + b2 + b1 + b0 >= 0",
+                            "a3 + a0 - b3 + b2 - b1 - b0 >= -2",
+                            "- a3 - a2 - a1 + a0 + b3 + b2 >= -2",
+                            "a3 + a2 - b3 - b2 - b1 + b0 >= -2",
+                            "a3 + a2 - b3 + b2 - b1 - b0 >= -2",
+                            "- a3 + a2 - a1 - a0 + b3 + b2 >= -2",
+                            "a1 + b3 - b2 - b0 >= -1",
+                            "a3 + a0 - b3 - b2 - b1 + b0 >= -2",
+                            "- a3 + a2 - a1 - a0 + b3 + b0 >= -2",
+                            "- a3 - a2 - a1 + a0 + b3 + b0 >= -2",
+                            "a3 - a2 - a0 + b1 >= -1",
+                            "a3 - a2 - a1 - a0 - b2 - b0 >= -4",
+                            "- a2 - a0 + b3 - b2 - b1 - b0 >= -4",
+                            "a2 + a1 + a0 - b3 + b2 - b1 + b0 >= -1",
+                            "- a3 + a2 - a1 + a0 + b2 + b1 + b0 >= -1",
+                            "- a3 + a2 + a0 - b3 - b2 - b0 >= -3",
+                            "- a3 - a2 - a0 - b3 + b2 + b0 >= -3",
+                            "a2 + a0 - b2 - b1 - b0 >= -2",
+                            "- a2 - a1 - a0 + b2 + b0 >= -2",
+                            "- a3 - a2 + a1 - a0 - b2 - b1 - b0 >= -5",
+                            "- a2 - a1 - a0 - b3 - b2 + b1 - b0 >= -5",
+                            "- a3 - a2 + a0 + b3 + b2 - b1 >= -2",
+                            "a3 - a1 + a0 - b3 + b2 - b0 >= -2",
+                            "- a3 + a2 - a0 + b3 - b1 + b0 >= -2",
+                            "a3 + a2 - a1 - b3 - b2 + b0 >= -2",
+                            "a3 + a2 + a1 - b3 + b2 - b0 >= -1",
+                            "- a3 + a2 - a0 + b3 + b2 + b1 >= -1",
+                            "a3 + a1 + a0 - b3 - b2 + b0 >= -1",
+                            "- a3 - a2 + a0 + b3 + b1 + b0 >= -1"]
+        self.s_pos_terms = [self.parse_inequality(ineq) for ineq in self.s_pos_ineqs]
+
+    # c ---fork---> (a, b): coefficients of (a, b, c), right hand side
+    fork_ineqs = [[1, 1, -1, 0],
+                  [1, -1, 1, 0],
+                  [-1, 1, 1, 0],
+                  [-1, -1, -1, -2]]
+    # b ---threeFork--> (a2, a1, a0): coefficients of (b, a2, a1, a0), right hand side
+    three_fork_ineqs = [[1, -1, -1, -1, -2],
+                        [-1, 1, -1, -1, -2],
+                        [-1, -1, 1, -1, -2],
+                        [1, 1, 1, -1, 0],
+                        [-1, -1, -1, 1, -2],
+                        [1, 1, -1, 1, 0],
+                        [1, -1, 1, 1, 0],
+                        [-1, 1, 1, 1, 0]]
+
+    @staticmethod
+    def parse_inequality(ineq):
+        """
+        Convert an inequality like "- a0 + b3 >= -1" into ([(-1, "a0"), (1, "b3")], -1)
+        """
+        lhs, rhs = ineq.split(">=")
+        terms = []
+        sign = 1
+        for token in lhs.split():
+            if token == "+":
+                sign = 1
+            elif token == "-":
+                sign = -1
+            else:
+                terms.append((sign, token))
+                sign = 1
+        return terms, int(rhs)
+
+    def add_constraint(self, terms, sense, rhs):
+        """
+        Add the constraint sum(coefficient * variable) sense rhs to the model,
+        where sense is one of ">=", "=", "<="
+        """
+        self.constraints.append((terms, sense, rhs))
+
+    @staticmethod
+    def constraint_to_lp(constraint):
+        """
+        Convert a constraint into a line of an LP file.
+        """
+        terms, sense, rhs = constraint
+        lhs = ""
+        for coefficient, variable in terms:
+            if coefficient < 0:
+                lhs += " - " if lhs != "" else "- "
+            elif lhs != "":
+                lhs += " + "
+            if abs(coefficient) != 1:
+                lhs += "%d " % abs(coefficient)
+            lhs += variable
+        return "%s %s %d\n" % (lhs, sense, rhs)
+
+    def constraints_by_sbox(self, variable1, variable2):
+        """
+        Generate the constraints by Sbox layer.
+        """
+        for k in range(0, 16):
+            symbols = {}
+            for i in range(4):
+                symbols["a%d" % (3 - i)] = variable1[k][i]
+                symbols["b%d" % (3 - i)] = variable2[k][i]
+            for terms, rhs in self.s_pos_terms:
+                self.add_constraint([(coefficient, symbols[symbol]) for coefficient, symbol in terms],
+                                    ">=", rhs)
+
+    def create_objective_function(self):
+        """
+        Create objective function of the MILP model.
+        """
+        fileobj = open(self.filename_model, "a")
+        fileobj.write("Minimize\n")
+        temp = "1\n"
+        fileobj.write(temp)
+        fileobj.close()
+
+    @staticmethod
+    def create_variables(r, s):
+        """
+        Generate the variables used in the model.
+        """
+        array = [["" for i in range(0, 4)] for j in range(0, 16)]
+        for i in range(0, 16):
+            for j in range(0, 4):
+                array[i][j] = s + "_" + str(r) + "_" + str(i) + "_" + str(j)
+        return array
+
+    @staticmethod
+    def create_variables_after_mc(r, s1, s2):
+        """
+        Generate the variables used in the model.
+        """
+        array = [["" for i in range(0, 4)] for j in range(0, 16)]
+        for i in range(0, 8):
+            for j in range(0, 4):
+                array[i][j] = s1 + "_" + str(r) + "_" + str(i) + "_" + str(j)
+                array[i + 8][j] = s2 + "_" + \
+                    str(r) + "_" + str(i) + "_" + str(j)
+        return array
+
+    @staticmethod
+    def create_tweak_vars(s):
+        """
+        Generate the initial tweak variables used in the model.
+        """
+        array = [["" for i in range(0, 4)] for j in range(0, 16)]
+        for i in range(0, 16):
+            for j in range(0, 4):
+                array[i][j] = s + "_" + str(i) + "_" + str(j)
+        return array
+
+    def constraints_by_fork(self, c, a, b):
+        # c ---fork---> (a, b) can be modeled with 4 inequalities
+        # (without definition of dummy variable) by removing
+        # each impossible (a, b, c).
+        for coff in Craft.fork_ineqs:
+            self.add_constraint(list(zip(coff[0:3], [a, b, c])), ">=", coff[3])
+
+    def constraints_by_three_fork(self, b, a2, a1, a0):
+        """
+        b ---threeFork--> (a2, a1, a0)
+        These inequalitie were obtained via LogicFriday(QM algorithm, exact)
+        b - a2 - a1 - a0 >= -2
+        - b + a2 - a1 - a0 >= -2
+        - b - a2 + a1 - a0 >= -2
+        b + a2 + a1 - a0 >= 0
+        - b - a2 - a1 + a0 >= -2
+        b + a2 - a1 + a0 >= 0
+        b - a2 + a1 + a0 >= 0
+        - b + a2 + a1 + a0 >= 0
+        """
+        for coff in Craft.three_fork_ineqs:
+            self.add_constraint(list(zip(coff[0:4], [b, a2, a1, a0])), ">=", coff[4])
+
+    def state_fork(self, s, s1, s2):
+        for i in range(16):
+            for j in range(4):
+                self.constraints_by_fork(s[i][j], s1[i][j], s2[i][j])
+
+    def state_equality(self, s1, s2):
+        for i in range(16):
+            for j in range(4):
+                self.add_constraint([(1, s1[i][j]), (-1, s2[i][j])], "=", 0)
+
+    def flatten_state(self, s):
+        temp = [s[i][j] for i in range(16) for j in range(4)]
+        return temp
+
+    def constraints_by_mixing_layer(self, x, y):
+        """
+        Generate constraints related to mixing layer (MC)
+        """
+        y_offset = 8
+        for nibble_number in range(4):
+            for bit_number in range(4):
+                self.constraints_by_three_fork(x[nibble_number + 12][bit_number], x[nibble_number + 4][bit_number],
+                                               y[y_offset + nibble_number + 4][bit_number], x[nibble_number][bit_number])
+                self.constraints_by_fork(x[nibble_number + 8][bit_number], x[nibble_number][bit_number],
+                                         y[y_offset + nibble_number][bit_number])
+
+    def constraints_by_atk(self, tk, xy):
+        """
+        Generate the constraints by AddTweakey
+        """
+        for nibble_number in range(16):
+            for bit_number in range(4):
+                self.add_constraint([(1, tk[nibble_number][bit_number]),
+                                     (-1, xy[nibble_number][bit_number])], "=", 0)
+
+    def permute_nibbles(self, state):
+        temp = [0]*16
+        for i in range(16):
+            temp[self.p_permute_nibbles[i]] = state[i]
+        return temp
+
+    def q_permte_nibbles(self, state):
+        temp = [0]*16
+        for i in range(16):
+            temp[i] = state[self.q_permute_teakey_nibbles[i]]
+        return temp
+
+    def tweak_is_permuted(self, r, offset=None):
+        """
+        Whether the tweak of the (r + 1)-th round is permuted by Q, where offset
+        is the offset of the tweak schedule (self.tweak_offsets[0] if None).
+        The offsets 0, 1, 2 and 3 are the schedules of ZeroCorrelation-rev1-tk0,
+        ..., ZeroCorrelation-rev1-tk3. Note that the model never permutes the
+        tweak of the first round (r = 0).
+        """
+        if (offset == None):
+            offset = self.tweak_offsets[0]
+        return ((r + offset) % 4 >= 2)
+
+    def atk_constraints(self, offset=None):
+        """
+        Return the constraints of AddTweakey in the rounds r >= 1, i.e., the
+        only constraints of the model which depend on the offset of the tweak schedule
+        """
+        if (self.related_tweak == 0):
+            return []
+        constraints = self.constraints
+        self.constraints = []
+        for r in range(1, self.rounds):
+            y = self.create_variables_after_mc(r, "x", "y")
+            this_round_tk = self.create_variables(r, "tkt")
+            if self.tweak_is_permuted(r, offset):
+                self.constraints_by_atk(self.q_permte_nibbles(this_round_tk), y)
+            else:
+                self.constraints_by_atk(this_round_tk, y)
+        constraints, self.constraints = self.constraints, constraints
+        return constraints
+
+    def constraint(self):
+        """
+        Generate the constraints of MILP model, except the ones generated by
+        atk_constraints
+        """
+        assert(1 <= self.rounds <= 32)
+        self.constraints = []
+
+        x_in = self.create_variables(0, "x")
+        y = self.create_variables_after_mc(0, "x", "y")
+        x_out = self.create_variables(1, "x")
+        t = self.create_tweak_vars("t")
+        if self.rounds == 1:
+            self.constraints_by_mixing_layer(x_in, y)
+            if (self.related_tweak == 1):
+                this_round_tk = self.create_variables(0, "tkt")
+                self.constraints_by_atk(this_round_tk, y)
+            self.constraints_by_sbox(self.permute_nibbles(y), x_out)
+        else:
+            self.constraints_by_mixing_layer(x_in, y)
+            if (self.related_tweak == 1):
+                this_round_tk = self.create_variables(0, "tkt")
+                self.constraints_by_atk(this_round_tk, y)
+            self.constraints_by_sbox(self.permute_nibbles(y), x_out)
+            for r in range(1, self.rounds):
+                x_in = x_out
+                y = self.create_variables_after_mc(r, "x", "y")
+                x_out = self.create_variables(r + 1, "x")
+                self.constraints_by_mixing_layer(x_in, y)
+                self.constraints_by_sbox(self.permute_nibbles(y), x_out)
+        if (self.related_tweak == 1):
+            for r in range(self.rounds):
+                if (r == 0):
+                    old_tk = t
+                else:
+                    old_tk = self.create_variables(r - 1, "tkn")
+                this_round_tk = self.create_variables(r, "tkt")
+                if (r < self.rounds - 1):
+                    next_tk = self.create_variables(r, "tkn")
+                    self.state_fork(old_tk, this_round_tk, next_tk)
+                else:
+                    self.state_equality(old_tk, this_round_tk)
+
+    # Variables declaration
+    def binary_variables(self):
+        """
+        Return the names of all (binary) variables of the model.
+        """
+        variables = []
+        # x
+        for round_number in range(self.rounds + 1):
+            for nibble_number in range(16):
+                for bit_number in range(4):
+                    variables.append("x_%d_%d_%d" % (round_number, nibble_number, bit_number))
+        # y
+        for round_number in range(self.rounds):
+            for nibble_number in range(8):
+                for bit_number in range(4):
+                    variables.append("y_%d_%d_%d" % (round_number, nibble_number, bit_number))
+        # tweak variables
+        if (self.related_tweak == 1):
+            for nibble_number in range(16):
+                for bit_number in range(4):
+                    variables.append("t_%d_%d" % (nibble_number, bit_number))
+            for r in range(self.rounds):
+                for nibble_number in range(16):
+                    for bit_number in range(4):
+                        variables.append("tkt_%d_%d_%d" % (r, nibble_number, bit_number))
+                        if (r < self.rounds - 1):
+                            variables.append("tkn_%d_%d_%d" % (r, nibble_number, bit_number))
+        return variables
+
+    def variable_binary(self):
+        """
+        Specifying variables type.
+        """
+        fileobj = open(self.filename_model, "a")
+        fileobj.write("Binary\n")
+        for variable in self.binary_variables():
+            fileobj.write(variable + "\n")
+        fileobj.write("END")
+        fileobj.close()
+
+    def convert_str_to_states(self, st):
+        assert(len(st) == 16)
+        num_of_active_nibbles = st.count("1")
+        st_list = list(st)
+        active_nibbles = [i for i, v in enumerate(st_list) if v == "1"]
+        num_of_different_states = 16 - 1  # (16 ** num_of_active_nibbles) - 1
+        nonzero_values = [list(bin(i)[2:].zfill(4)) for i in range(1, 16)]
+        #comb = combinations(nonzero_values, num_of_active_nibbles)
+        states = [[['0', '0', '0', '0']
+                   for i in range(16)] for j in range(num_of_different_states)]
+        for i in range(num_of_different_states):
+            for k in range(num_of_active_nibbles):
+                states[i][active_nibbles[k]] = nonzero_values[i]
+        return state
+
+    def write_constraints(self, extra_constraints=None):
+        """
+        Write the constraints of the model into filename_model
+        """
+        if extra_constraints is None:
+            extra_constraints = []
+        fileobj = open(self.filename_model, "w")
+        fileobj.write("Subject To\n")
+        for constraint in self.constraints + self.atk_constraints() + extra_constraints:
+            fileobj.write(Craft.constraint_to_lp(constraint))
+        fileobj.close()
+
+    def make_model(self):
+        """
+        Generate the MILP model of CRAFT and write it into filename_model
+        """
+        self.constraint()
+        self.write_constraints()
+        self.variable_binary()
+
+    def model_data(self):
+        """
+        Return the model as plain python data (variables, constraints), which
+        can be built once and handed to every worker process. The constraints
+        of atk_constraints are not included.
+        """
+        if self.constraints == []:
+            self.constraint()
+        return self.binary_variables(), self.constraints
+
+    def load_model_data(self, model_data):
+        """
+        Reuse the constraints generated by another instance with the same
+        rounds and related_tweak (see model_data)
+        """
+        self.constraints = model_data[1]
+
+    def build_model(self):
+        """
+        Build the MILP model of CRAFT in memory, without writing/reading an LP file.
+        The model is built for tweak_offsets[0], and it can be switched to another
+        offset of the tweak schedule by set_tweak_offset.
+        """
+        variables, constraints = self.model_data()
+        m = Model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m._variables = {}
+        for name in variables:
+            m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        constrs = self.add_constraints(m, constraints)
+        # constraint() generates the equality between the last tweak mask of the
+        # tweak schedule and the tweak of the last round at the end (see extend_model)
+        m._tweak_chain_end = constrs[-64:] if (self.related_tweak == 1) else []
+        m._tweak_offset = None
+        m._tweak_constraints = []
+        self.set_tweak_offset(m, self.tweak_offsets[0])
+        m.update()
+        return m
+
+    def extend_model(self, m):
+        """
+        Extend a model of self.rounds rounds built by build_model to self.rounds + 1
+        rounds, and increment self.rounds. Only the constraints of the new round
+        are added: the tweak equality of the last round is replaced by a fork, and
+        the output mask of the cases is moved to the new round (see probe_cases),
+        so a model is not rebuilt from scratch for every number of rounds.
+        """
+        r = self.rounds
+        assert(r < 32)
+        self.constraints = []
+        x_in = self.create_variables(r, "x")
+        y = self.create_variables_after_mc(r, "x", "y")
+        x_out = self.create_variables(r + 1, "x")
+        self.constraints_by_mixing_layer(x_in, y)
+        self.constraints_by_sbox(self.permute_nibbles(y), x_out)
+        if (self.related_tweak == 1):
+            old_tk = self.create_tweak_vars("t") if (r == 1) else self.create_variables(r - 2, "tkn")
+            self.state_fork(old_tk, self.create_variables(r - 1, "tkt"), self.create_variables(r - 1, "tkn"))
+        round_constraints = self.constraints
+        self.constraints = []
+        if (self.related_tweak == 1):
+            self.state_equality(self.create_variables(r - 1, "tkn"), self.create_variables(r, "tkt"))
+        chain_end = self.constraints
+        self.rounds += 1
+        # The constraints of constraint() are generated again for the new number of rounds
+        self.constraints = []
+        for name in self.binary_variables():
+            if name not in m._variables:
+                m._variables[name] = m.addVar(vtype=GRB.BINARY, name=name)
+        m.remove(m._tweak_chain_end)
+        self.add_constraints(m, round_constraints)
+        m._tweak_chain_end = self.add_constraints(m, chain_end)
+        # The new round has a constraint of AddTweakey as well
+        offset = m._tweak_offset
+        m._tweak_offset = None
+        self.set_tweak_offset(m, offset)
+        m.update()
+        return m
+
+    @staticmethod
+    def add_constraints(m, constraints):
+        """
+        Add the constraints (terms, sense, rhs) to a model built by build_model,
+        and return them
+        """
+        senses = {">=": GRB.GREATER_EQUAL, "=": GRB.EQUAL, "<=": GRB.LESS_EQUAL}
+        return [m.addLConstr(LinExpr([coefficient for coefficient, _ in terms],
+                                     [m._variables[name] for _, name in terms]), senses[sense], rhs)
+                for terms, sense, rhs in constraints]
+
+    def set_tweak_offset(self, m, offset):
+        """
+        Replace the constraints of AddTweakey in a model built by build_model
+        by the ones of the given offset of the tweak schedule. The rest of the
+        model is shared by all the offsets.
+        """
+        if (self.related_tweak == 0 or m._tweak_offset == offset):
+            return
+        m.remove(m._tweak_constraints)
+        m._tweak_constraints = self.add_constraints(m, self.atk_constraints(offset))
+        m._tweak_offset = offset
+        m.update()
+
+    def number_of_cases(self):
+        """
+        Number of (t, y0, xo) cases with unit masks, 2^18 (related tweak) or 2^12 (single tweak)
+        per offset of the tweak schedule
+        """
+        if (self.related_tweak == 1):
+            return 64 * 64 * 64 * len(self.tweak_offsets)
+        return 64 * 64
+
+    def case_masks(self, case):
+        """
+        Return the masks (t, y0, xo) of a case as lists of 64 bits, where
+        case = (n << 12) | (i << 6) | j refers to t = 1 << n, y0 = 1 << i and
+        xo = 1 << j. t is None in the single tweak model.
+        """
+        n, i, j = (case >> 12) & 0x3f, (case >> 6) & 0x3f, case & 0x3f
+        y = list(bin(1 << i)[2:].zfill(64))
+        x = list(bin(1 << j)[2:].zfill(64))
+        if (self.related_tweak == 0):
+            return None, y, x
+        return list(bin(1 << n)[2:].zfill(64)), y, x
+
+    def nibble_case_masks(self, case):
+        """
+        Return the masks (t, y0, xo) of a nibble case, where
+        case = (tn << 20) | (n << 16) | (sn << 12) | (i << 8) | (on << 4) | j
+        refers to the masks whose only nonzero nibbles are nibble tn of t equal
+        to n, nibble sn of y0 equal to i, and nibble on of xo equal to j.
+        t is None in the single tweak model.
+        """
+        masks = []
+        for k in range(3):
+            nibble_number = (case >> (20 - 8*k)) & 0xf
+            mask = ['0' for ind in range(64)]
+            mask[4*nibble_number: 4*nibble_number + 4] = list(bin((case >> (16 - 8*k)) & 0xf)[2:].zfill(4))
+            masks.append(mask)
+        if (self.related_tweak == 0):
+            masks[0] = None
+        return masks
+
+    def nibble_cases(self, tweak_target_nibble, si_target_nibble, so_target_nibble, offset_index=0):
+        """
+        Return the nibble cases (see nibble_case_masks) of a triple of nibbles,
+        i.e., the 15^3 (15^2 in the single tweak model) nonzero values of them,
+        for the offset tweak_offsets[offset_index] of the tweak schedule
+        """
+        tweak_values = range(1, 16) if (self.related_tweak == 1) else [0]
+        return [(offset_index << 24) | (tweak_target_nibble << 20) | (n << 16) | (si_target_nibble << 12) | (i << 8) |
+                (so_target_nibble << 4) | j
+                for n in tweak_values for i in range(1, 16) for j in range(1, 16)]
+
+    def case_offset(self, case, case_masks=None):
+        """
+        Return the offset of the tweak schedule of a case, i.e., the entry
+        case >> 18 of tweak_offsets (case >> 24 if case_masks is nibble_case_masks)
+        """
+        shift = 24 if (case_masks == self.nibble_case_masks) else 18
+        return self.tweak_offsets[case >> shift]
+
+    def format_case(self, case, case_masks=None):
+        """
+        Return the lines "t:", "y0:" and "xo:" used to report a case, preceded
+        by "offset:" if several offsets of the tweak schedule are probed
+        """
+        offset = self.case_offset(case, case_masks)
+        if (case_masks == None):
+            case_masks = self.case_masks
+        masks = case_masks(case)
+        lines = []
+        if (len(self.tweak_offsets) > 1):
+            lines.append("offset:\t%d" % offset)
+        for label, mask in zip(["t", "y0", "xo"], masks):
+            if mask != None:
+                temp = ["".join(mask[4*ind:4*ind+4]) for ind in range(16)]
+                lines.append("%s:\t%s" % (label, " ".join(temp)))
+        return lines
+
+    def probe_cases(self, m, cases, conflicts=None, case_masks=None):
+        """
+        Fix the masks of each case in m, solve it, and yield (case, m.Status,
+        GUROBI) (see journal.py). Consecutive cases with the same (t, y0) share the temporary constraints
+        on the tweak and the input mask.
+
+        If conflicts is a list, the IIS of every infeasible case is computed, and
+        the fixed bits of t, y0 and xo involved in it are appended to conflicts
+        (see conflict_of_iis). A case which agrees with a conflict is infeasible
+        too, and it is yielded with (GRB.Status.INFEASIBLE, IIS) without being solved.
+        The same list can be passed again to probe the next cases.
+        case_masks converts a case into its masks (self.case_masks if None).
+        m is switched to the offset of the tweak schedule of each case (see
+        set_tweak_offset), so the cases of several offsets can be mixed.
+        """
+        case_offset = lambda case: self.case_offset(case, case_masks)
+        if (case_masks == None):
+            case_masks = self.case_masks
+        y_in = self.flatten_state(self.create_variables_after_mc(0, "x", "y"))
+        x_out = self.flatten_state(self.create_variables(self.rounds, "x"))
+        tweak = self.flatten_state(self.create_tweak_vars("t"))
+
+        y_in = [m.getVarByName(y) for y in y_in]
+        x_out = [m.getVarByName(x) for x in x_out]
+        if (self.related_tweak == 1):
+            tweak = [m.getVarByName(t) for t in tweak]
+
+        fixed_t = None
+        fixed_y = None
+        temporary_constraints0 = None
+        temporary_constraints1 = None
+        try:
+            for case in cases:
+                t, y, x = case_masks(case)
+                offset = case_offset(case)
+                if (conflicts != None):
+                    conflict = self.matching_conflict(conflicts, (t, y, x), offset)
+                    if (conflict != None):
+                        conflict[1] += 1
+                        yield case, GRB.Status.INFEASIBLE, IIS
+                        continue
+                if (t != fixed_t):
+                    if (temporary_constraints0 != None):
+                        m.remove(temporary_constraints0)
+                    temporary_constraints0 = m.addConstrs(
+                        (tweak[k] == int(t[k]) for k in range(64)), name='temp_constraints0')
+                    fixed_t = t
+                if (y != fixed_y):
+                    if (temporary_constraints1 != None):
+                        m.remove(temporary_constraints1)
+                    temporary_constraints1 = m.addConstrs(
+                        (y_in[k] == int(y[k]) for k in range(64)), name='temp_constraints1')
+                    fixed_y = y
+                self.set_tweak_offset(m, offset)
+                temporary_constraints2 = m.addConstrs(
+                    (x_out[k] == int(x[k]) for k in range(64)), name='temp_constraints2')
+                m.optimize()
+                status = m.Status
+                if (conflicts != None and status == GRB.Status.INFEASIBLE):
+                    fixings = [temporary_constraints1, temporary_constraints2]
+                    if (self.related_tweak == 1):
+                        fixings = [temporary_constraints0] + fixings
+                    else:
+                        fixings = [None] + fixings
+                    conflicts.append([self.conflict_of_iis(m, fixings, (t, y, x)), 0, offset])
+                yield case, status, GUROBI
+                m.remove(temporary_constraints2)
+                m.update()
+        finally:
+            if (temporary_constraints1 != None):
+                m.remove(temporary_constraints1)
+            if (temporary_constraints0 != None):
+                m.remove(temporary_constraints0)
+            m.update()
+
+    @staticmethod
+    def telemetry_record(m, case, status, decided_by, solve_time):
+        """
+        Return the telemetry record (see telemetry.py) of a case yielded by probe_cases
+        """
+        zc = (status == GRB.Status.INFEASIBLE)
+        if (decided_by == GUROBI):
+            return case, decided_by, zc, status, solve_time, int(m.NodeCount)
+        return case, decided_by, zc, None, solve_time, None
+
+    @staticmethod
+    def conflict_of_iis(m, fixings, masks):
+        """
+        Compute an IIS of the infeasible model m, and return the fixed bits it
+        involves as a list of (mask number, bit number, value), where fixings
+        and masks are the temporary constraints and the values of (t, y0, xo).
+        """
+        m.computeIIS()
+        conflict = []
+        for mask_number in range(3):
+            if (fixings[mask_number] == None):
+                continue
+            for k in range(64):
+                if fixings[mask_number][k].IISConstr:
+                    conflict.append((mask_number, k, masks[mask_number][k]))
+        return conflict
+
+    @staticmethod
+    def matching_conflict(conflicts, masks, offset):
+        """
+        Return the first conflict [fixed bits, number of cases ruled out, offset
+        of the tweak schedule] which agrees with the masks (t, y0, xo) and the
+        offset, or None
+        """
+        for conflict in conflicts:
+            if conflict[2] == offset and all(masks[mask_number][k] == value for mask_number, k, value in conflict[0]):
+                return conflict
+        return None
+
+    def reachable_output_masks(self, m, inputs):
+        """
+        For each input = case >> 6 (see case_masks), fix t and y0 in m, and find the unit output masks xo which
+        are reachable from it. Instead of probing the 64 output masks one by one,
+        xo is only required to have a Hamming weight of one, and every solution
+        found excludes its output mask from the next solves, until the model gets
+        infeasible. Yield (input, reachable j (xo = 1 << j), m.Status of the
+        last solve, number of solves).
+        """
+        y_in = self.flatten_state(self.create_variables_after_mc(0, "x", "y"))
+        x_out = self.flatten_state(self.create_variables(self.rounds, "x"))
+        tweak = self.flatten_state(self.create_tweak_vars("t"))
+
+        y_in = [m.getVarByName(y) for y in y_in]
+        x_out = [m.getVarByName(x) for x in x_out]
+        if (self.related_tweak == 1):
+            tweak = [m.getVarByName(t) for t in tweak]
+
+        unit_output = m.addConstr(quicksum(x_out) == 1, name='unit_output')
+        try:
+            for input_masks in inputs:
+                t, y, _ = self.case_masks(input_masks << 6)
+                self.set_tweak_offset(m, self.case_offset(input_masks << 6))
+                temporary_constraints = []
+                if (t != None):
+                    temporary_constraints.append(m.addConstrs(
+                        (tweak[k] == int(t[k]) for k in range(64)), name='temp_constraints0'))
+                temporary_constraints.append(m.addConstrs(
+                    (y_in[k] == int(y[k]) for k in range(64)), name='temp_constraints1'))
+                reachable = []
+                number_of_solves = 0
+                while True:
+                    m.optimize()
+                    number_of_solves += 1
+                    if (m.Status != GRB.Status.OPTIMAL):
+                        break
+                    k = [k for k in range(64) if x_out[k].X > 0.5][0]
+                    reachable.append(63 - k)
+                    x_out[k].UB = 0
+                status = m.Status
+                for x in x_out:
+                    x.UB = 1
+                for constraints in temporary_constraints:
+                    m.remove(constraints)
+                m.update()
+                yield input_masks, sorted(reachable), status, number_of_solves
+        finally:
+            m.remove(unit_output)
+            for x in x_out:
+                x.UB = 1
+            m.update()
+
+    def open_journal(self):
+        """
+        Open the journal of this search (see journal.py). If filename_journal
+        exists, the search resumes from the cases recorded in it.
+        """
+        return Journal(self.filename_journal, self.number_of_cases())
+
+    def prefilter_cases(self, journal, fileobj, cases):
+        """
+        Run the pre-filter (see prefilter.py) on the cases, record the decided
+        ones, and return (zero-correlation cases, undecided cases)
+        """
+        zc_cases = []
+        undecided_cases = []
+        for offset, group in groupby(cases, self.case_offset):
+            zc_group, undecided_group = Prefilter(self, tweak_offset=offset).split_cases(list(group))
+            zc_cases += zc_group
+            undecided_cases += undecided_group
+        zc = set(zc_cases)
+        undecided = set(undecided_cases)
+        for case in cases:
+            if case not in undecided:
+                journal.mark(case, case in zc, PREFILTER)
+        journal.flush()
+        for case in zc_cases:
+            self.write_case(fileobj, case)
+        print("Pre-filter : %d zero-correlation, %d feasible, %d undecided cases" %
+              (len(zc_cases), len(cases) - len(zc_cases) - len(undecided_cases), len(undecided_cases)))
+        return zc_cases, undecided_cases
+
+    def record_reachable_output_masks(self, journal, fileobj, input_masks, reachable, status):
+        """
+        Record the 64 cases of an input (see reachable_output_masks) and return
+        the number of zero-correlation cases. If the last solve was not infeasible,
+        only the reachable cases are recorded.
+        """
+        zc_counter = 0
+        for j in range(64):
+            case = (input_masks << 6) | j
+            if journal.is_completed(case):
+                continue
+            if j in reachable:
+                journal.mark(case, False, REACHABILITY)
+            elif (status == GRB.Status.INFEASIBLE):
+                journal.mark(case, True, REACHABILITY)
+                self.write_case(fileobj, case)
+                zc_counter += 1
+        journal.flush()
+        return zc_counter
+
+    def write_case(self, fileobj, case, case_masks=None):
+        for line in self.format_case(case, case_masks):
+            fileobj.write(line + "\n")
+            print(line)
+        fileobj.write("\n")
+        print("\n")
+
+    def search_masks_with_hamming_weight_of_one_stk(self, use_iis=False, use_prefilter=False):
+        """
+        If use_iis is True, the cases which agree with the IIS of an infeasible
+        case are not solved (see probe_cases), and if use_prefilter is True, the
+        cases decided by the pre-filter (see prefilter.py) are not solved
+        """
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m.setParam(GRB.Param.Threads, self.threads)
+
+        total_tests = 64 * 64
+        journal = self.open_journal()
+        cases = range(total_tests)
+        for case in journal.infeasible_cases(cases):
+            self.write_case(fileobj, case)
+        pending_cases = journal.pending(cases)
+        if use_prefilter:
+            _, pending_cases = self.prefilter_cases(journal, fileobj, pending_cases)
+        counter = total_tests - len(pending_cases)
+        conflicts = [] if use_iis else None
+        telemetry = Telemetry(self.filename_telemetry, total_tests, counter)
+        solve_start = time.time()
+        for case, status, decided_by in self.probe_cases(m, pending_cases, conflicts):
+            journal.mark(case, status == GRB.Status.INFEASIBLE, decided_by)
+            telemetry.record(*self.telemetry_record(m, case, status, decided_by, time.time() - solve_start))
+            if (status == GRB.Status.INFEASIBLE):
+                self.write_case(fileobj, case)
+            counter += 1
+            if (counter % 64 == 0):
+                journal.flush()
+            print(telemetry.progress())
+            solve_start = time.time()
+        journal.close()
+        telemetry.close()
+        for line in telemetry.report():
+            print(line)
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+
+    def search_masks_with_hamming_weight_of_one_rtk(self, use_iis=False, use_prefilter=False):
+        """
+        Probe the slice slice_number of the cases of every offset of tweak_offsets
+        (all the cases if slice_number is None). If use_iis is True, the cases
+        which agree with the IIS of an infeasible case are not solved (see
+        probe_cases), and if use_prefilter is True, the cases decided by the
+        pre-filter (see prefilter.py) are not solved
+        """
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m.setParam(GRB.Param.Threads, self.threads)
+        m.setParam(GRB.Param.Presolve, 0)
+
+        journal = self.open_journal()
+        if (self.slice_number == None):
+            cases = list(range(self.number_of_cases()))
+        else:
+            # The slice slice_number of the 2^18 cases of every offset of the tweak schedule
+            slice_size = 64 * 64 * 4
+            cases = [(offset_index << 18) | case for offset_index in range(len(self.tweak_offsets))
+                     for case in range(slice_size * self.slice_number, slice_size * (self.slice_number + 1))]
+        total_tests = len(cases)
+        zc_cases = journal.infeasible_cases(cases)
+        for case in zc_cases:
+            self.write_case(fileobj, case)
+        prefilter_zc_cases, pending_cases = [], journal.pending(cases)
+        if use_prefilter:
+            prefilter_zc_cases, pending_cases = self.prefilter_cases(journal, fileobj, pending_cases)
+        counter = total_tests - len(pending_cases)
+        zc_counter = len(zc_cases) + len(prefilter_zc_cases)
+        conflicts = [] if use_iis else None
+        telemetry = Telemetry(self.filename_telemetry, total_tests, counter)
+        solve_start = time.time()
+        for case, status, decided_by in self.probe_cases(m, pending_cases, conflicts):
+            journal.mark(case, status == GRB.Status.INFEASIBLE, decided_by)
+            telemetry.record(*self.telemetry_record(m, case, status, decided_by, time.time() - solve_start))
+            if (status == GRB.Status.INFEASIBLE):
+                self.write_case(fileobj, case)
+                zc_counter += 1
+            counter += 1
+            if (counter % 64 == 0):
+                journal.flush()
+            print("#ZC : %d \t %s" % (zc_counter, telemetry.progress()))
+            solve_start = time.time()
+        journal.close()
+        telemetry.close()
+        for line in telemetry.report():
+            print(line)
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+    
+    def search_reachable_output_masks(self):
+        """
+        Find the zero-correlation cases with one reachability search per input
+        (t, y0), see reachable_output_masks
+        """
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m.setParam(GRB.Param.Threads, self.threads)
+        if (self.related_tweak == 1):
+            m.setParam(GRB.Param.Presolve, 0)
+
+        journal = self.open_journal()
+        cases = range(self.number_of_cases())
+        zc_cases = journal.infeasible_cases(cases)
+        for case in zc_cases:
+            self.write_case(fileobj, case)
+        inputs = sorted(set(case >> 6 for case in journal.pending(cases)))
+        total_inputs = self.number_of_cases() >> 6
+        counter = total_inputs - len(inputs)
+        zc_counter = len(zc_cases)
+        total_solves = 0
+        for input_masks, reachable, status, number_of_solves in self.reachable_output_masks(m, inputs):
+            zc_counter += self.record_reachable_output_masks(journal, fileobj, input_masks, reachable, status)
+            total_solves += number_of_solves
+            counter += 1
+            print("%d/%d \t #ZC : %d \t #solves : %d" %
+                  (counter, total_inputs, zc_counter, total_solves))
+        journal.close()
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+
+    def search_for_fixed_activity_pattern_st(self, si_target_nibble, so_target_nibble):
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m.setParam(GRB.Param.Threads, self.threads)
+        m.setParam(GRB.Param.Presolve, 0)
+
+        y_in = self.create_variables_after_mc(0, "x", "y")
+        x_out = self.create_variables(self.rounds, "x")        
+
+        y_in = self.flatten_state(y_in)
+        x_out = self.flatten_state(x_out)
+
+        y_in = [m.getVarByName(y) for y in y_in]
+        x_out = [m.getVarByName(x) for x in x_out]
+
+        total_tests = 15*15
+        cnt = 0
+        zc_counter = 0
+        
+        for i in range(1, 16):
+            si = ['0' for ind in range(64)]
+            si[4*si_target_nibble: 4*si_target_nibble +
+                4] = list(bin(i)[2:].zfill(4))
+            temporary_constraints1 = m.addConstrs(
+                (y_in[k] == int(si[k]) for k in range(64)), name='temp_constraints1')
+            for j in range(1, 16):
+                so = ['0' for ind in range(64)]
+                so[4*so_target_nibble: 4*so_target_nibble +
+                    4] = list(bin(j)[2:].zfill(4))
+                temporary_constraints2 = m.addConstrs(
+                    (x_out[k] == int(so[k]) for k in range(64)), name='temp_constraints2')                
+                m.optimize()
+                cnt += 1
+                if (m.Status == GRB.Status.INFEASIBLE):
+                    temp_si = ["".join(si[4*ind:4*ind+4]) for ind in range(16)]
+                    temp_so = ["".join(so[4*ind:4*ind+4]) for ind in range(16)]
+                    line1 = "y0:\t%s" % " ".join(temp_si)
+                    line2 = "xo:\t%s" % " ".join(temp_so)
+                    fileobj.write(line1 + "\n")
+                    fileobj.write(line2 + "\n")
+                    fileobj.write("\n")
+                    print(line1)
+                    print(line2)
+                    zc_counter += 1
+                    #m.computeIIS()
+                    #m.write("out%d.ilp" % zc_counter)
+                print("%d / %d \t #ZC : %d" % (cnt, total_tests, zc_counter))
+                fileobj.write("%d / %d \t #ZC : %d\n" %
+                              (cnt, total_tests, zc_counter))
+                m.remove(temporary_constraints2)
+                m.update()
+            m.remove(temporary_constraints1)
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+
+    def get_value_of_master_tweak_variables(self, m):        
+        v_names = self.create_tweak_vars("t")
+        v_names = self.flatten_state(v_names)
+        temp = map(m.getVarByName, v_names)
+        v_values = [str(int(e.X)) for e in temp]
+        temp_values = []
+        for i in range(16):
+            temp = "".join(v_values[i*4: i*4 + 4])
+            temp = int(temp, 2)
+            temp = hex(temp)[2:]
+            temp_values.append(temp)
+        temp_values = "%s:\t%s" % ("t", "".join(temp_values))
+        return temp_values
+
+    def get_value_of_tweak_variables(self, m, s, r):        
+        v_names = self.create_variables(r, s)        
+        if self.tweak_is_permuted(r):
+            v_names = self.q_permte_nibbles(v_names)        
+        v_names = self.flatten_state(v_names)
+        temp = map(m.getVarByName, v_names)
+        v_values = [str(int(e.X)) for e in temp]
+        temp_values = []
+        for i in range(16):
+            temp = "".join(v_values[i*4: i*4 + 4])
+            temp = int(temp, 2)
+            temp = hex(temp)[2:]
+            temp_values.append(temp)
+        temp_values = "%s%d:\t%s" % (s, r, "".join(temp_values))
+        return temp_values  
+
+    def get_value_of_variables(self, m, s, r):        
+        v_names = self.create_variables(r, s)
+        v_names = self.flatten_state(v_names)
+        temp = map(m.getVarByName, v_names)
+        v_values = [str(int(e.X)) for e in temp]
+        temp_values = []
+        for i in range(16):
+            temp = "".join(v_values[i*4: i*4 + 4])
+            temp = int(temp, 2)
+            temp = hex(temp)[2:]
+            temp_values.append(temp)
+        temp_values = "%s%d:\t%s" % (s, r, "".join(temp_values))
+        return temp_values        
+    
+    def get_value_of_mixcol_output_vars(self, m, s1, s2, r):
+        v_names = self.create_variables_after_mc(r, s1, s2)
+        v_names = self.flatten_state(v_names)
+        temp = map(m.getVarByName, v_names)
+        v_values = [str(int(e.X)) for e in temp]
+        temp_values = []
+        for i in range(16):
+            temp = "".join(v_values[i*4: i*4 + 4])
+            temp = int(temp, 2)
+            temp = hex(temp)[2:]
+            temp_values.append(temp)
+        temp_values = "%s%d:\t%s" % (s2, r, "".join(temp_values))
+        return temp_values
+
+    def search_for_fixed_tweak_and_fixed_activity_pattern(self, si_target_nibble, so_target_nibble,
+            tweak="0000000000000000000000000000000000000000000011010000000000000000", fixed_bits=range(44, 48)):
+        """
+        Probe all nonzero values of the nibbles si_target_nibble and so_target_nibble,
+        where the bits fixed_bits of the tweak mask are fixed to the bits of tweak,
+        e.g., tweak="1111111111111111111111111111111111111111111100001111111111111111"
+        with fixed_bits=range(64) for RTK3
+        """
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+        t = list(tweak)
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, False)
+        m.setParam(GRB.Param.Threads, self.threads)
+        m.setParam(GRB.Param.Presolve, 0)
+
+        y_in = self.create_variables_after_mc(0, "x", "y")
+        x_out = self.create_variables(self.rounds, "x")
+        tweak = self.create_tweak_vars("t")
+
+        y_in = self.flatten_state(y_in)
+        x_out = self.flatten_state(x_out)
+        tweak = self.flatten_state(tweak)
+
+        y_in = [m.getVarByName(y) for y in y_in]
+        x_out = [m.getVarByName(x) for x in x_out]
+        tweak = [m.getVarByName(t) for t in tweak]
+
+        total_tests = 15*15
+        cnt = 0
+        zc_counter = 0
+
+        temporary_constraints0 = m.addConstrs(
+            (tweak[k] == int(t[k]) for k in fixed_bits), name='temp_constraints0')
+        temp_t = ["".join(t[4*ind:4*ind+4]) for ind in range(16)]
+        temp_t = " ".join(temp_t)
+        line0 = "t:\t%s" % temp_t
+        for i in range(1, 16):
+            si = ['0' for ind in range(64)]
+            si[4*si_target_nibble: 4*si_target_nibble +
+                4] = list(bin(i)[2:].zfill(4))
+            temporary_constraints1 = m.addConstrs(
+                (y_in[k] == int(si[k]) for k in range(64)), name='temp_constraints1')
+            for j in range(1, 16):
+                so = ['0' for ind in range(64)]
+                so[4*so_target_nibble: 4*so_target_nibble +
+                    4] = list(bin(j)[2:].zfill(4))
+                temporary_constraints2 = m.addConstrs(
+                    (x_out[k] == int(so[k]) for k in range(64)), name='temp_constraints2')                
+                m.optimize()
+                cnt += 1
+                if (m.Status == GRB.Status.INFEASIBLE):
+                    temp_si = ["".join(si[4*ind:4*ind+4]) for ind in range(16)]
+                    temp_so = ["".join(so[4*ind:4*ind+4]) for ind in range(16)]
+                    line1 = "y0:\t%s" % " ".join(temp_si)
+                    line2 = "xo:\t%s" % " ".join(temp_so)
+                    fileobj.write(line0 + "\n")
+                    fileobj.write(line1 + "\n")
+                    fileobj.write(line2 + "\n")
+                    fileobj.write("\n")
+                    print(line0)
+                    print(line1)
+                    print(line2)
+                    zc_counter += 1
+                    #m.computeIIS()
+                    #m.write("out%d.ilp" % zc_counter)
+                if (m.Status == 2):
+                    temp0 = self.get_value_of_master_tweak_variables(m)
+                    print(temp0)
+                    for r in range(self.rounds + 1):                        
+                        temp1 = self.get_value_of_variables(m, "x", r)                        
+                        if (r < self.rounds):
+                            temp3 = self.get_value_of_tweak_variables(m, "tkt", r)
+                            temp2 = self.get_value_of_mixcol_output_vars(m, "x", "y", r)
+                            print("%s \t %s \t %s" % (temp1, temp2, temp3))
+                        else:
+                            print("%s" % temp1)
+                print("%d / %d \t #ZC : %d" % (cnt, total_tests, zc_counter))
+                fileobj.write("%d / %d \t #ZC : %d\n" %
+                              (cnt, total_tests, zc_counter))
+                m.remove(temporary_constraints2)
+                m.update()
+            m.remove(temporary_constraints1)
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+
+    def search_for_fixed_activity_pattern_rtk(self, tweak_target_nibble, si_target_nibble, so_target_nibble):
+        fileobj = open(self.filename_result, "a")
+        time_start = time.time()
+        m = self.build_model()
+        m.setParam(GRB.Param.OutputFlag, True)
+        m.setParam(GRB.Param.Threads, self.threads)
+
+        y_in = self.create_variables_after_mc(0, "x", "y")
+        x_out = self.create_variables(self.rounds, "x")
+        tweak = self.create_tweak_vars("t")
+
+        y_in = self.flatten_state(y_in)
+        x_out = self.flatten_state(x_out)
+        tweak = self.flatten_state(tweak)
+
+        y_in = [m.getVarByName(y) for y in y_in]
+        x_out = [m.getVarByName(x) for x in x_out]
+        tweak = [m.getVarByName(t) for t in tweak]
+
+        total_tests = 15*15*15
+        cnt = 0
+        zc_counter = 0
+        for n in range(1, 16):
+            t = ['0' for ind in range(64)]
+            t[4*tweak_target_nibble: 4*tweak_target_nibble +
+                4] = list(bin(n)[2:].zfill(4))
+            temporary_constraints0 = m.addConstrs(
+                (tweak[k] == int(t[k]) for k in range(64)), name='temp_constraints0')
+            for i in range(1, 16):
+                si = ['0' for ind in range(64)]
+                si[4*si_target_nibble: 4*si_target_nibble +
+                    4] = list(bin(i)[2:].zfill(4))
+                temporary_constraints1 = m.addConstrs(
+                    (y_in[k] == int(si[k]) for k in range(64)), name='temp_constraints1')
+                for j in range(1, 16):
+                    so = ['0' for ind in range(64)]
+                    so[4*so_target_nibble: 4*so_target_nibble +
+                        4] = list(bin(j)[2:].zfill(4))
+                    temporary_constraints2 = m.addConstrs(
+                        (x_out[k] == int(so[k]) for k in range(64)), name='temp_constraints2')
+                    m.optimize()
+                    cnt += 1
+                    if (m.Status == GRB.Status.INFEASIBLE):
+                        temp_t = ["".join(t[4*ind:4*ind+4])
+                                  for ind in range(16)]
+                        temp_si = ["".join(si[4*ind:4*ind+4])
+                                   for ind in range(16)]
+                        temp_so = ["".join(so[4*ind:4*ind+4])
+                                   for ind in range(16)]
+                        line0 = "t:\t%s" % " ".join(temp_t)
+                        line1 = "y0:\t%s" % " ".join(temp_si)
+                        line2 = "xo:\t%s" % " ".join(temp_so)
+                        fileobj.write(line0 + "\n")
+                        fileobj.write(line1 + "\n")
+                        fileobj.write(line2 + "\n")
+                        fileobj.write("\n")
+                        print(line0)
+                        print(line1)
+                        print(line2)
+                        zc_counter += 1
+                    print("%d / %d \t #ZC : %d" %
+                          (cnt, total_tests, zc_counter))
+                    m.remove(temporary_constraints2)
+                    m.update()
+                m.remove(temporary_constraints1)
+            m.remove(temporary_constraints0)
+            m.update()
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj.close()
+##################################################################
+
+    def search_for_fixed_tweak_and_fixed_activity_pattern_file(self, si_target_nibble, so_target_nibble):
+        fileobj_result = open(self.filename_result, "a")        
+        time_start = time.time()
+        #t = list("0000000000000000000000000000000000000000000010000000000000000000")
+        t = list("1111111111111111111111111111111111111111111111011111111111111111")                    
+
+        y_in = self.create_variables_after_mc(0, "x", "y")
+        y_in = self.flatten_state(y_in)
+
+        x_out = self.create_variables(self.rounds, "x")
+        x_out = self.flatten_state(x_out)
+
+        tweak = self.create_tweak_vars("t")                
+        tweak = self.flatten_state(tweak)
+
+        total_tests = 15*15
+        cnt = 0
+        zc_counter = 0
+        
+        for i in range(1, 16):
+            
+            si = ['0' for ind in range(64)]
+            si[4*si_target_nibble: 4*si_target_nibble +
+                4] = list(bin(i)[2:].zfill(4))
+            for j in range(1, 16):                
+                so = ['0' for ind in range(64)]
+                so[4*so_target_nibble: 4*so_target_nibble +
+                    4] = list(bin(j)[2:].zfill(4))
+                #--------------------------------------------------------
+                #self.create_objective_function()
+                self.constraint()
+                fixed_values = [([(1, y_in[k])], "=", int(si[k])) for k in range(64)]
+                fixed_values += [([(1, x_out[k])], "=", int(so[k])) for k in range(64)]
+                fixed_values += [([(1, tweak[k])], "=", int(t[k])) for k in range(64)]
+                self.write_constraints(fixed_values)
+                self.variable_binary()
+                #---------------------------------------------------------
+                m = read(self.filename_model)
+                m.setParam(GRB.Param.OutputFlag, False)
+                m.setParam(GRB.Param.Threads, self.threads)
+                m.optimize()                
+                cnt += 1
+                if (m.Status == 3):
+                    #GRB.Status.INFEASIBLE
+                    temp_si = ["".join(si[4*ind:4*ind+4]) for ind in range(16)]
+                    temp_so = ["".join(so[4*ind:4*ind+4]) for ind in range(16)]
+                    temp_t = ["".join(t[4*ind:4*ind+4]) for ind in range(16)]
+                    line0 = "t:\t%s" % " ".join(temp_t)
+                    line1 = "y0:\t%s" % " ".join(temp_si)
+                    line2 = "xo:\t%s" % " ".join(temp_so)
+                    fileobj_result.write(line0 + "\n")
+                    fileobj_result.write(line1 + "\n")
+                    fileobj_result.write(line2 + "\n")
+                    fileobj_result.write("\n")
+                    print(line0)
+                    print(line1)
+                    print(line2)
+                    #m.computeIIS()
+                    #m.write("out.ilp")
+                    zc_counter += 1
+                print("%d / %d \t #ZC : %d" % (cnt, total_tests, zc_counter))
+                #print(m.Status)
+                fileobj_result.write("%d / %d \t #ZC : %d\n" %
+                              (cnt, total_tests, zc_counter))
+        time_end = time.time()
+        print(("Time used = " + str(time_end - time_start)))
+        fileobj_result.close()
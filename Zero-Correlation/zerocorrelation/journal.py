@@ -0,0 +1,125 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import mmap
+import os
+import struct
+
+"""
+On-disk journal of a zero-correlation search, used to resume an interrupted run.
+
+The journal file contains a small header followed by two bitmaps and one
+column of bytes over the case indices (see Craft.case_masks):
+completed:  bit c is set when case c has been probed
+infeasible: bit c is set when case c is a zero-correlation case
+status:     byte c tells how case c has been decided (see below)
+The file is memory-mapped, so that marking a case is a single bit operation,
+and the pages are written back to the disk by flush() (and by the kernel, even
+if the process is killed). The journal is also the result store of the search,
+which can be queried without parsing the result files (see results.py).
+"""
+
+# Status of a case: the method which has decided it
+NOT_PROBED = 0
+GUROBI = 1
+SAT_SOLVER = 2
+PREFILTER = 3
+MATRIX_METHOD = 4
+# Agrees with the IIS of another infeasible case (see Craft.probe_cases)
+IIS = 5
+REACHABILITY = 6
+# Copied from an equivalent case (see symmetry.py)
+SYMMETRY = 7
+STATUS_NAMES = ["not probed", "Gurobi", "SAT solver", "pre-filter", "matrix method", "IIS",
+                "reachability", "symmetry"]
+
+
+class Journal:
+    magic = b"CRAFTZC1"
+    header_format = "<8sQ"
+
+    def __init__(self, filename, number_of_cases):
+        self.filename = filename
+        self.number_of_cases = number_of_cases
+        self.bitmap_size = (number_of_cases + 7) // 8
+        self.header_size = struct.calcsize(Journal.header_format)
+        file_size = self.header_size + 2 * self.bitmap_size + number_of_cases
+        if not os.path.exists(filename):
+            with open(filename, "wb") as fileobj:
+                fileobj.write(struct.pack(Journal.header_format, Journal.magic, number_of_cases))
+                fileobj.write(bytes(2 * self.bitmap_size + number_of_cases))
+        with open(filename, "r+b") as fileobj:
+            header = fileobj.read(self.header_size)
+            magic, n = struct.unpack(Journal.header_format, header)
+            if (magic != Journal.magic or n != number_of_cases or
+                    os.path.getsize(filename) != file_size):
+                raise ValueError("%s is not a journal of %d cases" % (filename, number_of_cases))
+            self.data = mmap.mmap(fileobj.fileno(), file_size)
+        self.completed_offset = self.header_size
+        self.infeasible_offset = self.header_size + self.bitmap_size
+        self.status_offset = self.header_size + 2 * self.bitmap_size
+
+    def get_bit(self, offset, case):
+        return (self.data[offset + (case >> 3)] >> (case & 7)) & 1
+
+    def set_bit(self, offset, case):
+        self.data[offset + (case >> 3)] |= 1 << (case & 7)
+
+    def is_completed(self, case):
+        return self.get_bit(self.completed_offset, case) == 1
+
+    def is_infeasible(self, case):
+        return self.get_bit(self.infeasible_offset, case) == 1
+
+    def status(self, case):
+        return self.data[self.status_offset + case]
+
+    def mark(self, case, infeasible, status):
+        """
+        Record that case has been probed, whether it is a zero-correlation case,
+        and the method which has decided it (status)
+        """
+        if infeasible:
+            self.set_bit(self.infeasible_offset, case)
+        self.data[self.status_offset + case] = status
+        self.set_bit(self.completed_offset, case)
+
+    def pending(self, cases):
+        """
+        Return the cases which have not been probed yet
+        """
+        return [case for case in cases if not self.is_completed(case)]
+
+    def infeasible_cases(self, cases=None):
+        """
+        Return the zero-correlation cases recorded so far (among cases, if given)
+        """
+        if cases == None:
+            cases = range(self.number_of_cases)
+        return [case for case in cases if self.is_completed(case) and self.is_infeasible(case)]
+
+    def number_of_completed_cases(self):
+        return sum(bin(b).count("1") for b in
+                   self.data[self.completed_offset:self.completed_offset + self.bitmap_size])
+
+    def flush(self):
+        self.data.flush()
+
+    def close(self):
+        self.data.flush()
+        self.data.close()
@@ -0,0 +1,93 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+import random
+import numpy as np
+from zerocorrelation.craft import Craft
+from zerocorrelation.scheduler import search_in_parallel, search_reachable_in_parallel, benchmark_plans, sweep_nibble_activity, \
+    sweep_rounds
+
+
+def main(tweak_offsets=None):
+    """
+    Run the search of the folder ZeroCorrelation-rev1-tk<k>, where tweak_offsets
+    are the offsets of the tweak schedule probed in one job (see
+    Craft.tweak_is_permuted), e.g., [k] for RTK<k> or [0, 1, 2, 3] for all of
+    them ([0] if None)
+    """
+    rounds = 14
+    related_tweak = 1
+    # Number of cases a worker pulls from the task queue at once
+    chunk_size = 64
+    # Number of cores to use (None: all of them), number of worker processes and Gurobi
+    # threads per worker (None: derived from core_budget, see planner.py)
+    core_budget = None
+    number_of_workers = None
+    threads = None
+    # Measure the splits of core_budget into workers and threads on a sample of
+    # benchmark_size cases, and use the fastest one
+    benchmark = False
+    benchmark_size = 1024
+    # Solver of the cases: "gurobi", or "sat" for an incremental SAT solver (see sat_backend.py)
+    backend = "gurobi"
+    # Solve only the cases which are not decided by the pre-filter (see prefilter.py). The
+    # pre-filter runs in pure Python and is not faster than the solvers in general (0.13 s
+    # per case for 14 rounds in the related-tweak model, where it only finds trails), and
+    # the matrix method already records the cases which are cheap to prove, hence it is off.
+    use_prefilter = False
+    # Record the cases proven by the matrix method (see matrix_method.py) before probing the others
+    use_matrix_method = True
+    # Solve once per reachable output mask of each input (t, y0) instead of once per case
+    reachability = False
+    # Skip the cases which agree with the IIS of an infeasible case (see Craft.probe_cases)
+    use_iis = False
+    # Probe one case per orbit of the symmetries of the model, and copy its result to
+    # the other cases of the orbit (see symmetry.py)
+    use_symmetry = True
+    # Count the zero-correlation cases of every triple (tweak nibble, input nibble, output
+    # nibble) instead, and save the tensor of the counts into craft.filename_nibbles
+    nibble_activity = False
+    # Probe the cases for rounds, rounds + 1, ..., last_rounds rounds in one job, extending
+    # the model by one round at a time, and save the largest number of rounds for which
+    # each case is zero-correlation into craft.filename_sweep (see scheduler.sweep_rounds)
+    last_rounds = None
+    # In the round sweep, only probe the cases which are zero-correlation for the previous
+    # number of rounds. This is faster, but misses the cases which are zero-correlation again
+    # for more rounds.
+    prefix_sweep = False
+    start_time = time.time()
+    craft = Craft(rounds, related_tweak, None, tweak_offsets)
+    if benchmark:
+        sample = sorted(random.sample(range(craft.number_of_cases()), benchmark_size))
+        number_of_workers, threads = benchmark_plans(craft, sample, core_budget, chunk_size,
+                                                     use_prefilter, use_iis, backend)
+    if (last_rounds != None):
+        sweep_rounds(craft, last_rounds, None, chunk_size, number_of_workers, threads, use_prefilter,
+                     use_matrix_method, backend, core_budget, prefix_sweep)
+    elif nibble_activity:
+        zc = sweep_nibble_activity(craft, None, number_of_workers, threads, use_prefilter, use_iis, backend,
+                                   core_budget)
+        np.save(craft.filename_nibbles, zc)
+    elif reachability:
+        search_reachable_in_parallel(craft, number_of_workers, threads, core_budget)
+    else:
+        search_in_parallel(craft, range(craft.number_of_cases()), chunk_size, number_of_workers, threads,
+                           use_prefilter, use_matrix_method, use_iis, backend, core_budget, use_symmetry)
+    elapsed_time = time.time() - start_time
+    print(f"\nProcesses completed after {elapsed_time} seconds")
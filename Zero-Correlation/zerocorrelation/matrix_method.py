@@ -0,0 +1,284 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import numpy as np
+from zerocorrelation.prefilter import Prefilter
+
+"""
+Vectorized matrix method for all (t, y0, xo) cases (see Craft.case_masks):
+
+A truncated mask is a triple (z, o, n) of 64-bit words, where bit k of z (o)
+is set if bit k of the mask is known to be 0 (1), and the four bits of a
+nibble in n are set if the nibble is known to be nonzero. Bit k of a word is
+bit 63 - k of the 64-bit strings used in craft.py, hence nibble i is
+(word >> (60 - 4*i)) & 0xf.
+
+The 64 unit masks y0 are propagated forward, and the 64 unit masks xo are
+propagated backward, all at once as arrays of words. A pair (y0, xo) is
+zero-correlation if the forward and the backward masks disagree somewhere.
+Otherwise, both masks of every round are merged, the round tweaks are summed
+up, and every unit tweak mask t which disagrees with this sum is zero-correlation.
+"""
+
+NIBBLE_LSB = np.uint64(0x1111111111111111)
+ALL_ONES = np.uint64(0xffffffffffffffff)
+ROW = np.uint64(0xffff)
+
+
+def spread(flags):
+    """
+    Set all four bits of the nibbles whose least significant bit is set in flags
+    """
+    return flags * np.uint64(0xf)
+
+
+def any_bit(w):
+    """
+    Set all four bits of the nibbles having at least one set bit in w
+    """
+    return spread((w | (w >> np.uint64(1)) | (w >> np.uint64(2)) | (w >> np.uint64(3))) & NIBBLE_LSB)
+
+
+def all_bits(w):
+    """
+    Set all four bits of the nibbles having four set bits in w
+    """
+    return spread(w & (w >> np.uint64(1)) & (w >> np.uint64(2)) & (w >> np.uint64(3)) & NIBBLE_LSB)
+
+
+def normalize(state):
+    """
+    Derive the nibbles known to be nonzero from the bits known to be 1, and
+    the last unknown bit of a nonzero nibble whose other bits are known to be 0
+    """
+    z, o, n = state
+    n = n | any_bit(o)
+    candidates = n & ~z
+    count = np.zeros_like(candidates)
+    for shift in range(4):
+        count += (candidates >> np.uint64(shift)) & NIBBLE_LSB
+    single = count & ~(count >> np.uint64(1)) & ~(count >> np.uint64(2)) & NIBBLE_LSB
+    o = o | (candidates & spread(single))
+    return z, o, n
+
+
+def contradiction(state):
+    """
+    Return True where a truncated mask is inconsistent
+    """
+    z, o, n = state
+    return ((z & o) | (n & all_bits(z))) != 0
+
+
+def meet(state1, state2):
+    """
+    Return the truncated mask which satisfies both state1 and state2
+    """
+    return normalize(tuple(w1 | w2 for w1, w2 in zip(state1, state2)))
+
+
+def xor(state1, state2):
+    """
+    Return the truncated mask of the sum of two masks
+    """
+    z1, o1, n1 = state1
+    z2, o2, n2 = state2
+    z = (z1 & z2) | (o1 & o2)
+    o = (z1 & o2) | (o1 & z2)
+    n = (n1 & all_bits(z2)) | (n2 & all_bits(z1))
+    return normalize((z, o, n))
+
+
+def get_row(state, k):
+    shift = np.uint64(48 - 16*k)
+    return tuple((w >> shift) & ROW for w in state)
+
+
+def set_rows(rows):
+    return tuple(sum(rows[k][plane] << np.uint64(48 - 16*k) for k in range(4)) for plane in range(3))
+
+
+def mix_columns(state):
+    """
+    v0 = u0, v1 = u1, v2 = u2 + u0, v3 = u3 + u1 + u0 (rows of linear masks)
+    """
+    u = [get_row(state, k) for k in range(4)]
+    return set_rows([u[0], u[1], xor(u[2], u[0]), xor(xor(u[3], u[1]), u[0])])
+
+
+def inverse_mix_columns(state):
+    """
+    u0 = v0, u1 = v1, u2 = v2 + v0, u3 = v3 + v1 + v0 (rows of linear masks)
+    """
+    v = [get_row(state, k) for k in range(4)]
+    return set_rows([v[0], v[1], xor(v[2], v[0]), xor(xor(v[3], v[1]), v[0])])
+
+
+def permute(state, table):
+    """
+    Move nibble i of state to nibble table[i]
+    """
+    result = []
+    for w in state:
+        temp = np.zeros_like(w)
+        for i in range(16):
+            nibble = (w >> np.uint64(60 - 4*i)) & np.uint64(0xf)
+            temp |= nibble << np.uint64(60 - 4*table[i])
+        result.append(temp)
+    return tuple(result)
+
+
+def unit_masks():
+    """
+    Return the 64 unit masks, where mask k is 1 << k
+    """
+    o = np.uint64(1) << np.arange(64, dtype=np.uint64)
+    return normalize((~o, o, np.zeros(64, dtype=np.uint64)))
+
+
+class MatrixMethod:
+    def __init__(self, craft, tweak_offset=None):
+        """
+        tweak_offset is the offset of the tweak schedule (see Craft.tweak_is_permuted)
+        """
+        self.craft = craft
+        self.tweak_offset = tweak_offset
+        self.rounds = craft.rounds
+        self.related_tweak = craft.related_tweak
+        self.p_permute_nibbles = craft.p_permute_nibbles
+        self.p_inverse = [0]*16
+        for i in range(16):
+            self.p_inverse[craft.p_permute_nibbles[i]] = i
+        self.q_permute_teakey_nibbles = craft.q_permute_teakey_nibbles
+        forward, backward = Prefilter.sbox_transitions(craft.s_pos_terms)
+        self.sbox_forward = self.sbox_table(forward)
+        self.sbox_backward = self.sbox_table(backward)
+
+    @staticmethod
+    def sbox_table(transitions):
+        """
+        Return the truncated output (z, o, n) of the S-box for each truncated
+        input nibble, indexed by (z << 5) | (o << 1) | n
+        """
+        table = np.zeros((3, 512), dtype=np.uint64)
+        for z in range(16):
+            for o in range(16):
+                for n in range(2):
+                    outputs = 0
+                    for a in range(16):
+                        if (a & z) == 0 and (a & o) == o and (a != 0 or n == 0):
+                            outputs |= transitions[a]
+                    index = (z << 5) | (o << 1) | n
+                    if (outputs == 0):
+                        # Inconsistent input nibble
+                        table[:, index] = [0xf, 0xf, 0xf]
+                        continue
+                    bits = [b for b in range(16) if (outputs >> b) & 1]
+                    table[0, index] = 0xf & ~np.bitwise_or.reduce(bits)
+                    table[1, index] = np.bitwise_and.reduce(bits)
+                    table[2, index] = 0 if (outputs & 1) else 0xf
+        return table
+
+    def sbox(self, state, table):
+        """
+        Apply the S-box layer to a truncated mask
+        """
+        z, o, n = state
+        result = [np.zeros_like(z) for _ in range(3)]
+        for i in range(16):
+            shift = np.uint64(60 - 4*i)
+            index = (((z >> shift) & np.uint64(0xf)) << np.uint64(5)) | \
+                    (((o >> shift) & np.uint64(0xf)) << np.uint64(1)) | \
+                    ((n >> shift) & np.uint64(1))
+            for plane in range(3):
+                result[plane] |= table[plane][index.astype(np.intp)] << shift
+        return normalize(tuple(result))
+
+    def forward(self):
+        """
+        Return the truncated masks y_r (r = 0, ..., R - 1) and x_r (r = 1, ..., R)
+        of the 64 unit input masks
+        """
+        y = [unit_masks()]
+        x = [None]
+        for r in range(self.rounds):
+            x.append(self.sbox(permute(y[r], self.p_permute_nibbles), self.sbox_forward))
+            if (r < self.rounds - 1):
+                y.append(mix_columns(x[r + 1]))
+        return y, x
+
+    def backward(self):
+        """
+        Return the truncated masks y_r (r = 0, ..., R - 1) and x_r (r = 1, ..., R)
+        of the 64 unit output masks
+        """
+        y = [None]*self.rounds
+        x = [None]*(self.rounds + 1)
+        x[self.rounds] = unit_masks()
+        for r in range(self.rounds - 1, -1, -1):
+            y[r] = permute(self.sbox(x[r + 1], self.sbox_backward), self.p_inverse)
+            if (r > 0):
+                x[r] = inverse_mix_columns(y[r])
+        return y, x
+
+    def tweak_of_round(self, y, r):
+        """
+        Return the truncated round tweak tkt_r added to y_r
+        """
+        if (r > 0 and self.craft.tweak_is_permuted(r, self.tweak_offset)):
+            # tkt_r[Q[i]] = y_r[i]
+            return permute(y, self.q_permute_teakey_nibbles)
+        return y
+
+    def zero_correlation_matrix(self):
+        """
+        Return a boolean array zc[n, i, j] (zc[i, j] in the single tweak model)
+        which is True if the case (t = 1 << n, y0 = 1 << i, xo = 1 << j) is
+        guaranteed to be zero-correlation
+        """
+        y_forward, x_forward = self.forward()
+        y_backward, x_backward = self.backward()
+        pair = lambda state: tuple(w[:, None] for w in state)
+        zc = np.zeros((64, 64), dtype=bool)
+        merged_y = []
+        for r in range(self.rounds):
+            merged = meet(pair(y_forward[r]), tuple(w[None, :] for w in y_backward[r]))
+            zc |= contradiction(merged)
+            merged_y.append(merged)
+            merged = meet(pair(x_forward[r + 1]), tuple(w[None, :] for w in x_backward[r + 1]))
+            zc |= contradiction(merged)
+        if (self.related_tweak == 0):
+            return zc
+        tweak = self.tweak_of_round(merged_y[0], 0)
+        for r in range(1, self.rounds):
+            tweak = xor(tweak, self.tweak_of_round(merged_y[r], r))
+        z, o, n = tweak
+        t = np.uint64(1) << np.arange(64, dtype=np.uint64)
+        t_nibble = spread(np.uint64(1) << (np.arange(64, dtype=np.uint64) & ~np.uint64(3)))
+        # t = 1 << n contradicts the sum if bit n is known to be 0, another bit
+        # is known to be 1, or another nibble is known to be nonzero
+        zc_tweak = (z[None, :, :] & t[:, None, None]) != 0
+        zc_tweak |= (o[None, :, :] & ~t[:, None, None]) != 0
+        zc_tweak |= (n[None, :, :] & ~t_nibble[:, None, None]) != 0
+        return zc_tweak | zc[None, :, :]
+
+    def zero_correlation_cases(self):
+        """
+        Return the (sorted) cases which are guaranteed to be zero-correlation
+        """
+        return np.flatnonzero(self.zero_correlation_matrix().reshape(-1)).tolist()
@@ -0,0 +1,76 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from multiprocessing import cpu_count
+
+"""
+Sharing a budget of cores between the worker processes and the solver threads:
+
+Each one of the number_of_workers processes runs its own solver with threads
+threads, hence number_of_workers * threads should not exceed the number of
+cores, otherwise the threads compete for the cores. plan() splits the budget,
+and best_plan() measures a few splits and returns the fastest one.
+"""
+
+
+def plan(core_budget=None, number_of_workers=None, threads=None):
+    """
+    Return (number_of_workers, threads) such that number_of_workers * threads
+    fits into core_budget (all cores if None). If neither number_of_workers nor
+    threads is given, every core runs a worker with a single solver thread.
+    """
+    if (core_budget == None):
+        core_budget = cpu_count()
+    if (number_of_workers == None):
+        number_of_workers = core_budget // threads if (threads != None) else core_budget
+    number_of_workers = max(1, min(number_of_workers, core_budget))
+    if (threads == None):
+        threads = core_budget // number_of_workers
+    threads = max(1, min(threads, core_budget // number_of_workers))
+    return number_of_workers, threads
+
+
+def candidate_plans(core_budget=None):
+    """
+    Return the splits (number_of_workers, threads) of core_budget into a power
+    of two (or all) worker processes
+    """
+    if (core_budget == None):
+        core_budget = cpu_count()
+    plans = []
+    number_of_workers = 1
+    while (number_of_workers < core_budget):
+        plans.append(plan(core_budget, number_of_workers))
+        number_of_workers *= 2
+    plans.append(plan(core_budget, core_budget))
+    return plans
+
+
+def best_plan(measure, plans):
+    """
+    Return the plan with the highest throughput, where measure(number_of_workers, threads)
+    runs a benchmark and returns its throughput
+    """
+    results = []
+    for number_of_workers, threads in plans:
+        throughput = measure(number_of_workers, threads)
+        print("%d workers x %d threads : %.2f cases/s" % (number_of_workers, threads, throughput))
+        results.append((throughput, number_of_workers, threads))
+    _, number_of_workers, threads = max(results)
+    print("Best plan : %d workers x %d threads" % (number_of_workers, threads))
+    return number_of_workers, threads
@@ -0,0 +1,309 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Miss-in-the-middle pre-filter for the (t, y0, xo) cases (see Craft.case_masks):
+
+Every nibble of the model gets a domain, i.e., the set of its possible masks
+stored as a 16-bit integer (bit a is set if mask a is possible). The domains
+are propagated through the constraints of the model in both directions:
+
+MC (fork, three-fork):      x_c + x_8+c + y_8+c = 0,  x_c + x_4+c + x_12+c + y_12+c = 0
+S-box (s_pos_ineqs):        y_r_i ---> x_r+1_P[i]
+ATK (related tweak only):   t_m + sum of the nibbles of y_r added to t_m = 0
+
+An empty domain means that the case has no linear trail, i.e., it is a
+zero-correlation case. If propagation does not decide a case, a small depth
+first search looks for a trail (a witness), which proves that the case is not
+zero-correlation. Only the remaining (undecided) cases have to be solved by Gurobi.
+"""
+
+CONTRADICTION = 0
+FEASIBLE = 1
+UNDECIDED = 2
+
+FULL_DOMAIN = 0xffff
+
+
+def bits_of(domain):
+    """
+    Return the masks in a domain
+    """
+    return [a for a in range(16) if (domain >> a) & 1]
+
+
+class Prefilter:
+    def __init__(self, craft, budget=1024, tweak_offset=None):
+        """
+        budget is the maximum number of nodes visited by the search for a witness,
+        and tweak_offset is the offset of the tweak schedule (see Craft.tweak_is_permuted)
+        """
+        self.craft = craft
+        self.rounds = craft.rounds
+        self.related_tweak = craft.related_tweak
+        self.budget = budget
+        self.number_of_variables = 24 * self.rounds + 32
+        self.sbox_forward, self.sbox_backward = self.sbox_transitions(craft.s_pos_terms)
+        self.xor_cache = {}
+        self.forward_cache = {}
+        self.backward_cache = {}
+        self.constraints = []
+        for r in range(self.rounds):
+            for c in range(4):
+                self.constraints.append(("xor", [self.x(r, c), self.x(r, 8 + c), self.y(r, 8 + c)]))
+                self.constraints.append(("xor", [self.x(r, c), self.x(r, 4 + c),
+                                                 self.x(r, 12 + c), self.y(r, 12 + c)]))
+            for i in range(16):
+                self.constraints.append(("sbox", [self.y(r, i),
+                                                  self.x(r + 1, craft.p_permute_nibbles[i])]))
+        if (self.related_tweak == 1):
+            q_inverse = [0]*16
+            for i in range(16):
+                q_inverse[craft.q_permute_teakey_nibbles[i]] = i
+            for m in range(16):
+                variables = [self.t(m)]
+                for r in range(self.rounds):
+                    if (r > 0 and craft.tweak_is_permuted(r, tweak_offset)):
+                        variables.append(self.y(r, q_inverse[m]))
+                    else:
+                        variables.append(self.y(r, m))
+                self.constraints.append(("xor", variables))
+        self.constraints_of_variable = [[] for _ in range(self.number_of_variables)]
+        for k, (_, variables) in enumerate(self.constraints):
+            for v in variables:
+                self.constraints_of_variable[v].append(k)
+        self.branching_variables = [v for v in range(self.number_of_variables)
+                                    if self.constraints_of_variable[v] != []]
+        self.number_of_contradictions = 0
+        self.number_of_witnesses = 0
+        self.number_of_undecided_cases = 0
+        # Number of nodes visited by the last search for a witness
+        self.number_of_nodes = 0
+
+    @staticmethod
+    def x(r, i):
+        """
+        Index of the i-th nibble of the input mask of the (r + 1)-th round
+        """
+        return 24 * r + i
+
+    @staticmethod
+    def y(r, i):
+        """
+        Index of the i-th nibble of the output mask of MC in the (r + 1)-th round
+        """
+        if (i < 8):
+            return 24 * r + i
+        return 24 * r + 8 + i
+
+    def t(self, m):
+        """
+        Index of the m-th nibble of the tweak mask
+        """
+        return 24 * self.rounds + 16 + m
+
+    @staticmethod
+    def sbox_transitions(s_pos_terms):
+        """
+        Return the tables forward[a] and backward[b] of the S-box transitions
+        a ---> b allowed by the inequalities of the model, as domains
+        """
+        forward = [0]*16
+        backward = [0]*16
+        for a in range(16):
+            for b in range(16):
+                values = {}
+                for k in range(4):
+                    values["a%d" % k] = (a >> k) & 1
+                    values["b%d" % k] = (b >> k) & 1
+                if all(sum(coefficient * values[symbol] for coefficient, symbol in terms) >= rhs
+                       for terms, rhs in s_pos_terms):
+                    forward[a] |= 1 << b
+                    backward[b] |= 1 << a
+        return forward, backward
+
+    def xor_domains(self, d1, d2):
+        """
+        Return the domain of a + b, where a is in d1 and b is in d2
+        """
+        if (d1 == FULL_DOMAIN or d2 == FULL_DOMAIN):
+            return FULL_DOMAIN if (d1 != 0 and d2 != 0) else 0
+        if (d1 == 1):
+            return d2
+        if (d2 == 1):
+            return d1
+        key = (d1, d2)
+        result = self.xor_cache.get(key)
+        if (result == None):
+            result = 0
+            for a in bits_of(d1):
+                for b in bits_of(d2):
+                    result |= 1 << (a ^ b)
+            self.xor_cache[key] = result
+        return result
+
+    def image(self, table, cache, domain):
+        """
+        Return the image of a domain through the S-box transitions in table
+        """
+        result = cache.get(domain)
+        if (result == None):
+            result = 0
+            for a in bits_of(domain):
+                result |= table[a]
+            cache[domain] = result
+        return result
+
+    def revise(self, domains, constraint):
+        """
+        Remove the masks which do not satisfy constraint from the domains of its
+        variables, and return the variables whose domain has been changed
+        """
+        kind, variables = constraint
+        changed = []
+        if (kind == "sbox"):
+            a, b = variables
+            new_b = domains[b] & self.image(self.sbox_forward, self.forward_cache, domains[a])
+            new_a = domains[a] & self.image(self.sbox_backward, self.backward_cache, new_b)
+            if (new_a != domains[a]):
+                domains[a] = new_a
+                changed.append(a)
+            if (new_b != domains[b]):
+                domains[b] = new_b
+                changed.append(b)
+            return changed
+        # The sum of the variables is zero: each domain is restricted to the
+        # sum of the other domains
+        n = len(variables)
+        suffix = [1]*(n + 1)
+        for k in range(n - 1, -1, -1):
+            suffix[k] = self.xor_domains(domains[variables[k]], suffix[k + 1])
+        prefix = 1
+        for k in range(n):
+            v = variables[k]
+            new_domain = domains[v] & self.xor_domains(prefix, suffix[k + 1])
+            if (new_domain != domains[v]):
+                domains[v] = new_domain
+                changed.append(v)
+            prefix = self.xor_domains(prefix, new_domain)
+        return changed
+
+    def propagate(self, domains, changed_variables):
+        """
+        Propagate the changes of the given variables through the model.
+        Return False if some domain gets empty (contradiction).
+        """
+        queue = []
+        queued = set()
+        for v in changed_variables:
+            for k in self.constraints_of_variable[v]:
+                if k not in queued:
+                    queue.append(k)
+                    queued.add(k)
+        while queue:
+            k = queue.pop()
+            queued.discard(k)
+            for v in self.revise(domains, self.constraints[k]):
+                if (domains[v] == 0):
+                    return False
+                for k1 in self.constraints_of_variable[v]:
+                    if k1 not in queued:
+                        queue.append(k1)
+                        queued.add(k1)
+        return True
+
+    def initial_domains(self, case, case_masks=None):
+        """
+        Return the domains of the model with fixed y0, xo and t, or None if
+        propagation already shows a contradiction. case_masks converts a case
+        into its masks (craft.case_masks if None).
+        """
+        if (case_masks == None):
+            case_masks = self.craft.case_masks
+        t, y, x = case_masks(case)
+        domains = [FULL_DOMAIN]*self.number_of_variables
+        fixed = []
+        for i in range(16):
+            domains[self.y(0, i)] = 1 << int("".join(y[4*i:4*i + 4]), 2)
+            domains[self.x(self.rounds, i)] = 1 << int("".join(x[4*i:4*i + 4]), 2)
+            fixed += [self.y(0, i), self.x(self.rounds, i)]
+            if (t != None):
+                domains[self.t(i)] = 1 << int("".join(t[4*i:4*i + 4]), 2)
+                fixed.append(self.t(i))
+        if not self.propagate(domains, fixed):
+            return None
+        return domains
+
+    def search_for_witness(self, domains):
+        """
+        Depth first search for a trail within the domains, visiting at most
+        budget nodes. Return the trail (the domains of a single mask) or None.
+        """
+        stack = [domains]
+        nodes = 0
+        self.number_of_nodes = 0
+        while stack and nodes < self.budget:
+            domains = stack.pop()
+            nodes += 1
+            self.number_of_nodes = nodes
+            branching_variable = None
+            size = 17
+            for v in self.branching_variables:
+                d = domains[v]
+                if (d & (d - 1)) != 0:
+                    s = bin(d).count("1")
+                    if s < size:
+                        branching_variable, size = v, s
+            if (branching_variable == None):
+                # Every domain is a single mask which satisfies all the constraints
+                return domains
+            for a in reversed(bits_of(domains[branching_variable])):
+                child = list(domains)
+                child[branching_variable] = 1 << a
+                if self.propagate(child, [branching_variable]):
+                    stack.append(child)
+        return None
+
+    def classify(self, case, case_masks=None):
+        """
+        Return CONTRADICTION (zero-correlation), FEASIBLE or UNDECIDED
+        """
+        domains = self.initial_domains(case, case_masks)
+        if (domains == None):
+            self.number_of_nodes = 0
+            self.number_of_contradictions += 1
+            return CONTRADICTION
+        if (self.search_for_witness(domains) != None):
+            self.number_of_witnesses += 1
+            return FEASIBLE
+        self.number_of_undecided_cases += 1
+        return UNDECIDED
+
+    def split_cases(self, cases, case_masks=None):
+        """
+        Classify the cases and return (zero-correlation cases, undecided cases)
+        """
+        zc_cases = []
+        undecided_cases = []
+        for case in cases:
+            status = self.classify(case, case_masks)
+            if (status == CONTRADICTION):
+                zc_cases.append(case)
+            elif (status == UNDECIDED):
+                undecided_cases.append(case)
+        return zc_cases, undecided_cases
@@ -0,0 +1,138 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import struct
+import numpy as np
+from zerocorrelation.journal import Journal, STATUS_NAMES
+
+"""
+Queries on the results of a zero-correlation search:
+
+The journal of a search (see journal.py) is a packed bitmap of completed cases,
+a packed bitmap of zero-correlation cases and a column of statuses over the
+case indices (see Craft.case_masks). ResultStore maps it read-only with NumPy,
+so the results of a whole search are available in a few milliseconds without
+parsing the result files, e.g.,
+
+    store = ResultStore("journal_rtk_14_tk0.bin")
+    store.zero_correlation_cases_of_tweak_nibble(3)
+    store.intersection(ResultStore("journal_rtk_13_tk0.bin"))
+
+Unit cases are (offset index, n, i, j) with t = 1 << n, y0 = 1 << i and
+xo = 1 << j, where the offset index is 0 unless several offsets of the tweak
+schedule are probed in one search. In the single tweak model n is always 0.
+"""
+
+
+class ResultStore:
+    def __init__(self, filename):
+        with open(filename, "rb") as fileobj:
+            header = fileobj.read(struct.calcsize(Journal.header_format))
+        magic, self.number_of_cases = struct.unpack(Journal.header_format, header)
+        if (magic != Journal.magic):
+            raise ValueError("%s is not a journal" % filename)
+        self.filename = filename
+        self.bitmap_size = (self.number_of_cases + 7) // 8
+        offset = len(header)
+        self.completed_bitmap = np.memmap(filename, dtype=np.uint8, mode="r",
+                                          offset=offset, shape=(self.bitmap_size,))
+        offset += self.bitmap_size
+        self.infeasible_bitmap = np.memmap(filename, dtype=np.uint8, mode="r",
+                                           offset=offset, shape=(self.bitmap_size,))
+        offset += self.bitmap_size
+        self.status = np.memmap(filename, dtype=np.uint8, mode="r",
+                                offset=offset, shape=(self.number_of_cases,))
+        if (self.number_of_cases == 64 * 64):
+            self.shape = (1, 1, 64, 64)
+        else:
+            self.shape = (self.number_of_cases // (64 * 64 * 64), 64, 64, 64)
+
+    def unpack(self, bitmap):
+        return np.unpackbits(bitmap, bitorder="little")[:self.number_of_cases].astype(bool)
+
+    def completed(self):
+        """
+        Return a boolean array over the cases, True if the case has been probed
+        """
+        return self.unpack(self.completed_bitmap)
+
+    def zero_correlation(self):
+        """
+        Return a boolean array over the cases, True if the case is zero-correlation
+        """
+        return self.unpack(self.completed_bitmap & self.infeasible_bitmap)
+
+    def zero_correlation_cases(self):
+        """
+        Return the (sorted) zero-correlation cases
+        """
+        return np.flatnonzero(self.zero_correlation())
+
+    def zero_correlation_tensor(self):
+        """
+        Return the zero-correlation array indexed by (offset index, n, i, j)
+        """
+        return self.zero_correlation().reshape(self.shape)
+
+    def zero_correlation_masks(self, zc=None):
+        """
+        Return the rows (offset index, n, i, j) of the zero-correlation cases,
+        or of the True entries of zc (an array shaped like zero_correlation_tensor)
+        """
+        if zc is None:
+            zc = self.zero_correlation_tensor()
+        return np.argwhere(zc)
+
+    def zero_correlation_cases_of_tweak_nibble(self, k):
+        """
+        Return the rows (offset index, n, i, j) of the zero-correlation cases
+        whose tweak mask t = 1 << n lies in the k-th nibble of t, where nibble 0
+        holds the bits 63, ..., 60 (see Craft.nibble_case_masks)
+        """
+        zc = self.zero_correlation_tensor().copy()
+        bits = list(range(60 - 4 * k, 64 - 4 * k))
+        zc[:, [n for n in range(zc.shape[1]) if n not in bits]] = False
+        return self.zero_correlation_masks(zc)
+
+    def intersection(self, other):
+        """
+        Return the (sorted) cases which are zero-correlation in both stores,
+        e.g., for two numbers of rounds
+        """
+        if (other.number_of_cases != self.number_of_cases):
+            raise ValueError("%s and %s do not have the same cases" % (self.filename, other.filename))
+        return np.flatnonzero(self.zero_correlation() & other.zero_correlation())
+
+    def status_counts(self):
+        """
+        Return the number of cases of each status (see journal.py) as a dict
+        """
+        counts = np.bincount(self.status, minlength=len(STATUS_NAMES))
+        return {STATUS_NAMES[status]: int(counts[status]) for status in range(len(STATUS_NAMES))}
+
+    def summary(self):
+        """
+        Return a short text report of the store
+        """
+        lines = ["%s : %d/%d cases probed, %d zero-correlation cases" %
+                 (self.filename, np.count_nonzero(self.completed()), self.number_of_cases,
+                  len(self.zero_correlation_cases()))]
+        for name, count in self.status_counts().items():
+            if (count > 0 and name != STATUS_NAMES[0]):
+                lines.append("%s : %d" % (name, count))
+        return "\n".join(lines)
@@ -0,0 +1,126 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from itertools import product
+from pysat.solvers import Solver
+
+"""
+SAT backend for the (t, y0, xo) cases (see Craft.case_masks):
+
+All variables of the MILP model are binary, and every inequality involves a
+few variables only. Each inequality is replaced by one clause per minimal set
+of variables whose unfavourable values violate it (see minimal_violations).
+Hence the CNF has exactly the same solutions as the MILP model.
+
+The CNF is loaded once into an incremental SAT solver (PySAT), and each case
+is checked by fixing the bits of t, y0 and xo with assumptions, so the clauses
+learned for a case are kept for the next ones. The clauses of AddTweakey,
+which depend on the offset of the tweak schedule (see Craft.atk_constraints),
+are loaded for every offset of craft.tweak_offsets with an extra selector
+literal, and the selector of the offset of a case is one of its assumptions.
+Hence the cases of all the offsets share one solver. Unlike the Gurobi models, the
+solvers do not need any license, hence there is no limit on the number of workers.
+"""
+
+
+class SatBackend:
+    def __init__(self, craft, solver_name="cadical153"):
+        self.craft = craft
+        variables, constraints = craft.model_data()
+        self.variable_index = {name: k + 1 for k, name in enumerate(variables)}
+        self.clauses = self.constraints_to_cnf(constraints)
+        self.selectors = {}
+        for offset in craft.tweak_offsets:
+            self.selectors[offset] = len(self.variable_index) + len(self.selectors) + 1
+            self.clauses += [clause + [-self.selectors[offset]]
+                             for clause in self.constraints_to_cnf(craft.atk_constraints(offset))]
+        self.solver = Solver(name=solver_name, bootstrap_with=self.clauses)
+        self.y_in = self.literals(craft.create_variables_after_mc(0, "x", "y"))
+        self.x_out = self.literals(craft.create_variables(craft.rounds, "x"))
+        if (craft.related_tweak == 1):
+            self.tweak = self.literals(craft.create_tweak_vars("t"))
+
+    def literals(self, state):
+        return [self.variable_index[name] for name in self.craft.flatten_state(state)]
+
+    def constraints_to_cnf(self, constraints):
+        """
+        Convert the constraints (terms, sense, rhs) of the model into clauses
+        """
+        clauses = []
+        patterns = {}
+        for terms, sense, rhs in constraints:
+            inequalities = []
+            if sense in [">=", "="]:
+                inequalities.append(([coefficient for coefficient, _ in terms], rhs))
+            if sense in ["<=", "="]:
+                inequalities.append(([-coefficient for coefficient, _ in terms], -rhs))
+            for coefficients, bound in inequalities:
+                key = (tuple(coefficients), bound)
+                if key not in patterns:
+                    patterns[key] = self.minimal_violations(coefficients, bound)
+                for subset in patterns[key]:
+                    clause = []
+                    for ind in subset:
+                        literal = self.variable_index[terms[ind][1]]
+                        clause.append(literal if coefficients[ind] > 0 else -literal)
+                    clauses.append(clause)
+        return clauses
+
+    @staticmethod
+    def minimal_violations(coefficients, bound):
+        """
+        Return the minimal sets of variables of sum(coefficients[i] * x_i) >= bound
+        which violate it when they all take their unfavourable value (0 if the
+        coefficient is positive, 1 otherwise). Each set gives the clause "at least
+        one of these variables takes its favourable value".
+        """
+        maximum = sum(coefficient for coefficient in coefficients if coefficient > 0)
+        weights = [abs(coefficient) for coefficient in coefficients]
+        violations = []
+        for selection in product([0, 1], repeat=len(coefficients)):
+            subset = [ind for ind in range(len(coefficients)) if selection[ind]]
+            deficit = sum(weights[ind] for ind in subset)
+            if (maximum - deficit >= bound):
+                continue
+            if all(maximum - deficit + weights[ind] >= bound for ind in subset):
+                violations.append(subset)
+        return violations
+
+    def probe_cases(self, cases, case_masks=None):
+        """
+        Check each case under assumptions and yield (case, True if zero-correlation,
+        number of conflicts), where case_masks converts a case into its masks
+        (craft.case_masks if None)
+        """
+        if (case_masks == None):
+            case_masks = self.craft.case_masks
+        for case in cases:
+            t, y, x = case_masks(case)
+            assumptions = [self.selectors[self.craft.case_offset(case, case_masks)]]
+            fixed = [(self.y_in, y), (self.x_out, x)]
+            if (t != None):
+                fixed.append((self.tweak, t))
+            for literals, mask in fixed:
+                assumptions += [literals[k] if mask[k] == "1" else -literals[k] for k in range(64)]
+            conflicts = self.solver.accum_stats().get("conflicts", 0)
+            zc = not self.solver.solve(assumptions=assumptions)
+            yield case, zc, self.solver.accum_stats().get("conflicts", 0) - conflicts
+
+    def delete(self):
+        self.solver.delete()
@@ -0,0 +1,497 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from multiprocessing import Pool, current_process
+import copy
+import time
+import numpy as np
+from gurobipy import *
+from zerocorrelation.prefilter import Prefilter, CONTRADICTION, UNDECIDED
+from zerocorrelation.matrix_method import MatrixMethod
+from zerocorrelation.planner import plan, candidate_plans, best_plan
+from zerocorrelation.journal import GUROBI, SAT_SOLVER, PREFILTER, MATRIX_METHOD, SYMMETRY
+from zerocorrelation.symmetry import Symmetry
+from zerocorrelation.results import ResultStore
+from zerocorrelation.telemetry import Telemetry
+
+"""
+Dynamic scheduling of the (t, y0, xo) cases (see Craft.case_masks):
+
+The cases are split into chunks of chunk_size consecutive cases which are put
+into the task queue of a pool of workers. Each worker builds the model once,
+when it is started, and pulls the next chunk as soon as it has finished the
+previous one. Hence the number of workers can follow the number of cores, and
+no worker stays idle while some other worker is still busy with a long slice.
+The cases which are proven to be zero-correlation by the matrix method (see
+matrix_method.py) are recorded at once, before the workers are started.
+With use_prefilter (off by default), a worker runs the pre-filter (see
+prefilter.py) on a chunk before solving it, and only the cases left undecided
+by the pre-filter are solved by Gurobi.
+
+If craft probes several offsets of the tweak schedule (see Craft.tweak_offsets),
+the cases of all the offsets share the pool: a worker builds a single model,
+and it only swaps the constraints of AddTweakey when the offset of the next
+case differs from the previous one (see Craft.set_tweak_offset).
+"""
+
+
+def init_worker(craft_instance, threads, use_prefilter, use_iis=False, backend="gurobi"):
+    """
+    Build the model of craft_instance once in each worker process, either for
+    Gurobi or for an incremental SAT solver (backend = "sat", see sat_backend.py)
+    """
+    global craft, model, sat, prefilters, conflicts
+    craft = craft_instance
+    # Pre-filter of each offset of the tweak schedule, built on demand
+    prefilters = {} if use_prefilter else None
+    # Conflicts derived from the IIS of the infeasible cases of this worker
+    conflicts = [] if use_iis else None
+    if (backend == "sat"):
+        from zerocorrelation.sat_backend import SatBackend
+        sat = SatBackend(craft)
+        model = None
+        return
+    sat = None
+    model = craft.build_model()
+    model.setParam(GRB.Param.OutputFlag, False)
+    model.setParam(GRB.Param.Threads, threads)
+    if (craft.related_tweak == 1):
+        model.setParam(GRB.Param.Presolve, 0)
+
+
+def probe(cases, case_masks=None):
+    """
+    Probe the cases in this worker and return (zero-correlation cases, records),
+    where records holds a telemetry record (case, method, zc, status, time, nodes)
+    for each case (see telemetry.py), and case_masks converts a case into its
+    masks (craft.case_masks if None)
+    """
+    records = []
+    zc_cases = []
+    undecided_cases = cases
+    # Time spent by the pre-filter on the cases it leaves undecided
+    prefilter_time = {}
+    if (prefilters != None):
+        undecided_cases = []
+        for case in cases:
+            offset = craft.case_offset(case, case_masks)
+            if offset not in prefilters:
+                prefilters[offset] = Prefilter(craft, tweak_offset=offset)
+            time_start = time.time()
+            result = prefilters[offset].classify(case, case_masks)
+            if (result == UNDECIDED):
+                undecided_cases.append(case)
+                prefilter_time[case] = time.time() - time_start
+                continue
+            if (result == CONTRADICTION):
+                zc_cases.append(case)
+            records.append((case, PREFILTER, result == CONTRADICTION, None, time.time() - time_start,
+                            prefilters[offset].number_of_nodes))
+    time_start = time.time()
+    if (sat != None):
+        for case, zc, number_of_conflicts in sat.probe_cases(undecided_cases, case_masks):
+            if zc:
+                zc_cases.append(case)
+            records.append((case, SAT_SOLVER, zc, None, time.time() - time_start + prefilter_time.get(case, 0),
+                            number_of_conflicts))
+            time_start = time.time()
+        return zc_cases, records
+    for case, status, decided_by in craft.probe_cases(model, undecided_cases, conflicts, case_masks):
+        if (status == GRB.Status.INFEASIBLE):
+            zc_cases.append(case)
+        records.append(craft.telemetry_record(model, case, status, decided_by,
+                                              time.time() - time_start + prefilter_time.get(case, 0)))
+        time_start = time.time()
+    return zc_cases, records
+
+
+def number_of_solved_cases(records):
+    """
+    Number of cases decided by a solver call (see probe)
+    """
+    return sum(1 for record in records if record[1] in [GUROBI, SAT_SOLVER])
+
+
+def probe_chunk(chunk):
+    """
+    Probe a chunk of cases and return (chunk, zero-correlation cases,
+    records (see probe), elapsed time, worker name)
+    """
+    time_start = time.time()
+    zc_cases, records = probe(chunk)
+    return chunk, zc_cases, records, time.time() - time_start, current_process().name
+
+
+def probe_triple(task):
+    """
+    Probe the nibble cases of a task (offset index, triple), where triple is
+    (tweak nibble, input nibble, output nibble), see Craft.nibble_cases, and
+    return (task, zero-correlation cases, number of cases passed to the solver,
+    elapsed time, worker name)
+    """
+    time_start = time.time()
+    offset_index, triple = task
+    zc_cases, records = probe(craft.nibble_cases(*triple, offset_index), craft.nibble_case_masks)
+    return task, zc_cases, number_of_solved_cases(records), time.time() - time_start, current_process().name
+
+
+def set_rounds(rounds):
+    """
+    Bring the model of this worker to the given number of rounds, by adding
+    the missing rounds to the Gurobi model (see Craft.extend_model). The SAT
+    solver and the pre-filters are built again for the new number of rounds.
+    """
+    global sat
+    if (craft.rounds == rounds):
+        return
+    if (sat != None):
+        from zerocorrelation.sat_backend import SatBackend
+        craft.rounds = rounds
+        craft.constraints = []
+        sat = SatBackend(craft)
+    else:
+        while (craft.rounds < rounds):
+            craft.extend_model(model)
+    if (prefilters != None):
+        prefilters.clear()
+
+
+def probe_round_chunk(task):
+    """
+    Probe a chunk of cases for a number of rounds, where task is (rounds, chunk),
+    and return (task, zero-correlation cases, number of cases passed to the
+    solver, elapsed time, worker name)
+    """
+    time_start = time.time()
+    rounds, chunk = task
+    set_rounds(rounds)
+    zc_cases, records = probe(chunk)
+    return task, zc_cases, number_of_solved_cases(records), time.time() - time_start, current_process().name
+
+
+def probe_input(input_masks):
+    """
+    Find the output masks reachable from an input (see Craft.reachable_output_masks)
+    and return (input, reachable outputs, status, number of solves, elapsed time, worker name)
+    """
+    time_start = time.time()
+    _, reachable, status, number_of_solves = next(craft.reachable_output_masks(model, [input_masks]))
+    return input_masks, reachable, status, number_of_solves, time.time() - time_start, current_process().name
+
+
+def search_in_parallel(craft, cases, chunk_size=64, number_of_workers=None, threads=None, use_prefilter=False,
+                       use_matrix_method=True, use_iis=False, backend="gurobi", core_budget=None,
+                       use_symmetry=True):
+    """
+    Probe the given cases with a pool of number_of_workers processes, each one
+    running threads solver threads and pulling chunk_size cases at a time. The
+    missing number_of_workers and threads are derived from core_budget (see planner.py). The zero-correlation
+    cases are written into craft.filename_result and returned. The probed cases
+    are recorded in craft.filename_journal, and skipped when the search is resumed.
+    If use_matrix_method is True, the cases proven by the matrix method are not probed.
+    If use_prefilter is True, only the cases undecided by the pre-filter are solved by Gurobi.
+    If use_iis is True, the cases which agree with the IIS of an infeasible case
+    probed by the same worker are not solved (see Craft.probe_cases).
+    backend is "gurobi" or "sat" (incremental SAT solver, see sat_backend.py).
+    The telemetry of every probed case is appended to craft.filename_telemetry
+    (see telemetry.py). If use_symmetry is True, only the representatives of
+    the cases are probed, and their results are copied to the equivalent cases
+    (see symmetry.py).
+    """
+    time_start = time.time()
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    print("Plan : %d workers x %d threads" % (number_of_workers, threads))
+    journal = craft.open_journal()
+    zc_cases = journal.infeasible_cases(cases)
+    fileobj = open(craft.filename_result, "a")
+    for case in zc_cases:
+        craft.write_case(fileobj, case)
+    total_tests = len(cases)
+    cases = journal.pending(cases)
+    counter = total_tests - len(cases)
+    if (counter > 0):
+        print("Resuming from %s : %d/%d cases already probed" %
+              (craft.filename_journal, counter, total_tests))
+    if use_matrix_method:
+        matrix_zc_cases = set()
+        for offset_index, offset in enumerate(craft.tweak_offsets):
+            matrix_zc_cases.update((offset_index << 18) | case
+                                   for case in MatrixMethod(craft, offset).zero_correlation_cases())
+        proven_cases = [case for case in cases if case in matrix_zc_cases]
+        for case in proven_cases:
+            journal.mark(case, True, MATRIX_METHOD)
+            craft.write_case(fileobj, case)
+        journal.flush()
+        fileobj.flush()
+        zc_cases += proven_cases
+        cases = [case for case in cases if case not in matrix_zc_cases]
+        counter = total_tests - len(cases)
+        print("Matrix method : %d zero-correlation cases" % len(proven_cases))
+    # Cases which get the result of their representative
+    followers = {}
+    if use_symmetry:
+        symmetry = Symmetry(craft)
+        # The groups are trivial in the related-tweak model as soon as Q is used
+        trivial_offsets = [symmetry.group_order(offset_index) == 1
+                           for offset_index in range(len(craft.tweak_offsets))]
+        if all(trivial_offsets):
+            print("Symmetry : trivial group, skipped")
+            use_symmetry = False
+    if use_symmetry:
+        representatives = set()
+        for case in cases:
+            if trivial_offsets[case >> 18]:
+                representatives.add(case)
+                continue
+            representative = symmetry.representative(case)
+            if (representative == case):
+                representatives.add(case)
+            elif journal.is_completed(representative):
+                journal.mark(case, journal.is_infeasible(representative), SYMMETRY)
+                if journal.is_infeasible(representative):
+                    craft.write_case(fileobj, case)
+                    zc_cases.append(case)
+                counter += 1
+            else:
+                representatives.add(representative)
+                followers.setdefault(representative, []).append(case)
+        journal.flush()
+        cases = sorted(representatives)
+        print("Symmetry : group of order %s, %d cases to probe" %
+              ("/".join("%d" % len(group) for group in symmetry.groups), len(cases)))
+    chunks = [cases[k:k + chunk_size] for k in range(0, len(cases), chunk_size)]
+    craft.model_data()
+    telemetry = Telemetry(craft.filename_telemetry, total_tests, counter)
+    probed_cases = 0
+    solved_cases = 0
+    solve_time = 0
+    cases_per_worker = {}
+    with Pool(number_of_workers, initializer=init_worker, initargs=(craft, threads, use_prefilter, use_iis, backend)) as pool:
+        for chunk, zc_chunk, records, elapsed_time, worker in pool.imap_unordered(probe_chunk, chunks):
+            for case, method, zc, _, _, _ in records:
+                journal.mark(case, zc, method)
+                for follower in followers.get(case, []):
+                    journal.mark(follower, zc, SYMMETRY)
+                    if zc:
+                        zc_chunk.append(follower)
+                    telemetry.skip(1)
+            journal.flush()
+            telemetry.record_all(records, worker)
+            for case in zc_chunk:
+                craft.write_case(fileobj, case)
+            fileobj.flush()
+            zc_cases += zc_chunk
+            probed_cases += len(chunk)
+            solved_cases += number_of_solved_cases(records)
+            solve_time += elapsed_time
+            cases_per_worker[worker] = cases_per_worker.get(worker, 0) + len(chunk)
+            print("#ZC : %d \t %s" % (len(zc_cases), telemetry.progress()))
+    journal.close()
+    fileobj.close()
+    telemetry.close()
+    wall_time = time.time() - time_start
+    print(ResultStore(craft.filename_journal).summary())
+    for line in telemetry.report():
+        print(line)
+    print("Solved by %s : %d/%d cases" % (backend, solved_cases, probed_cases))
+    print("Number of workers : %d" % len(cases_per_worker))
+    for worker in sorted(cases_per_worker):
+        print("%s : %d cases" % (worker, cases_per_worker[worker]))
+    print("Throughput = %.2f cases/s (%.2f cases/s per worker)" %
+          (probed_cases / wall_time, probed_cases / max(solve_time, 1e-9)))
+    print("Time used = " + str(wall_time))
+    return sorted(zc_cases)
+
+
+def search_reachable_in_parallel(craft, number_of_workers=None, threads=None, core_budget=None):
+    """
+    Find the zero-correlation cases with one reachability search per input (t, y0)
+    (see Craft.reachable_output_masks), where the inputs are shared between
+    number_of_workers processes. The cases are recorded like in search_in_parallel.
+    """
+    time_start = time.time()
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    print("Plan : %d workers x %d threads" % (number_of_workers, threads))
+    journal = craft.open_journal()
+    cases = range(craft.number_of_cases())
+    zc_counter = len(journal.infeasible_cases(cases))
+    fileobj = open(craft.filename_result, "a")
+    for case in journal.infeasible_cases(cases):
+        craft.write_case(fileobj, case)
+    inputs = sorted(set(case >> 6 for case in journal.pending(cases)))
+    total_inputs = craft.number_of_cases() >> 6
+    counter = total_inputs - len(inputs)
+    craft.model_data()
+    total_solves = 0
+    with Pool(number_of_workers, initializer=init_worker, initargs=(craft, threads, False)) as pool:
+        for input_masks, reachable, status, number_of_solves, elapsed_time, worker in \
+                pool.imap_unordered(probe_input, inputs):
+            zc_counter += craft.record_reachable_output_masks(journal, fileobj, input_masks, reachable, status)
+            fileobj.flush()
+            total_solves += number_of_solves
+            counter += 1
+            print("%d/%d \t #ZC : %d \t #solves : %d" % (counter, total_inputs, zc_counter, total_solves))
+    journal.close()
+    fileobj.close()
+    print("Number of solves : %d (instead of %d)" % (total_solves, 64 * len(inputs)))
+    print("Time used = " + str(time.time() - time_start))
+
+
+def benchmark_plans(craft, cases, core_budget=None, chunk_size=64, use_prefilter=False, use_iis=False,
+                    backend="gurobi"):
+    """
+    Probe the given (sample of) cases with every candidate split of core_budget
+    (see planner.py), without recording them, and return the fastest
+    (number_of_workers, threads)
+    """
+    chunks = [cases[k:k + chunk_size] for k in range(0, len(cases), chunk_size)]
+    craft.model_data()
+
+    def measure(number_of_workers, threads):
+        time_start = time.time()
+        with Pool(number_of_workers, initializer=init_worker,
+                  initargs=(craft, threads, use_prefilter, use_iis, backend)) as pool:
+            for _ in pool.imap_unordered(probe_chunk, chunks):
+                pass
+        return len(cases) / (time.time() - time_start)
+
+    return best_plan(measure, candidate_plans(core_budget))
+
+
+def sweep_nibble_activity(craft, triples=None, number_of_workers=None, threads=None, use_prefilter=False,
+                          use_iis=False, backend="gurobi", core_budget=None):
+    """
+    Probe all the nonzero values of the triples (tweak nibble, input nibble,
+    output nibble) with a pool of workers sharing one model each (see
+    Craft.nibble_cases). triples is a list of triples (all 16^3 triples if None),
+    where the tweak nibble is ignored in the single tweak model. The
+    zero-correlation cases are written into craft.filename_result, and the
+    dense tensor zc[tweak nibble, input nibble, output nibble] of the number of
+    zero-correlation cases per triple is returned (zc[input nibble, output nibble]
+    in the single tweak model). If craft probes several offsets of the tweak
+    schedule, the tensor gets a first axis indexed like craft.tweak_offsets.
+    """
+    time_start = time.time()
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    print("Plan : %d workers x %d threads" % (number_of_workers, threads))
+    if (craft.related_tweak == 0):
+        zc = np.zeros((16, 16), dtype=np.int64)
+        if (triples is None):
+            triples = [(0, sn, on) for sn in range(16) for on in range(16)]
+        triples = sorted(set((0, sn, on) for _, sn, on in triples))
+    else:
+        zc = np.zeros((16, 16, 16), dtype=np.int64)
+        if (triples is None):
+            triples = [(tn, sn, on) for tn in range(16) for sn in range(16) for on in range(16)]
+    number_of_offsets = len(craft.tweak_offsets)
+    zc = np.zeros((number_of_offsets,) + zc.shape, dtype=np.int64)
+    tasks = [(offset_index, triple) for offset_index in range(number_of_offsets) for triple in triples]
+    fileobj = open(craft.filename_result, "a")
+    craft.model_data()
+    counter = 0
+    solved_cases = 0
+    with Pool(number_of_workers, initializer=init_worker,
+              initargs=(craft, threads, use_prefilter, use_iis, backend)) as pool:
+        for (offset_index, triple), zc_cases, solved, elapsed_time, worker in \
+                pool.imap_unordered(probe_triple, tasks):
+            for case in zc_cases:
+                craft.write_case(fileobj, case, craft.nibble_case_masks)
+            fileobj.flush()
+            if (craft.related_tweak == 0):
+                zc[offset_index, triple[1], triple[2]] = len(zc_cases)
+            else:
+                zc[(offset_index,) + tuple(triple)] = len(zc_cases)
+            counter += 1
+            solved_cases += solved
+            print("%d/%d \t offset : %d \t triple : %s \t #ZC : %d \t %.2f s" %
+                  (counter, len(tasks), craft.tweak_offsets[offset_index], triple, len(zc_cases), elapsed_time))
+    fileobj.close()
+    if (number_of_offsets == 1):
+        zc = zc[0]
+    print("Solved by %s : %d cases" % (backend, solved_cases))
+    print("Time used = " + str(time.time() - time_start))
+    return zc
+
+
+def sweep_rounds(craft, last_rounds, cases=None, chunk_size=64, number_of_workers=None, threads=None,
+                 use_prefilter=False, use_matrix_method=True, backend="gurobi", core_budget=None,
+                 prefix=False):
+    """
+    Probe the given cases (all the cases if None) for craft.rounds, craft.rounds + 1,
+    ..., last_rounds rounds in one job. The workers build their model once, for
+    craft.rounds rounds, and extend it by one round at a time (see set_rounds).
+    Return the array zc_rounds over the cases, where zc_rounds[case] is the
+    largest number of rounds R <= last_rounds such that the case is
+    zero-correlation for R rounds (craft.rounds - 1 if none), which is also
+    saved into craft.filename_sweep after each round. Zero-correlation is not
+    monotone in the number of rounds (e.g., in the single-tweak model, 3968
+    cases are zero-correlation for 2 rounds, and all the 4096 cases for 3
+    rounds), hence every case is probed for every number of rounds, except the
+    cases proven by the matrix method.
+
+    If prefix is True, only the zero-correlation cases of a round are probed in
+    the next one, and zc_rounds[case] is the largest R such that the case is
+    zero-correlation for all the rounds from craft.rounds to R. This is faster,
+    but a case which is zero-correlation again for more rounds is missed.
+    """
+    time_start = time.time()
+    number_of_workers, threads = plan(core_budget, number_of_workers, threads)
+    print("Plan : %d workers x %d threads" % (number_of_workers, threads))
+    first_rounds = craft.rounds
+    if (cases is None):
+        cases = range(craft.number_of_cases())
+    zc_rounds = np.full(craft.number_of_cases(), first_rounds - 1, dtype=np.int8)
+    cases = list(cases)
+    candidates = cases
+    table = []
+    craft.model_data()
+    with Pool(number_of_workers, initializer=init_worker,
+              initargs=(craft, threads, use_prefilter, False, backend)) as pool:
+        for rounds in range(first_rounds, last_rounds + 1):
+            round_time = time.time()
+            zc_cases = []
+            if use_matrix_method:
+                round_craft = copy.copy(craft)
+                round_craft.rounds = rounds
+                round_craft.constraints = []
+                matrix_zc_cases = set()
+                for offset_index, offset in enumerate(craft.tweak_offsets):
+                    matrix_zc_cases.update((offset_index << 18) | case
+                                           for case in MatrixMethod(round_craft, offset).zero_correlation_cases())
+                zc_cases = [case for case in candidates if case in matrix_zc_cases]
+                candidates = [case for case in candidates if case not in matrix_zc_cases]
+            number_of_proven_cases = len(zc_cases)
+            solved_cases = 0
+            chunks = [(rounds, candidates[k:k + chunk_size]) for k in range(0, len(candidates), chunk_size)]
+            for _, zc_chunk, solved, _, _ in pool.imap_unordered(probe_round_chunk, chunks):
+                zc_cases += zc_chunk
+                solved_cases += solved
+            zc_cases = sorted(zc_cases)
+            zc_rounds[zc_cases] = rounds
+            np.save(craft.filename_sweep, zc_rounds)
+            table.append((rounds, len(zc_cases), number_of_proven_cases, solved_cases, time.time() - round_time))
+            print("Rounds : %d \t #ZC : %d \t matrix method : %d \t solved by %s : %d \t %.2f s" %
+                  (rounds, len(zc_cases), number_of_proven_cases, backend, solved_cases, table[-1][4]))
+            candidates = zc_cases if prefix else cases
+            if not candidates:
+                break
+    print("Rounds \t #ZC \t matrix method \t solved \t time")
+    for row in table:
+        print("%d \t %d \t %d \t %d \t %.2f s" % row)
+    print("Time used = " + str(time.time() - time_start))
+    return zc_rounds
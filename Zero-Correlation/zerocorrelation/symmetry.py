@@ -0,0 +1,143 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Symmetries of the (t, y0, xo) cases (see Craft.case_masks):
+
+A permutation s of the 16 nibble positions which commutes with the linear
+layer of the model maps every linear trail to a linear trail, when it is
+applied to all the masks of the trail. This holds if
+- s preserves MixColumn: y_s(i) depends on x_s(j) iff y_i depends on x_j
+- s commutes with PermuteNibbles: s(P[i]) = P[s(i)] (the S-box is the same
+  for all the nibbles)
+- s commutes with Q: s(Q[i]) = Q[s(i)], if the tweak of some round is permuted
+  by Q (see Craft.tweak_is_permuted)
+Hence two cases which are mapped to each other by such a permutation are both
+zero-correlation or both not. The group of these permutations is found by a
+backtracking search over the tables of craft.py, each case is mapped to the
+smallest case of its orbit (its representative), and only the representatives
+have to be probed.
+"""
+
+
+def mix_columns_matrix():
+    """
+    Return the 16x16 matrix of MixColumn on the linear masks, where m[i][j] = 1
+    if nibble i of the output mask depends on nibble j of the input mask
+    """
+    m = [[0]*16 for _ in range(16)]
+    for c in range(4):
+        m[c][c] = 1
+        m[4 + c][4 + c] = 1
+        m[8 + c][c] = m[8 + c][8 + c] = 1
+        m[12 + c][c] = m[12 + c][4 + c] = m[12 + c][12 + c] = 1
+    return m
+
+
+def commuting_permutations(matrix, permutations):
+    """
+    Return all the permutations s of the 16 nibble positions which preserve
+    matrix and commute with each one of permutations
+    """
+    group = []
+    # s(i) has the same number of inputs and outputs in matrix as i
+    degree = [(sum(matrix[i]), sum(row[i] for row in matrix)) for i in range(16)]
+
+    def assign(s, i, a):
+        """
+        Set s(i) = a, and propagate s(p[i]) = p[s(i)]. Return False on a conflict.
+        """
+        stack = [(i, a)]
+        while stack:
+            i, a = stack.pop()
+            if (s[i] != None):
+                if (s[i] != a):
+                    return False
+                continue
+            if (a in s or degree[a] != degree[i]):
+                return False
+            s[i] = a
+            for p in permutations:
+                stack.append((p[i], p[a]))
+        return True
+
+    def consistent(s):
+        known = [i for i in range(16) if s[i] != None]
+        return all(matrix[s[i]][s[j]] == matrix[i][j] for i in known for j in known)
+
+    def extend(s):
+        if None not in s:
+            group.append(tuple(s))
+            return
+        i = s.index(None)
+        for a in range(16):
+            child = list(s)
+            if assign(child, i, a) and consistent(child):
+                extend(child)
+
+    extend([None]*16)
+    return group
+
+
+class Symmetry:
+    def __init__(self, craft):
+        self.craft = craft
+        self.related_tweak = craft.related_tweak
+        # Group and bit permutations of each offset of the tweak schedule
+        self.groups = []
+        self.bit_permutations = []
+        for offset in craft.tweak_offsets:
+            permutations = [craft.p_permute_nibbles]
+            if any(craft.tweak_is_permuted(r, offset) for r in range(1, craft.rounds)) and \
+                    (craft.related_tweak == 1):
+                permutations.append(craft.q_permute_teakey_nibbles)
+            group = commuting_permutations(mix_columns_matrix(), permutations)
+            self.groups.append(group)
+            self.bit_permutations.append([self.bit_permutation(s) for s in group])
+
+    @staticmethod
+    def bit_permutation(s):
+        """
+        Return the table of the bit indices (bit k is bit 63 - k of the 64-bit
+        strings of craft.py) moved by the permutation s of the nibbles
+        """
+        table = [0]*64
+        for k in range(64):
+            position = 63 - k
+            table[k] = 63 - (4 * s[position // 4] + position % 4)
+        return table
+
+    def group_order(self, offset_index=0):
+        return len(self.groups[offset_index])
+
+    def orbit(self, case):
+        """
+        Return the set of cases equivalent to a case (see Craft.case_masks)
+        """
+        offset_index, n, i, j = case >> 18, (case >> 12) & 0x3f, (case >> 6) & 0x3f, case & 0x3f
+        orbit = set()
+        for table in self.bit_permutations[offset_index]:
+            t = table[n] if (self.related_tweak == 1) else 0
+            orbit.add((offset_index << 18) | (t << 12) | (table[i] << 6) | table[j])
+        return orbit
+
+    def representative(self, case):
+        """
+        Return the smallest case of the orbit of a case
+        """
+        return min(self.orbit(case))
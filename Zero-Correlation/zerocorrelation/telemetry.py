@@ -0,0 +1,122 @@
+"""
+Applying the MILP-based method to find zero-correlation distinguishers of CRAFT
+Copyright (C) 2019  Hosein Hadipour
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import heapq
+import json
+import time
+from zerocorrelation.journal import STATUS_NAMES
+
+"""
+Per-case telemetry of a zero-correlation search:
+
+Every probed case gives a record (case, method, zc, status, time, nodes), where
+method is the method which has decided the case (see journal.py), status is
+the Gurobi status (None for the other methods), time is the time spent on the
+case in seconds, and nodes is the Gurobi node count, the number of conflicts of
+the SAT solver, or the number of nodes visited by the search for a witness of
+the pre-filter. The records are appended to a file as JSON lines, together with
+the worker which has probed the case, and they are summed up into the live
+progress line (cases/s, ETA) and into the final report (time per method,
+slowest cases).
+"""
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return "%d:%02d:%02d" % (seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+
+class Telemetry:
+    def __init__(self, filename, total_cases, completed_cases=0, number_of_slowest_cases=10):
+        """
+        total_cases is the number of cases of the search, of which completed_cases
+        have already been probed (e.g., before resuming the search)
+        """
+        self.fileobj = open(filename, "a")
+        self.total_cases = total_cases
+        self.completed_cases = completed_cases
+        self.probed_cases = 0
+        self.number_of_slowest_cases = number_of_slowest_cases
+        self.slowest_cases = []
+        self.time_of_method = {}
+        self.cases_of_method = {}
+        self.time_start = time.time()
+
+    def record(self, case, method, zc, status=None, solve_time=0.0, nodes=None, worker=None):
+        """
+        Record one probed case
+        """
+        self.fileobj.write(json.dumps({"case": case, "method": STATUS_NAMES[method], "zc": zc,
+                                       "status": status, "time": round(solve_time, 6),
+                                       "nodes": nodes, "worker": worker}) + "\n")
+        self.completed_cases += 1
+        self.probed_cases += 1
+        self.time_of_method[method] = self.time_of_method.get(method, 0.0) + solve_time
+        self.cases_of_method[method] = self.cases_of_method.get(method, 0) + 1
+        if (len(self.slowest_cases) < self.number_of_slowest_cases):
+            heapq.heappush(self.slowest_cases, (solve_time, case, method, worker))
+        elif (solve_time > self.slowest_cases[0][0]):
+            heapq.heapreplace(self.slowest_cases, (solve_time, case, method, worker))
+
+    def record_all(self, records, worker=None):
+        """
+        Record a list of (case, method, zc, status, time, nodes)
+        """
+        for record in records:
+            self.record(*record, worker=worker)
+
+    def skip(self, number_of_cases):
+        """
+        Count cases which have been decided without being probed one by one
+        (e.g., by the matrix method)
+        """
+        self.completed_cases += number_of_cases
+
+    def cases_per_second(self):
+        return self.probed_cases / max(time.time() - self.time_start, 1e-9)
+
+    def progress(self):
+        """
+        Return the live progress line: completed cases, throughput and ETA
+        """
+        rate = self.cases_per_second()
+        remaining_cases = self.total_cases - self.completed_cases
+        eta = format_duration(remaining_cases / rate) if (rate > 0) else "-"
+        line = "%d/%d \t %.2f cases/s \t ETA %s" % (self.completed_cases, self.total_cases, rate, eta)
+        if self.slowest_cases:
+            solve_time, case, _, _ = max(self.slowest_cases)
+            line += " \t slowest : %d (%.3f s)" % (case, solve_time)
+        return line
+
+    def report(self):
+        """
+        Return the final report: time per method and slowest cases
+        """
+        lines = ["Telemetry : %d cases probed in %s (%.2f cases/s)" %
+                 (self.probed_cases, format_duration(time.time() - self.time_start), self.cases_per_second())]
+        for method in sorted(self.cases_of_method):
+            lines.append("%s : %d cases, %.3f s, %.6f s/case" %
+                         (STATUS_NAMES[method], self.cases_of_method[method], self.time_of_method[method],
+                          self.time_of_method[method] / self.cases_of_method[method]))
+        lines.append("Slowest cases :")
+        for solve_time, case, method, worker in sorted(self.slowest_cases, reverse=True):
+            lines.append("%d \t %.3f s \t %s \t %s" % (case, solve_time, STATUS_NAMES[method], worker))
+        return lines
+
+    def close(self):
+        self.fileobj.close()